@@ -1,6 +1,4 @@
 import streamlit as st
-import gspread
-from oauth2client.service_account import ServiceAccountCredentials
 from fpdf import FPDF
 from datetime import datetime, timezone, timedelta
 import pandas as pd
@@ -11,10 +9,17 @@ from PIL import Image
 from streamlit_drawable_canvas import st_canvas
 import hashlib
 import base64
+import os
+from urllib.parse import urlparse
 from openpyxl import Workbook
 from openpyxl.drawing.image import Image as XlImage
 from openpyxl.styles import Font, Alignment, Border, Side, PatternFill
 from openpyxl.utils import get_column_letter
+from signature_utils import (
+    SignatureCache, draw_strokes_pdf, encode_signature, encode_strokes, has_ink,
+    is_stroke_signature, strokes_from_fabric
+)
+from tenants import DEFAULT_TENANT, Kop, get_current_tenant, get_sheet_pool
 
 # Timezone WIB (UTC+7) untuk Indonesia Barat
 WIB = timezone(timedelta(hours=7))
@@ -43,23 +48,17 @@ DAFTAR_GURU = [
     {"nama": "Hendra Gunawan, M.Pd", "nip": "197212051997031002", "jabatan": "Wakil Kepala Sekolah"},
     {"nama": "Sri Mulyani, S.Pd", "nip": "198604182008012010", "jabatan": "Guru BK"}
 ]
+GURU_PER_NIP = {guru['nip']: guru for guru in DAFTAR_GURU}
 
 # Fungsi koneksi Google Sheets
-@st.cache_resource
-def connect_to_gsheet():
-    """Koneksi ke Google Sheets menggunakan credentials dari secrets"""
+def connect_to_gsheet(tenant=None):
+    """Koneksi ke spreadsheet milik tenant, memakai pool client yang sudah terotorisasi"""
+    tenant = tenant or get_current_tenant()
+    if tenant is None:
+        st.error("❌ spreadsheet_key belum diisi di secrets.toml.")
+        return None
     try:
-        credentials_dict = dict(st.secrets["gcp_service_account"])
-        scope = [
-            "https://spreadsheets.google.com/feeds",
-            "https://www.googleapis.com/auth/drive"
-        ]
-        credentials = ServiceAccountCredentials.from_json_keyfile_dict(
-            credentials_dict, scope
-        )
-        client = gspread.authorize(credentials)
-        sheet = client.open_by_key(st.secrets["spreadsheet_key"])
-        return sheet
+        return get_sheet_pool().spreadsheet(tenant)
     except Exception as e:
         error_msg = str(e)
         if "PERMISSION_DENIED" in error_msg or "403" in error_msg:
@@ -73,6 +72,12 @@ def connect_to_gsheet():
         return None
 
 def get_or_create_worksheet(sheet, worksheet_name, headers=None):
+    """Ambil worksheet dari cache tenant; buka (dan cek header) hanya saat belum di-cache"""
+    return get_sheet_pool().worksheet(
+        sheet, worksheet_name, lambda: open_worksheet(sheet, worksheet_name, headers)
+    )
+
+def open_worksheet(sheet, worksheet_name, headers=None):
     """Ambil atau buat worksheet baru, otomatis tulis header jika belum ada"""
     created_new = False
     try:
@@ -151,15 +156,46 @@ def delete_rows_by_meeting_id(worksheet, meeting_id):
         st.error(f"Gagal menghapus data absensi: {str(e)}")
         return False
 
+# Ukuran gambar TTD per tampilan (piksel)
+SIG_SIZE_GALLERY = (400, 134)
+SIG_SIZE_PDF = (360, 120)
+SIG_SIZE_EXCEL = (300, 100)
+GALLERY_PAGE_SIZE = 12
+
+@st.cache_resource
+def get_signature_cache():
+    """Cache gambar TTD bersama untuk galeri, PDF, dan Excel (bertahan antar rerun)"""
+    try:
+        max_mb = int(st.secrets.get('signature_cache_mb', 64))
+    except Exception:
+        max_mb = 64
+    return SignatureCache(max_bytes=max_mb * 1024 * 1024)
+
+def get_signature_workers():
+    """Jumlah worker dan jenis pool ('thread'/'process') untuk menyiapkan gambar TTD saat export"""
+    try:
+        workers = int(st.secrets.get('signature_workers', 0)) or (os.cpu_count() or 1)
+        executor = st.secrets.get('signature_executor', 'thread')
+    except Exception:
+        workers, executor = os.cpu_count() or 1, 'thread'
+    return workers, executor
+
+def get_signature_format():
+    """Format penyimpanan TTD dari secrets: 'png' (default) atau 'strokes' (goresan vektor)"""
+    try:
+        return st.secrets.get('signature_format', 'png')
+    except Exception:
+        return 'png'
+
 def generate_meeting_id():
     """Generate unique meeting ID"""
     timestamp = now_wib().strftime("%Y%m%d%H%M%S")
     return f"MTG{timestamp}"
 
-def get_base_url():
+def get_base_url(tenant=None):
     """Dapatkan base URL aplikasi secara otomatis"""
-    # Cek apakah ada app_url di secrets
-    app_url = st.secrets.get('app_url', '').strip().rstrip('/')
+    # Cek apakah ada app_url milik tenant di secrets
+    app_url = tenant.app_url if tenant else st.secrets.get('app_url', '').strip().rstrip('/')
     if app_url and app_url != 'http://localhost:8501':
         return app_url
     
@@ -177,10 +213,14 @@ def get_base_url():
     
     return 'https://websiterapatonline.streamlit.app'
 
-def generate_qr_code(meeting_id):
+def generate_qr_code(meeting_id, tenant=None):
     """Generate QR Code untuk link absensi"""
-    base_url = get_base_url()
+    base_url = get_base_url(tenant)
     url = f"{base_url}?page=absensi&meeting_id={meeting_id}"
+    # Slug ikut di link kecuali host base URL memang menunjuk tenant ini
+    # (base URL bisa jatuh ke URL default bila app_url tenant kosong)
+    if tenant and tenant.slug != DEFAULT_TENANT and urlparse(base_url).hostname not in tenant.hosts:
+        url += f"&tenant={tenant.slug}"
     
     qr = qrcode.QRCode(version=1, box_size=10, border=4)
     qr.add_data(url)
@@ -198,16 +238,20 @@ def generate_qr_code(meeting_id):
 class PDFNotulensi(FPDF):
     """Class untuk generate PDF Notulensi Rapat"""
     
+    def __init__(self, kop=None):
+        super().__init__()
+        self.kop = kop or Kop()
+    
     def header(self):
         self.set_font('Arial', '', 12)
-        self.cell(0, 6, 'PEMERINTAH KABUPATEN SIDOARJO', 0, 1, 'C')
+        self.cell(0, 6, self.kop.pemerintah, 0, 1, 'C')
         self.set_font('Arial', '', 12)
-        self.cell(0, 6, 'DINAS PENDIDIKAN DAN KEBUDAYAAN', 0, 1, 'C')
+        self.cell(0, 6, self.kop.dinas, 0, 1, 'C')
         self.set_font('Arial', 'B', 16)
-        self.cell(0, 8, 'SD NEGERI SIMOANGIN-ANGIN', 0, 1, 'C')
+        self.cell(0, 8, self.kop.sekolah, 0, 1, 'C')
         self.set_font('Arial', '', 10)
-        self.cell(0, 5, 'Jalan Simoangin-angin, Wonoayu, Sidoarjo, Jawa Timur 61261', 0, 1, 'C')
-        self.cell(0, 5, 'Pos-el: sdnsimoangin@gmail.com', 0, 1, 'C')
+        self.cell(0, 5, self.kop.alamat, 0, 1, 'C')
+        self.cell(0, 5, f'Pos-el: {self.kop.email}', 0, 1, 'C')
         self.ln(2)
         self.set_line_width(0.8)
         self.line(10, self.get_y(), 200, self.get_y())
@@ -220,10 +264,13 @@ class PDFNotulensi(FPDF):
         self.set_font('Arial', 'I', 8)
         self.cell(0, 10, f'Halaman {self.page_no()}', 0, 0, 'C')
 
-def generate_pdf(data_rapat, peserta_list, notulensi):
+def generate_pdf(data_rapat, peserta_list, notulensi, kop=None, cache=None, workers=None, executor=None):
     """Generate PDF Notulensi Rapat dengan daftar hadir lengkap"""
     
-    pdf = PDFNotulensi()
+    cache = cache or get_signature_cache()
+    default_workers, default_executor = get_signature_workers()
+    workers, executor = workers or default_workers, executor or default_executor
+    pdf = PDFNotulensi(kop)
     pdf.add_page()
     
     # Judul Dokumen
@@ -267,8 +314,11 @@ def generate_pdf(data_rapat, peserta_list, notulensi):
     
     pdf.set_font('Arial', '', 8)
     
-    import tempfile, os
-    temp_sig_files = []
+    # Siapkan semua gambar TTD PNG paralel dulu; goresan digambar sebagai vektor
+    sig_pngs = cache.png_many(
+        ['' if is_stroke_signature(p.get('Signature', '')) else p.get('Signature', '') for p in peserta_list],
+        SIG_SIZE_PDF, workers=workers, executor=executor
+    )
     
     for idx, peserta in enumerate(peserta_list, 1):
         row_height = 15  # Tinggi baris untuk menampung TTD
@@ -286,31 +336,23 @@ def generate_pdf(data_rapat, peserta_list, notulensi):
         sig_x = pdf.get_x()
         sig_y = pdf.get_y()
         
-        if sig_data and len(sig_data) > 200:
+        if is_stroke_signature(sig_data):
+            # TTD format goresan digambar langsung sebagai vektor; goresan rusak ditandai '-'
+            drawn = draw_strokes_pdf(pdf, sig_data, sig_x + 2, sig_y + 1, 30, row_height - 2)
+            pdf.set_xy(sig_x, sig_y)
+            pdf.cell(35, row_height, '' if drawn else '-', 1, 1, 'C')
+        elif sig_pngs[idx - 1] is not None:
             try:
-                sig_bytes = base64.b64decode(sig_data)
-                sig_img = Image.open(BytesIO(sig_bytes))
-                # Simpan ke file temporary
-                tmp = tempfile.NamedTemporaryFile(delete=False, suffix='.png')
-                sig_img.save(tmp.name, format='PNG')
-                tmp.close()
-                temp_sig_files.append(tmp.name)
+                sig_png = sig_pngs[idx - 1]
                 
                 pdf.cell(35, row_height, '', 1, 1)  # Border kosong untuk kolom TTD
-                # Gambar TTD di dalam sel
-                pdf.image(tmp.name, x=sig_x + 2, y=sig_y + 1, w=30, h=row_height - 2)
+                # Gambar TTD di dalam sel, langsung dari memori
+                pdf.image(BytesIO(sig_png), x=sig_x + 2, y=sig_y + 1, w=30, h=row_height - 2)
             except:
                 pdf.cell(35, row_height, '-', 1, 1, 'C')
         else:
             pdf.cell(35, row_height, '-', 1, 1, 'C')
     
-    # Bersihkan file temporary
-    for f in temp_sig_files:
-        try:
-            os.unlink(f)
-        except:
-            pass
-    
     pdf.ln(5)
     
     # Isi Notulensi
@@ -323,7 +365,7 @@ def generate_pdf(data_rapat, peserta_list, notulensi):
     
     # Tanda tangan
     pdf.set_font('Arial', '', 10)
-    pdf.cell(95, 6, f'Sidoarjo, {data_rapat["tanggal"]}', 0, 1)
+    pdf.cell(95, 6, f'{pdf.kop.kota}, {data_rapat["tanggal"]}', 0, 1)
     pdf.cell(95, 6, 'Notulis,', 0, 0)
     pdf.cell(95, 6, 'Mengetahui,', 0, 1)
     pdf.ln(15)
@@ -336,29 +378,116 @@ def generate_pdf(data_rapat, peserta_list, notulensi):
     pdf.cell(95, 5, '', 0, 0)
     pdf.cell(95, 5, 'Kepala Sekolah', 0, 1, 'C')
     
-    # Output PDF
-    timestamp = now_wib().strftime("%Y%m%d_%H%M%S")
-    filename = f"Notulensi_Rapat_{timestamp}.pdf"
-    pdf.output(filename)
-    
-    return filename
+    # Output PDF sebagai bytes, tanpa menulis file ke disk
+    return bytes(pdf.output())
+
+def generate_excel_daftar_hadir(df_data, meeting_id_str, cache=None, workers=None, executor=None):
+    """Generate file Excel dengan kolom terpisah dan gambar TTD"""
+    cache = cache or get_signature_cache()
+    default_workers, default_executor = get_signature_workers()
+    workers, executor = workers or default_workers, executor or default_executor
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "Daftar Hadir"
+
+    # Style
+    header_font = Font(bold=True, color="FFFFFF", size=11)
+    header_fill = PatternFill(start_color="2E86C1", end_color="2E86C1", fill_type="solid")
+    thin_border = Border(
+        left=Side(style='thin'), right=Side(style='thin'),
+        top=Side(style='thin'), bottom=Side(style='thin')
+    )
+    center_align = Alignment(horizontal='center', vertical='center', wrap_text=True)
+
+    # Judul
+    ws.merge_cells('A1:E1')
+    ws['A1'] = f'DAFTAR HADIR RAPAT - {meeting_id_str}'
+    ws['A1'].font = Font(bold=True, size=14)
+    ws['A1'].alignment = Alignment(horizontal='center')
+
+    # Header kolom di baris 3
+    headers = ['No', 'Nama', 'NIP', 'Waktu Absen', 'Tanda Tangan']
+    col_widths = [6, 30, 25, 22, 25]
+
+    for col_idx, (header, width) in enumerate(zip(headers, col_widths), 1):
+        cell = ws.cell(row=3, column=col_idx, value=header)
+        cell.font = header_font
+        cell.fill = header_fill
+        cell.border = thin_border
+        cell.alignment = center_align
+        ws.column_dimensions[get_column_letter(col_idx)].width = width
+
+    # Data
+    row_num = 4
+    # Dirender 2x lalu ditampilkan 150x50 agar tetap tajam; disiapkan paralel sebelum loop
+    signatures = df_data['Signature'].tolist() if 'Signature' in df_data.columns else [''] * len(df_data)
+    sig_pngs = cache.png_many(signatures, SIG_SIZE_EXCEL, workers=workers, executor=executor)
+    for idx, (_, row) in enumerate(df_data.iterrows(), 1):
+        ws.row_dimensions[row_num].height = 60  # Tinggi untuk TTD
+
+        # No
+        cell = ws.cell(row=row_num, column=1, value=idx)
+        cell.border = thin_border
+        cell.alignment = center_align
+
+        # Nama
+        cell = ws.cell(row=row_num, column=2, value=str(row.get('Nama', '')))
+        cell.border = thin_border
+        cell.alignment = Alignment(vertical='center', wrap_text=True)
+
+        # NIP
+        cell = ws.cell(row=row_num, column=3, value=str(row.get('NIP', '')))
+        cell.border = thin_border
+        cell.alignment = center_align
+
+        # Timestamp
+        cell = ws.cell(row=row_num, column=4, value=str(row.get('Timestamp', '')))
+        cell.border = thin_border
+        cell.alignment = center_align
+
+        # TTD
+        cell = ws.cell(row=row_num, column=5, value='')
+        cell.border = thin_border
+
+        sig_png = sig_pngs[idx - 1]
+        if sig_png is not None:
+            try:
+                xl_img = XlImage(BytesIO(sig_png))
+                xl_img.width = 150
+                xl_img.height = 50
+
+                cell_ref = f'E{row_num}'
+                ws.add_image(xl_img, cell_ref)
+            except:
+                ws.cell(row=row_num, column=5, value='(TTD tidak tersedia)')
+        else:
+            ws.cell(row=row_num, column=5, value='(TTD tidak tersedia)')
+
+        row_num += 1
+
+    # Save ke BytesIO
+    output = BytesIO()
+    wb.save(output)
+    output.seek(0)
+    return output
 
 # ============= HALAMAN ADMIN =============
-def admin_page():
+def admin_page(tenant=None):
     """Halaman Admin untuk membuat rapat dan generate link"""
+    kop = tenant.kop if tenant else Kop()
     
     st.title("👨‍💼 Admin - Buat Rapat & Generate Link Absensi")
     st.markdown("---")
     
     # Sidebar info
     with st.sidebar:
-        st.markdown("### SD NEGERI SIMOANGIN-ANGIN")
-        st.markdown("Kab. Sidoarjo, Jawa Timur")
+        st.markdown(f"### {kop.sekolah}")
+        st.markdown(kop.wilayah)
         st.info("**Mode: Admin**\nBuat rapat dan bagikan link absensi ke peserta.")
         
         st.markdown("---")
         st.markdown("**Status Koneksi:**")
-        sheet = connect_to_gsheet()
+        sheet = connect_to_gsheet(tenant)
         if sheet:
             st.success("✅ Terhubung ke Google Sheets")
         else:
@@ -430,7 +559,7 @@ def admin_page():
                             st.success(f"✅ Rapat berhasil dibuat dengan ID: **{meeting_id}**")
                             
                             # Generate QR Code
-                            qr_img, url = generate_qr_code(meeting_id)
+                            qr_img, url = generate_qr_code(meeting_id, tenant)
                             
                             st.markdown("---")
                             st.success("### 🎉 Link Absensi Berhasil Dibuat!")
@@ -485,122 +614,40 @@ def admin_page():
                             use_container_width=True
                         )
                         
-                        # Tampilkan TTD peserta
+                        # Tampilkan TTD peserta per halaman; hanya halaman aktif yang di-decode
                         if sig_col in df_filtered.columns:
                             st.markdown("#### ✍️ Tanda Tangan Peserta")
+                            cache = get_signature_cache()
+                            total_pages = max(1, -(-len(df_filtered) // GALLERY_PAGE_SIZE))
+                            page = st.number_input(
+                                f"Halaman TTD (1-{total_pages})",
+                                min_value=1, max_value=total_pages, value=1, step=1,
+                                key=f"ttd_page_{selected_meeting}"
+                            )
+                            start = (page - 1) * GALLERY_PAGE_SIZE
+                            df_page = df_filtered.iloc[start:start + GALLERY_PAGE_SIZE]
                             cols_ttd = st.columns(3)
-                            for i, (_, row) in enumerate(df_filtered.iterrows()):
+                            for i, (_, row) in enumerate(df_page.iterrows()):
                                 sig_data = row.get(sig_col, '')
                                 with cols_ttd[i % 3]:
                                     st.markdown(f"**{row.get(nama_col, '')}**")
-                                    if sig_data and len(sig_data) > 200:
-                                        try:
-                                            sig_bytes = base64.b64decode(sig_data)
-                                            sig_img = Image.open(BytesIO(sig_bytes))
+                                    if sig_data:
+                                        sig_img = cache.image(sig_data, SIG_SIZE_GALLERY)
+                                        if sig_img is not None:
                                             st.image(sig_img, width=200)
-                                        except:
+                                        else:
                                             st.caption("TTD tidak dapat ditampilkan")
                                     else:
                                         st.caption("TTD tidak tersedia")
+                            stats = cache.stats()
+                            st.caption(
+                                f"Cache TTD: {stats['items']} gambar, {stats['bytes'] / 1_048_576:.1f} MB, "
+                                f"hit rate {stats['hit_rate']:.0%}"
+                            )
                         
                         st.markdown("---")
                         
                         # Download Excel dengan TTD
-                        def generate_excel_daftar_hadir(df_data, meeting_id_str):
-                            """Generate file Excel dengan kolom terpisah dan gambar TTD"""
-                            wb = Workbook()
-                            ws = wb.active
-                            ws.title = "Daftar Hadir"
-                            
-                            # Style
-                            header_font = Font(bold=True, color="FFFFFF", size=11)
-                            header_fill = PatternFill(start_color="2E86C1", end_color="2E86C1", fill_type="solid")
-                            thin_border = Border(
-                                left=Side(style='thin'), right=Side(style='thin'),
-                                top=Side(style='thin'), bottom=Side(style='thin')
-                            )
-                            center_align = Alignment(horizontal='center', vertical='center', wrap_text=True)
-                            
-                            # Judul
-                            ws.merge_cells('A1:E1')
-                            ws['A1'] = f'DAFTAR HADIR RAPAT - {meeting_id_str}'
-                            ws['A1'].font = Font(bold=True, size=14)
-                            ws['A1'].alignment = Alignment(horizontal='center')
-                            
-                            # Header kolom di baris 3
-                            headers = ['No', 'Nama', 'NIP', 'Waktu Absen', 'Tanda Tangan']
-                            col_widths = [6, 30, 25, 22, 25]
-                            
-                            for col_idx, (header, width) in enumerate(zip(headers, col_widths), 1):
-                                cell = ws.cell(row=3, column=col_idx, value=header)
-                                cell.font = header_font
-                                cell.fill = header_fill
-                                cell.border = thin_border
-                                cell.alignment = center_align
-                                ws.column_dimensions[get_column_letter(col_idx)].width = width
-                            
-                            # Data
-                            row_num = 4
-                            for idx, (_, row) in enumerate(df_data.iterrows(), 1):
-                                ws.row_dimensions[row_num].height = 60  # Tinggi untuk TTD
-                                
-                                # No
-                                cell = ws.cell(row=row_num, column=1, value=idx)
-                                cell.border = thin_border
-                                cell.alignment = center_align
-                                
-                                # Nama
-                                cell = ws.cell(row=row_num, column=2, value=str(row.get('Nama', '')))
-                                cell.border = thin_border
-                                cell.alignment = Alignment(vertical='center', wrap_text=True)
-                                
-                                # NIP
-                                cell = ws.cell(row=row_num, column=3, value=str(row.get('NIP', '')))
-                                cell.border = thin_border
-                                cell.alignment = center_align
-                                
-                                # Timestamp
-                                cell = ws.cell(row=row_num, column=4, value=str(row.get('Timestamp', '')))
-                                cell.border = thin_border
-                                cell.alignment = center_align
-                                
-                                # TTD
-                                cell = ws.cell(row=row_num, column=5, value='')
-                                cell.border = thin_border
-                                
-                                sig_data = row.get('Signature', '')
-                                if sig_data and len(str(sig_data)) > 200:
-                                    try:
-                                        sig_bytes = base64.b64decode(str(sig_data))
-                                        sig_stream = BytesIO(sig_bytes)
-                                        sig_pil = Image.open(sig_stream)
-                                        
-                                        # Resize TTD
-                                        sig_pil = sig_pil.resize((150, 50), Image.LANCZOS)
-                                        
-                                        img_buffer = BytesIO()
-                                        sig_pil.save(img_buffer, format='PNG')
-                                        img_buffer.seek(0)
-                                        
-                                        xl_img = XlImage(img_buffer)
-                                        xl_img.width = 150
-                                        xl_img.height = 50
-                                        
-                                        cell_ref = f'E{row_num}'
-                                        ws.add_image(xl_img, cell_ref)
-                                    except:
-                                        ws.cell(row=row_num, column=5, value='(TTD tidak tersedia)')
-                                else:
-                                    ws.cell(row=row_num, column=5, value='(TTD tidak tersedia)')
-                                
-                                row_num += 1
-                            
-                            # Save ke BytesIO
-                            output = BytesIO()
-                            wb.save(output)
-                            output.seek(0)
-                            return output
-                        
                         excel_data = generate_excel_daftar_hadir(df_filtered, selected_meeting)
                         st.download_button(
                             "📥 Download Daftar Hadir (Excel)",
@@ -675,15 +722,15 @@ def admin_page():
                                     'pimpinan': rapat_val('Pimpinan')
                                 }
                                 
-                                pdf_filename = generate_pdf(data_rapat_dict, peserta_list, notulensi_text)
+                                pdf_bytes = generate_pdf(data_rapat_dict, peserta_list, notulensi_text, kop)
+                                timestamp = now_wib().strftime("%Y%m%d_%H%M%S")
                                 
-                                with open(pdf_filename, "rb") as pdf_file:
-                                    st.download_button(
-                                        "📥 Download PDF Notulensi",
-                                        pdf_file.read(),
-                                        pdf_filename,
-                                        "application/pdf"
-                                    )
+                                st.download_button(
+                                    "📥 Download PDF Notulensi",
+                                    pdf_bytes,
+                                    f"Notulensi_Rapat_{timestamp}.pdf",
+                                    "application/pdf"
+                                )
                                 
                                 st.success("✅ PDF berhasil dibuat!")
                             else:
@@ -954,7 +1001,7 @@ def find_column(df, target_name):
     return None
 
 # ============= HALAMAN FORM ABSENSI =============
-def absensi_page():
+def absensi_page(tenant=None):
     """Halaman Form Absensi untuk Peserta"""
     
     # Ambil meeting_id dari URL parameter
@@ -989,7 +1036,7 @@ def absensi_page():
     meeting_id = str(meeting_id).strip()
     
     # Ambil data rapat
-    sheet = connect_to_gsheet()
+    sheet = connect_to_gsheet(tenant)
     if not sheet:
         st.error("❌ Tidak dapat terhubung ke database.")
         return
@@ -1069,16 +1116,22 @@ def absensi_page():
         # Form Absensi
         st.header("✍️ Isi Data Absensi")
         
-        nama = st.text_input(
-            "Nama Lengkap *",
-            placeholder="Contoh: Budi Santoso, S.Pd"
-        )
-        
         nip = st.text_input(
             "NIP *",
             placeholder="Contoh: 197501011998031001"
         )
         
+        # NIP yang ada di DAFTAR_GURU langsung mengisi nama resmi
+        guru = GURU_PER_NIP.get(nip.strip())
+        nama = st.text_input(
+            "Nama Lengkap *",
+            value=guru['nama'] if guru else '',
+            placeholder="Contoh: Budi Santoso, S.Pd",
+            disabled=guru is not None
+        )
+        if guru:
+            st.caption(f"Terdaftar sebagai {guru['jabatan']}")
+        
         st.markdown("### ✍️ Tanda Tangan Digital")
         st.info("Silakan tanda tangan di kotak di bawah ini menggunakan mouse/touchscreen")
         
@@ -1109,7 +1162,7 @@ def absensi_page():
         if st.button("✅ Submit Absensi", type="primary", use_container_width=True):
             if not nama or not nip:
                 st.error("❌ Nama dan NIP wajib diisi!")
-            elif canvas_result.image_data is None or canvas_result.image_data.sum() == 0:
+            elif canvas_result.image_data is None or not has_ink(canvas_result.image_data):
                 st.error("❌ Tanda tangan belum dibuat!")
             else:
                 # Cek duplikasi menggunakan read robust
@@ -1133,11 +1186,12 @@ def absensi_page():
                             st.warning("⚠️ Anda sudah melakukan absensi untuk rapat ini!")
                             return
                 
-                # Simpan tanda tangan sebagai base64
-                img = Image.fromarray(canvas_result.image_data.astype('uint8'))
-                buffered = BytesIO()
-                img.save(buffered, format="PNG")
-                signature_base64 = base64.b64encode(buffered.getvalue()).decode()
+                # Simpan tanda tangan sebagai goresan vektor atau PNG abu-abu yang sudah di-crop
+                if get_signature_format() == 'strokes':
+                    strokes = strokes_from_fabric(canvas_result.json_data)
+                    signature_base64 = encode_strokes(strokes, 600, 200, line_width=3)
+                else:
+                    signature_base64 = encode_signature(canvas_result.image_data)
                 
                 row_data = [
                     meeting_id,
@@ -1164,17 +1218,19 @@ def main():
     
     query_params = st.query_params
     page = query_params.get("page", "admin")
+    tenant = get_current_tenant()
+    kop = tenant.kop if tenant else Kop()
     
     if page == "absensi":
-        absensi_page()
+        absensi_page(tenant)
     else:
-        admin_page()
+        admin_page(tenant)
     
     # Footer
     st.markdown("---")
     st.markdown(
         "<div style='text-align: center; color: gray; font-size: 12px;'>"
-        "© 2026 SD Negeri Simoangin-Angin | Sistem Absensi & Notulensi Rapat v2.0"
+        f"© 2026 {kop.sekolah} | Sistem Absensi & Notulensi Rapat v2.0"
         "</div>",
         unsafe_allow_html=True
     )
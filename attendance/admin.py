@@ -1,11 +1,22 @@
 from django.contrib import admin
+from django.template.response import TemplateResponse
+from django.urls import path
 
-from .models import Attendance, Meeting
+from .duplicates import (
+    HASH_BITS,
+    INCONSISTENT_DISTANCE,
+    MAX_SAME_SIGNATURE_DISTANCE,
+    SAME_SIGNATURE_DISTANCE,
+    clamp_distance,
+    find_inconsistent_signatures,
+    find_shared_signatures,
+)
+from .models import Attendance, Meeting, Participant, RosterEntry
 
 
 @admin.register(Meeting)
 class MeetingAdmin(admin.ModelAdmin):
-    list_display = ("title", "meeting_date", "meeting_time", "location", "leader", "status", "created_at")
+    list_display = ("title", "meeting_date", "meeting_time", "location", "leader", "status", "attendance_count", "created_at")
     search_fields = ("title", "location", "leader")
     list_filter = ("status", "meeting_date")
 
@@ -14,3 +25,47 @@ class MeetingAdmin(admin.ModelAdmin):
 class AttendanceAdmin(admin.ModelAdmin):
     list_display = ("meeting", "name", "nip", "timestamp")
     search_fields = ("name", "nip", "meeting__title")
+    change_list_template = "admin/attendance/attendance/change_list.html"
+
+    def get_urls(self):
+        urls = [
+            path(
+                "signature-report/",
+                self.admin_site.admin_view(self.signature_report_view),
+                name="attendance_attendance_signature_report",
+            ),
+        ]
+        return urls + super().get_urls()
+
+    def signature_report_view(self, request):
+        def distance(name, default, maximum):
+            try:
+                return clamp_distance(request.GET.get(name, default), maximum)
+            except ValueError:
+                return default
+
+        same_distance = distance("distance", SAME_SIGNATURE_DISTANCE, MAX_SAME_SIGNATURE_DISTANCE)
+        inconsistent_distance = distance("inconsistent_distance", INCONSISTENT_DISTANCE, HASH_BITS)
+        context = {
+            **self.admin_site.each_context(request),
+            "opts": self.model._meta,
+            "title": "Laporan kemiripan tanda tangan",
+            "distance": same_distance,
+            "max_distance": MAX_SAME_SIGNATURE_DISTANCE,
+            "inconsistent_distance": inconsistent_distance,
+            "shared_groups": find_shared_signatures(max_distance=same_distance),
+            "inconsistent": find_inconsistent_signatures(min_distance=inconsistent_distance),
+        }
+        return TemplateResponse(request, "admin/attendance/signature_report.html", context)
+
+
+@admin.register(RosterEntry)
+class RosterEntryAdmin(admin.ModelAdmin):
+    list_display = ("meeting", "name", "nip", "position")
+    search_fields = ("name", "nip", "meeting__title")
+
+
+@admin.register(Participant)
+class ParticipantAdmin(admin.ModelAdmin):
+    list_display = ("name", "nip", "position", "updated_at")
+    search_fields = ("name", "nip")
@@ -0,0 +1,242 @@
+import difflib
+import gzip
+import json
+import os
+import sqlite3
+from dataclasses import dataclass
+from pathlib import Path
+
+from django.utils import timezone
+
+from .sheets import ABSENSI_HEADERS, ABSENSI_SHEET, RAPAT_HEADERS, RAPAT_SHEET, column_letter, get_or_create_worksheet
+from .sync import row_hash
+
+BACKUP_SHEETS = {RAPAT_SHEET: RAPAT_HEADERS, ABSENSI_SHEET: ABSENSI_HEADERS}
+MANIFEST_NAME = "manifest.json"
+HASHES_PREFIX = "hashes-"
+# Batas len(lama) x len(baru) baris yang masih di-diff per baris (~0,5 detik)
+MAX_DIFF_CELLS = 4_000_000
+
+
+@dataclass
+class BackupResult:
+    filename: str
+    kind: str
+    rows: int
+    changed_rows: int
+    size: int
+
+    def __str__(self):
+        return (
+            f"{self.filename} ({self.kind}): {self.rows} baris, {self.changed_rows} baris baru/berubah, "
+            f"{self.size / 1024:.1f} KB"
+        )
+
+
+def _replace_atomic(path, write):
+    # Tulis ke file sementara lalu rename: file tujuan selalu versi lama utuh atau versi baru utuh
+    path = Path(path)
+    temp = path.with_name(f".{path.name}.tmp")
+    try:
+        write(temp)
+        with open(temp, "rb") as f:
+            os.fsync(f.fileno())
+        os.replace(temp, path)
+    finally:
+        temp.unlink(missing_ok=True)
+
+
+def _write_gzip_json(path, data):
+    def write(temp):
+        with gzip.open(temp, "wt", encoding="utf-8", compresslevel=6) as f:
+            json.dump(data, f, separators=(",", ":"))
+
+    _replace_atomic(path, write)
+
+
+def _read_gzip_json(path):
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def load_manifest(directory):
+    path = Path(directory) / MANIFEST_NAME
+    if not path.exists():
+        return []
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def _save_manifest(directory, manifest):
+    _replace_atomic(
+        Path(directory) / MANIFEST_NAME,
+        lambda temp: temp.write_text(json.dumps(manifest, indent=2), encoding="utf-8"),
+    )
+
+
+def _diff_ops(old_hashes, new_hashes, new_rows):
+    """Operasi untuk membangun ulang baris baru dari baris snapshot sebelumnya.
+
+    Awalan dan akhiran yang sama dibuang dulu (umumnya hanya beberapa baris yang
+    berubah). SequenceMatcher kuadratik bila banyak baris kembar (baris kosong atau
+    bertemplat), jadi bagian tengah yang lebih besar dari MAX_DIFF_CELLS disimpan
+    utuh sebagai insert.
+    """
+    limit = min(len(old_hashes), len(new_hashes))
+    prefix = 0
+    while prefix < limit and old_hashes[prefix] == new_hashes[prefix]:
+        prefix += 1
+    suffix = 0
+    while suffix < limit - prefix and old_hashes[-1 - suffix] == new_hashes[-1 - suffix]:
+        suffix += 1
+    old_end, new_end = len(old_hashes) - suffix, len(new_hashes) - suffix
+
+    ops = [["copy", 0, prefix]] if prefix else []
+    old_middle, new_middle = old_hashes[prefix:old_end], new_hashes[prefix:new_end]
+    if old_middle and new_middle and len(old_middle) * len(new_middle) <= MAX_DIFF_CELLS:
+        matcher = difflib.SequenceMatcher(None, old_middle, new_middle, autojunk=False)
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+            if tag == "equal":
+                ops.append(["copy", prefix + i1, prefix + i2])
+            elif j2 > j1:
+                ops.append(["insert", new_rows[prefix + j1:prefix + j2]])
+    elif new_middle:
+        ops.append(["insert", new_rows[prefix:new_end]])
+    if suffix:
+        ops.append(["copy", old_end, len(old_hashes)])
+    return ops
+
+
+def _apply_ops(old_rows, ops):
+    rows = []
+    for op in ops:
+        if op[0] == "copy":
+            rows.extend(old_rows[op[1]:op[2]])
+        else:
+            rows.extend(op[1])
+    return rows
+
+
+def read_sheets(spreadsheet):
+    sheets = {}
+    for title in BACKUP_SHEETS:
+        sheets[title] = spreadsheet.worksheet(title).get_all_values()
+    return sheets
+
+
+def create_backup(spreadsheet, directory, full=False, max_chain=30):
+    """Simpan snapshot terkompresi; setelah snapshot penuh pertama hanya diff baris yang disimpan.
+
+    Manifest adalah titik commit: file snapshot dan file hash baris ditulis lebih
+    dulu dengan nama unik, lalu manifest diganti secara atomik dengan entri yang
+    menunjuk keduanya. Bila proses mati di tengah jalan, manifest lama tetap
+    konsisten dan diff berikutnya dihitung dari hash snapshot yang tercatat.
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    manifest = load_manifest(directory)
+    previous_hashes = manifest[-1].get("hashes") if manifest else None
+
+    sheets = read_sheets(spreadsheet)
+    new_hashes = {title: [row_hash(row)[:16] for row in rows] for title, rows in sheets.items()}
+    chain = 0
+    for entry in reversed(manifest):
+        if entry["kind"] == "base":
+            break
+        chain += 1
+
+    stamp = timezone.now().strftime("%Y%m%dT%H%M%S%f")
+    if full or not previous_hashes or not (directory / previous_hashes).exists() or chain >= max_chain:
+        kind = "base"
+        payload = {"sheets": sheets}
+        changed = sum(len(rows) for rows in sheets.values())
+    else:
+        kind = "diff"
+        old_hashes = _read_gzip_json(directory / previous_hashes)
+        payload = {"sheets": {}}
+        changed = 0
+        for title, rows in sheets.items():
+            ops = _diff_ops(old_hashes.get(title, []), new_hashes[title], rows)
+            payload["sheets"][title] = ops
+            changed += sum(len(op[1]) for op in ops if op[0] == "insert")
+
+    filename = f"{kind}-{stamp}.json.gz"
+    hashes_name = f"{HASHES_PREFIX}{stamp}.json.gz"
+    _write_gzip_json(directory / filename, payload)
+    _write_gzip_json(directory / hashes_name, new_hashes)
+    manifest.append({"file": filename, "kind": kind, "hashes": hashes_name, "created_at": timezone.now().isoformat()})
+    _save_manifest(directory, manifest)
+    # Hanya hash snapshot terbaru yang dipakai; sisa dari snapshot lama/gagal dihapus
+    for path in directory.glob(f"{HASHES_PREFIX}*.json.gz"):
+        if path.name != hashes_name:
+            path.unlink(missing_ok=True)
+
+    return BackupResult(
+        filename=filename,
+        kind=kind,
+        rows=sum(len(rows) for rows in sheets.values()),
+        changed_rows=changed,
+        size=(directory / filename).stat().st_size,
+    )
+
+
+def load_snapshot(directory, filename=None):
+    """Bangun ulang isi sheet pada snapshot tertentu (default: terbaru)."""
+    directory = Path(directory)
+    manifest = load_manifest(directory)
+    if filename:
+        names = [entry["file"] for entry in manifest]
+        if filename not in names:
+            raise FileNotFoundError(filename)
+        manifest = manifest[: names.index(filename) + 1]
+    if not manifest:
+        raise FileNotFoundError("Belum ada snapshot.")
+
+    start = max(i for i, entry in enumerate(manifest) if entry["kind"] == "base")
+    sheets = _read_gzip_json(directory / manifest[start]["file"])["sheets"]
+    for entry in manifest[start + 1:]:
+        diff = _read_gzip_json(directory / entry["file"])["sheets"]
+        sheets = {title: _apply_ops(sheets.get(title, []), ops) for title, ops in diff.items()}
+    return sheets
+
+
+def restore_to_sheet(spreadsheet, sheets):
+    """Tulis ulang isi sheet dari snapshot.
+
+    Nilai snapshot ditulis lebih dulu, baru sel lama di luar area data dikosongkan:
+    bila update gagal (kuota/jaringan) sheet masih berisi data lama, bukan kosong.
+    """
+    for title, rows in sheets.items():
+        worksheet = get_or_create_worksheet(spreadsheet, title, BACKUP_SHEETS.get(title, rows[0] if rows else []))
+        height = len(rows)
+        width = max((len(row) for row in rows), default=0)
+        if rows:
+            # Baris pendek diisi "" agar sel lama di dalam area data ikut tertimpa
+            values = [list(row) + [""] * (width - len(row)) for row in rows]
+            worksheet.update(values, f"A1:{column_letter(width)}{height}", value_input_option="RAW")
+        last_column = column_letter(max(worksheet.col_count, 1))
+        stale = []
+        if worksheet.row_count > height:
+            stale.append(f"A{height + 1}:{last_column}{worksheet.row_count}")
+        if rows and worksheet.col_count > width:
+            stale.append(f"{column_letter(width + 1)}1:{last_column}{height}")
+        if stale:
+            worksheet.batch_clear(stale)
+
+
+def restore_to_sqlite(path, sheets):
+    connection = sqlite3.connect(path)
+    try:
+        with connection:
+            for title, rows in sheets.items():
+                headers = BACKUP_SHEETS.get(title) or (rows[0] if rows else [])
+                columns = ", ".join(f'"{header}" TEXT' for header in headers)
+                connection.execute(f'DROP TABLE IF EXISTS "{title}"')
+                connection.execute(f'CREATE TABLE "{title}" ({columns})')
+                placeholders = ", ".join("?" for _ in headers)
+                width = len(headers)
+                connection.executemany(
+                    f'INSERT INTO "{title}" VALUES ({placeholders})',
+                    ((list(row) + [""] * width)[:width] for row in rows[1:]),
+                )
+    finally:
+        connection.close()
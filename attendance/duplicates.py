@@ -0,0 +1,169 @@
+from collections import defaultdict
+from dataclasses import dataclass, field
+
+from signature_utils import hamming
+
+from .models import Attendance
+
+# Jarak Hamming dHash 256-bit: <= 16 praktis gambar yang sama (hanya bergeser/berskala),
+# TTD orang berbeda umumnya berjarak 40-100
+SAME_SIGNATURE_DISTANCE = 16
+INCONSISTENT_DISTANCE = 64
+HASH_BITS = 256
+# Radius lebih besar membuat band indeks terlalu pendek (~10 bit) sehingga hampir semua
+# hash jadi kandidat satu sama lain dan pencarian kembali kuadratik
+MAX_SAME_SIGNATURE_DISTANCE = 24
+
+
+def clamp_distance(value, maximum):
+    return min(max(int(value), 0), maximum)
+
+
+class HashIndex:
+    """Indeks multi-band untuk mencari hash dalam jarak Hamming ``radius``.
+
+    Hash dipecah menjadi ``radius + 1`` band bit yang tidak tumpang tindih. Dua
+    hash yang berjarak <= ``radius`` pasti sama persis di minimal satu band
+    (prinsip sarang merpati), jadi kandidat cukup diambil dari bucket band yang
+    sama lalu diverifikasi. Untuk hash yang tersebar, setiap query hanya
+    menyentuh segelintir kandidat sehingga total kerja mendekati linear.
+    """
+
+    def __init__(self, radius, bits=HASH_BITS):
+        if not 0 <= radius < bits:
+            raise ValueError(f"radius harus 0..{bits - 1}")
+        self.radius = radius
+        bands = radius + 1
+        edges = [round(i * bits / bands) for i in range(bands + 1)]
+        self.bands = [(((1 << (hi - lo)) - 1) << lo, lo) for lo, hi in zip(edges, edges[1:]) if hi > lo]
+        self.buckets = defaultdict(list)
+
+    def _keys(self, value):
+        return [(i, (value & mask) >> shift) for i, (mask, shift) in enumerate(self.bands)]
+
+    def add(self, value):
+        for key in self._keys(value):
+            self.buckets[key].append(value)
+
+    def search(self, value):
+        """Daftar (jarak, hash) untuk semua hash terindeks dalam ``radius``."""
+        seen = set()
+        results = []
+        for key in self._keys(value):
+            for other in self.buckets.get(key, ()):
+                if other in seen:
+                    continue
+                seen.add(other)
+                distance = hamming(value, other)
+                if distance <= self.radius:
+                    results.append((distance, other))
+        return results
+
+
+@dataclass
+class SharedSignatureGroup:
+    """TTD yang hampir identik tetapi dipakai oleh lebih dari satu NIP."""
+
+    attendances: list
+    max_distance: int = 0
+
+    @property
+    def nips(self):
+        return sorted({attendance.nip for attendance in self.attendances})
+
+
+@dataclass
+class InconsistentSignature:
+    """TTD satu NIP yang jauh berbeda dari TTD yang biasa dipakai NIP tersebut."""
+
+    attendance: Attendance
+    distance: int
+    usual: list = field(default_factory=list)
+
+
+def _signature_rows(queryset=None):
+    queryset = Attendance.objects.all() if queryset is None else queryset
+    return list(
+        queryset.exclude(signature_phash="")
+        .exclude(signature_phash="0" * 64)
+        .select_related("meeting")
+        .only("id", "name", "nip", "timestamp", "signature", "signature_phash", "meeting__title", "meeting__meeting_date")
+        .order_by("timestamp")
+    )
+
+
+def find_shared_signatures(queryset=None, max_distance=SAME_SIGNATURE_DISTANCE):
+    """Kelompokkan TTD yang jaraknya <= ``max_distance``; kembalikan kelompok dengan >= 2 NIP.
+
+    ``max_distance`` dibatasi ke 0..MAX_SAME_SIGNATURE_DISTANCE.
+    """
+    max_distance = clamp_distance(max_distance, MAX_SAME_SIGNATURE_DISTANCE)
+    by_hash = defaultdict(list)
+    for attendance in _signature_rows(queryset):
+        by_hash[int(attendance.signature_phash, 16)].append(attendance)
+
+    index = HashIndex(max_distance)
+    for value in by_hash:
+        index.add(value)
+
+    # Union-find atas hash unik: hash yang saling berdekatan jadi satu kelompok
+    parent = {value: value for value in by_hash}
+
+    def find(value):
+        while parent[value] != value:
+            parent[value] = parent[parent[value]]
+            value = parent[value]
+        return value
+
+    edges = []
+    for value in by_hash:
+        for distance, other in index.search(value):
+            if other != value:
+                parent[find(other)] = find(value)
+                edges.append((value, distance))
+
+    spread = defaultdict(int)
+    for value, distance in edges:
+        root = find(value)
+        spread[root] = max(spread[root], distance)
+
+    groups = defaultdict(list)
+    for value, attendances in by_hash.items():
+        groups[find(value)].extend(attendances)
+
+    result = []
+    for root, attendances in groups.items():
+        if len({attendance.nip for attendance in attendances}) > 1:
+            result.append(SharedSignatureGroup(attendances=attendances, max_distance=spread[root]))
+    result.sort(key=lambda group: (-len(group.nips), group.max_distance))
+    return result
+
+
+def find_inconsistent_signatures(queryset=None, min_distance=INCONSISTENT_DISTANCE):
+    """TTD yang jaraknya > ``min_distance`` dari TTD paling representatif (medoid) NIP yang sama.
+
+    Medoid adalah hash dengan total jarak terkecil ke semua TTD NIP tersebut,
+    sehingga TTD mayoritas dianggap asli dan hanya yang menyimpang dilaporkan.
+    Per NIP hanya ada sebanyak rapat yang diikuti, jadi total kerja tetap linear
+    terhadap jumlah absensi untuk jumlah rapat per orang yang wajar.
+    """
+    min_distance = clamp_distance(min_distance, HASH_BITS)
+    by_nip = defaultdict(list)
+    for attendance in _signature_rows(queryset):
+        by_nip[attendance.nip].append(attendance)
+
+    result = []
+    for attendances in by_nip.values():
+        counts = defaultdict(int)
+        for attendance in attendances:
+            counts[int(attendance.signature_phash, 16)] += 1
+        if len(counts) < 2:
+            continue
+        medoid = min(counts, key=lambda value: sum(count * hamming(value, other) for other, count in counts.items()))
+        usual = [attendance for attendance in attendances if int(attendance.signature_phash, 16) == medoid]
+        for attendance in attendances:
+            distance = hamming(int(attendance.signature_phash, 16), medoid)
+            if distance > min_distance:
+                result.append(InconsistentSignature(attendance=attendance, distance=distance, usual=usual))
+    result.sort(key=lambda item: -item.distance)
+    return result
@@ -0,0 +1,137 @@
+import base64
+import binascii
+import os
+import tempfile
+
+from django.utils import timezone
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.drawing.image import Image as XlImage
+from openpyxl.styles import Alignment, Border, Font, NamedStyle, PatternFill, Side
+from openpyxl.utils import get_column_letter
+
+from signature_utils import STROKE_PREFIX, render_strokes
+
+from .storage import get_signature_storage
+
+EXCEL_CHUNK_SIZE = 500
+EXCEL_COLUMNS = (("No", 6), ("Nama", 30), ("NIP", 25), ("Waktu Absen", 22), ("Tanda Tangan", 25))
+# Tinggi baris dalam poin; TTD ditampilkan 150x50 piksel seperti ekspor Excel di app.py
+EXCEL_ROW_HEIGHT = 45
+EXCEL_SIGNATURE_SIZE = (150, 50)
+STROKES_RENDER_SIZE = (300, 100)
+
+
+def _thin_border():
+    side = Side(style="thin")
+    return Border(left=side, right=side, top=side, bottom=side)
+
+
+def _named_styles():
+    center = Alignment(horizontal="center", vertical="center", wrap_text=True)
+    return (
+        NamedStyle("absensi_judul", font=Font(bold=True, size=14), alignment=Alignment(horizontal="center")),
+        NamedStyle(
+            "absensi_header",
+            font=Font(bold=True, color="FFFFFF", size=11),
+            fill=PatternFill(start_color="2E86C1", end_color="2E86C1", fill_type="solid"),
+            border=_thin_border(),
+            alignment=center,
+        ),
+        NamedStyle("absensi_tengah", border=_thin_border(), alignment=center),
+        NamedStyle("absensi_teks", border=_thin_border(), alignment=Alignment(vertical="center", wrap_text=True)),
+    )
+
+
+def _cell(sheet, value, style):
+    cell = WriteOnlyCell(sheet, value=value)
+    cell.style = style
+    return cell
+
+
+class SignatureImages:
+    """Path file PNG TTD untuk openpyxl.
+
+    openpyxl baru membaca isi gambar saat workbook disimpan, jadi yang ditahan di
+    memori hanya path-nya. TTD PNG dipakai langsung dari storage; goresan dirender
+    sekali per file (nama = hash isi) ke direktori sementara.
+    """
+
+    def __init__(self, directory, storage=None):
+        self.directory = directory
+        self.storage = storage or get_signature_storage()
+        self.rendered = {}
+
+    def path(self, name):
+        if not name or not self.storage.exists(name):
+            return None
+        if not name.endswith(".strokes"):
+            return self.storage.path(name)
+        if name not in self.rendered:
+            with self.storage.open(name, "rb") as f:
+                text = STROKE_PREFIX + base64.b64encode(f.read()).decode("ascii")
+            path = os.path.join(self.directory, f"{len(self.rendered)}.png")
+            try:
+                render_strokes(text, STROKES_RENDER_SIZE).save(path, format="PNG")
+            except (binascii.Error, IndexError, ValueError):
+                # File goresan rusak: sel ditandai "TTD tidak tersedia", ekspor tetap jalan
+                path = None
+            self.rendered[name] = path
+        return self.rendered[name]
+
+
+def write_meeting_workbook(meeting, output, chunk_size=EXCEL_CHUNK_SIZE):
+    """Tulis daftar hadir rapat (dengan gambar TTD) sebagai .xlsx ke file ``output``.
+
+    Memakai mode write-only openpyxl: baris langsung ditulis ke file sementara,
+    style dibagi lewat NamedStyle alih-alih objek style per sel, dan absensi
+    dibaca per ``chunk_size`` baris.
+
+    Memori tidak konstan: openpyxl membangun objek anchor/gambar dan XML drawing
+    untuk semua TTD sekaligus saat save, sekitar 8 KB per gambar di atas ~0,3 MB
+    dasar (diukur benchmarks/bench_excel_export.py: 1,0 MB untuk 100 peserta,
+    8,3 MB untuk 1000). Itulah anggaran memori ekspor ini.
+    """
+    workbook = Workbook(write_only=True)
+    for style in _named_styles():
+        workbook.add_named_style(style)
+    sheet = workbook.create_sheet("Daftar Hadir")
+    # Di mode write-only tinggi per baris tidak ditulis, jadi dipakai tinggi default sheet
+    sheet.sheet_format.defaultRowHeight = EXCEL_ROW_HEIGHT
+    sheet.sheet_format.customHeight = True
+    for index, (_, width) in enumerate(EXCEL_COLUMNS, start=1):
+        sheet.column_dimensions[get_column_letter(index)].width = width
+
+    last_column = get_column_letter(len(EXCEL_COLUMNS))
+    sheet.merged_cells.add(f"A1:{last_column}1")
+    sheet.merged_cells.add(f"A2:{last_column}2")
+    sheet.append([_cell(sheet, f"DAFTAR HADIR RAPAT - {meeting.title}", "absensi_judul")])
+    sheet.append([f"{meeting.meeting_date} {meeting.meeting_time} | {meeting.location} | Pimpinan: {meeting.leader}"])
+    sheet.append([_cell(sheet, label, "absensi_header") for label, _ in EXCEL_COLUMNS])
+
+    attendances = (
+        meeting.attendances.order_by("timestamp")
+        .only("meeting_id", "name", "nip", "timestamp", "signature")
+        .iterator(chunk_size=chunk_size)
+    )
+    with tempfile.TemporaryDirectory() as directory:
+        images = SignatureImages(directory)
+        for index, attendance in enumerate(attendances, start=1):
+            row = index + 3
+            path = images.path(attendance.signature.name)
+            timestamp = timezone.localtime(attendance.timestamp).strftime("%Y-%m-%d %H:%M:%S")
+            sheet.append(
+                [
+                    _cell(sheet, index, "absensi_tengah"),
+                    _cell(sheet, attendance.name, "absensi_teks"),
+                    _cell(sheet, attendance.nip, "absensi_tengah"),
+                    _cell(sheet, timestamp, "absensi_tengah"),
+                    _cell(sheet, "" if path else "(TTD tidak tersedia)", "absensi_tengah"),
+                ]
+            )
+            if path:
+                image = XlImage(path)
+                image.width, image.height = EXCEL_SIGNATURE_SIZE
+                sheet.add_image(image, f"{last_column}{row}")
+        # Gambar dibaca dari path saat save, jadi direktori sementara harus masih ada
+        workbook.save(output)
@@ -1,6 +1,8 @@
 from django import forms
 
 from .models import Meeting
+from .roster import ROSTER_EXTENSIONS
+from .signatures import SignatureError, normalize_signature
 
 
 class MeetingForm(forms.ModelForm):
@@ -13,7 +15,55 @@ class MeetingForm(forms.ModelForm):
         }
 
 
+class MeetingFilterForm(forms.Form):
+    status = forms.ChoiceField(choices=[("", "Semua status")] + Meeting.STATUS_CHOICES, required=False, label="Status")
+    date_from = forms.DateField(required=False, label="Dari tanggal", widget=forms.DateInput(attrs={"type": "date"}))
+    date_to = forms.DateField(required=False, label="Sampai tanggal", widget=forms.DateInput(attrs={"type": "date"}))
+
+    def filter(self, queryset):
+        if not self.is_valid():
+            return queryset
+        if self.cleaned_data["status"]:
+            queryset = queryset.filter(status=self.cleaned_data["status"])
+        if self.cleaned_data["date_from"]:
+            queryset = queryset.filter(meeting_date__gte=self.cleaned_data["date_from"])
+        if self.cleaned_data["date_to"]:
+            queryset = queryset.filter(meeting_date__lte=self.cleaned_data["date_to"])
+        return queryset
+
+
+class RosterUploadForm(forms.Form):
+    file = forms.FileField(
+        label="File roster (CSV/XLSX)",
+        help_text="Baris pertama berisi judul kolom NIP, Nama, dan (opsional) Jabatan.",
+        widget=forms.ClearableFileInput(attrs={"accept": ",".join(ROSTER_EXTENSIONS)}),
+    )
+
+    def clean_file(self):
+        file = self.cleaned_data["file"]
+        if not file.name.lower().endswith(ROSTER_EXTENSIONS):
+            raise forms.ValidationError("Format file harus CSV atau XLSX.")
+        return file
+
+
 class AttendanceForm(forms.Form):
-    name = forms.CharField(max_length=255, label="Nama Lengkap")
-    nip = forms.CharField(max_length=50, label="NIP")
+    # Boleh kosong bila NIP sudah ada di roster rapat; nama diambil dari roster
+    name = forms.CharField(
+        max_length=255,
+        label="Nama Lengkap",
+        required=False,
+        widget=forms.TextInput(attrs={"list": "participant-names", "autocomplete": "off"}),
+    )
+    nip = forms.CharField(
+        max_length=50,
+        label="NIP",
+        widget=forms.TextInput(attrs={"list": "participant-nips", "autocomplete": "off", "inputmode": "numeric"}),
+    )
     signature_base64 = forms.CharField(widget=forms.HiddenInput(), required=False)
+
+    def clean_signature_base64(self):
+        # Dikembalikan sebagai Signature kanonik (atau None bila kosong)
+        try:
+            return normalize_signature(self.cleaned_data.get("signature_base64", ""))
+        except SignatureError as exc:
+            raise forms.ValidationError(str(exc)) from exc
@@ -0,0 +1,37 @@
+import asyncio
+import threading
+from collections import defaultdict
+
+# Pelanggan feed per rapat di proses ini: (event loop, asyncio.Event)
+_subscribers = defaultdict(set)
+_lock = threading.Lock()
+
+
+def notify(meeting_id):
+    """Bangunkan semua stream SSE rapat ini di proses yang sama; dipanggil setelah commit."""
+    with _lock:
+        subscribers = list(_subscribers.get(str(meeting_id), ()))
+    for loop, event in subscribers:
+        loop.call_soon_threadsafe(event.set)
+
+
+async def wait_for_change(meeting_id, timeout):
+    """Tunggu absensi baru di rapat ini atau ``timeout`` detik, mana yang lebih dulu.
+
+    Notifikasi hanya menjangkau proses yang sama; dengan beberapa worker,
+    timeout berfungsi sebagai polling sehingga absensi dari worker lain tetap
+    terkirim paling lambat ``timeout`` detik kemudian.
+    """
+    key = str(meeting_id)
+    subscriber = (asyncio.get_running_loop(), asyncio.Event())
+    with _lock:
+        _subscribers[key].add(subscriber)
+    try:
+        await asyncio.wait_for(subscriber[1].wait(), timeout)
+    except asyncio.TimeoutError:
+        pass
+    finally:
+        with _lock:
+            _subscribers[key].discard(subscriber)
+            if not _subscribers[key]:
+                del _subscribers[key]
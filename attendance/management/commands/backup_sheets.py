@@ -0,0 +1,28 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from attendance.backup import create_backup
+from attendance.sheets import open_spreadsheet
+
+
+class Command(BaseCommand):
+    help = "Backup Data_Rapat dan Data_Absensi ke snapshot terkompresi; run berikutnya hanya menyimpan diff baris."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dir", default=settings.SHEETS_BACKUP_DIR, help="Folder tujuan backup.")
+        parser.add_argument("--full", action="store_true", help="Paksa snapshot penuh baru.")
+        parser.add_argument(
+            "--max-chain",
+            type=int,
+            default=30,
+            help="Jumlah diff maksimum sebelum snapshot penuh baru dibuat otomatis.",
+        )
+
+    def handle(self, *args, **options):
+        if not settings.GOOGLE_SHEET_ID:
+            raise CommandError("GOOGLE_SHEET_ID belum diisi.")
+
+        result = create_backup(
+            open_spreadsheet(), options["dir"], full=options["full"], max_chain=options["max_chain"]
+        )
+        self.stdout.write(self.style.SUCCESS(f"Backup tersimpan: {result}"))
@@ -0,0 +1,68 @@
+import ast
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from attendance.models import Participant
+from attendance.participants import name_key
+from attendance.roster import RosterError, clean_nip, read_roster
+
+BATCH_SIZE = 500
+
+
+def app_participants():
+    """DAFTAR_GURU dari app.py (Streamlit) dibaca tanpa meng-import app.py."""
+    source = (Path(settings.BASE_DIR) / "app.py").read_text(encoding="utf-8")
+    for node in ast.parse(source).body:
+        if isinstance(node, ast.Assign) and any(getattr(target, "id", None) == "DAFTAR_GURU" for target in node.targets):
+            for number, guru in enumerate(ast.literal_eval(node.value), start=1):
+                yield number, guru["nip"], guru["nama"], guru.get("jabatan", "")
+            return
+    raise CommandError("DAFTAR_GURU tidak ditemukan di app.py.")
+
+
+class Command(BaseCommand):
+    help = "Isi/perbarui daftar induk peserta dari file CSV/XLSX (kolom NIP, Nama, Jabatan) atau DAFTAR_GURU di app.py."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", nargs="?", help="File CSV/XLSX.")
+        parser.add_argument("--from-app", action="store_true", help="Ambil dari DAFTAR_GURU di app.py.")
+
+    def handle(self, *args, **options):
+        if options["from_app"]:
+            self.load(app_participants())
+        elif options["path"]:
+            path = Path(options["path"])
+            try:
+                with path.open("rb") as f:
+                    self.load(read_roster(f, path.name))
+            except (OSError, RosterError) as exc:
+                raise CommandError(str(exc)) from exc
+        else:
+            raise CommandError("Berikan path file atau --from-app.")
+
+    def load(self, rows):
+        participants = {}
+        invalid = 0
+        for number, raw_nip, raw_name, raw_position in rows:
+            nip = clean_nip(raw_nip)
+            name = str(raw_name or "").strip()
+            if nip is None or not name:
+                invalid += 1
+                self.stderr.write(f"Baris {number} dilewati: NIP {raw_nip!r}, nama {raw_name!r}")
+                continue
+            participants[nip] = Participant(
+                nip=nip, name=name, name_key=name_key(name), position=str(raw_position or "").strip()
+            )
+
+        with transaction.atomic():
+            Participant.objects.bulk_create(
+                participants.values(),
+                batch_size=BATCH_SIZE,
+                update_conflicts=True,
+                unique_fields=["nip"],
+                update_fields=["name", "name_key", "position", "updated_at"],
+            )
+        self.stdout.write(self.style.SUCCESS(f"{len(participants)} peserta disimpan, {invalid} baris dilewati."))
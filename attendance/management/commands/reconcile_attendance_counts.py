@@ -0,0 +1,45 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from attendance.models import Attendance, Meeting
+from attendance.signals import latest_attendance
+
+
+class Command(BaseCommand):
+    help = "Cocokkan ulang jumlah hadir dan waktu absen terakhir yang tersimpan di setiap rapat."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dry-run", action="store_true", help="Hanya tampilkan selisih, jangan simpan.")
+
+    def handle(self, *args, **options):
+        counts = (
+            Attendance.objects.filter(meeting_id=OuterRef("pk"))
+            .order_by()
+            .values("meeting_id")
+            .annotate(count=Count("id"))
+            .values("count")
+        )
+        meetings = Meeting.objects.annotate(
+            actual_count=Coalesce(Subquery(counts, output_field=IntegerField()), 0),
+            actual_latest=latest_attendance(),
+        ).only("meeting_id", "title", "attendance_count", "last_attendance_at")
+
+        fixed = []
+        for meeting in meetings.iterator(chunk_size=500):
+            if meeting.attendance_count == meeting.actual_count and meeting.last_attendance_at == meeting.actual_latest:
+                continue
+            self.stdout.write(
+                f"- {meeting.title} ({meeting.meeting_id}): {meeting.attendance_count} -> {meeting.actual_count} hadir, "
+                f"terakhir {meeting.last_attendance_at} -> {meeting.actual_latest}"
+            )
+            meeting.attendance_count = meeting.actual_count
+            meeting.last_attendance_at = meeting.actual_latest
+            fixed.append(meeting)
+
+        if fixed and not options["dry_run"]:
+            with transaction.atomic():
+                Meeting.objects.bulk_update(fixed, ["attendance_count", "last_attendance_at"], batch_size=500)
+        verb = "perlu diperbaiki" if options["dry_run"] else "diperbaiki"
+        self.stdout.write(self.style.SUCCESS(f"{len(fixed)} rapat {verb}."))
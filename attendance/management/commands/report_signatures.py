@@ -0,0 +1,56 @@
+from django.core.management.base import BaseCommand
+
+from attendance.duplicates import (
+    INCONSISTENT_DISTANCE,
+    MAX_SAME_SIGNATURE_DISTANCE,
+    SAME_SIGNATURE_DISTANCE,
+    find_inconsistent_signatures,
+    find_shared_signatures,
+)
+from attendance.models import Attendance
+
+
+class Command(BaseCommand):
+    help = "Laporkan TTD hampir identik dengan NIP berbeda dan TTD yang tidak konsisten untuk satu NIP."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--distance",
+            type=int,
+            default=SAME_SIGNATURE_DISTANCE,
+            help=(
+                f"Jarak Hamming maksimum untuk dianggap TTD yang sama "
+                f"(default {SAME_SIGNATURE_DISTANCE}, paling besar {MAX_SAME_SIGNATURE_DISTANCE})."
+            ),
+        )
+        parser.add_argument(
+            "--inconsistent-distance",
+            type=int,
+            default=INCONSISTENT_DISTANCE,
+            help=f"Jarak minimum dari TTD yang biasa dipakai NIP yang sama (default {INCONSISTENT_DISTANCE}).",
+        )
+        parser.add_argument("--since", help="Hanya absensi sejak tanggal ini (YYYY-MM-DD).")
+
+    def handle(self, *args, **options):
+        queryset = Attendance.objects.all()
+        if options["since"]:
+            queryset = queryset.filter(timestamp__date__gte=options["since"])
+
+        shared = find_shared_signatures(queryset, options["distance"])
+        self.stdout.write(self.style.MIGRATE_HEADING(f"TTD sama dengan NIP berbeda: {len(shared)} kelompok"))
+        for group in shared:
+            self.stdout.write(f"- NIP {', '.join(group.nips)} (jarak maks {group.max_distance})")
+            for attendance in group.attendances:
+                self.stdout.write(
+                    f"    {attendance.nip} {attendance.name} | {attendance.meeting.title} | {attendance.timestamp:%Y-%m-%d %H:%M}"
+                )
+
+        inconsistent = find_inconsistent_signatures(queryset, options["inconsistent_distance"])
+        self.stdout.write(self.style.MIGRATE_HEADING(f"TTD tidak konsisten untuk satu NIP: {len(inconsistent)}"))
+        for item in inconsistent:
+            attendance = item.attendance
+            self.stdout.write(
+                f"- {attendance.nip} {attendance.name} | {attendance.meeting.title} | "
+                f"{attendance.timestamp:%Y-%m-%d %H:%M} (jarak {item.distance} dari TTD yang biasa, "
+                f"dipakai di {len(item.usual)} absensi lain)"
+            )
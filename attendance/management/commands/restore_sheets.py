@@ -0,0 +1,34 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from attendance.backup import load_snapshot, restore_to_sheet, restore_to_sqlite
+from attendance.sheets import open_spreadsheet
+
+
+class Command(BaseCommand):
+    help = "Pulihkan snapshot backup ke Google Sheets atau ke file SQLite."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dir", default=settings.SHEETS_BACKUP_DIR, help="Folder backup.")
+        parser.add_argument("--snapshot", help="Nama file snapshot (default: terbaru).")
+        target = parser.add_mutually_exclusive_group(required=True)
+        target.add_argument("--to-sheet", action="store_true", help="Timpa worksheet di GOOGLE_SHEET_ID.")
+        target.add_argument("--to-sqlite", metavar="PATH", help="Tulis ke database SQLite.")
+
+    def handle(self, *args, **options):
+        try:
+            sheets = load_snapshot(options["dir"], options["snapshot"])
+        except FileNotFoundError as exc:
+            raise CommandError(f"Snapshot tidak ditemukan: {exc}")
+
+        if options["to_sheet"]:
+            if not settings.GOOGLE_SHEET_ID:
+                raise CommandError("GOOGLE_SHEET_ID belum diisi.")
+            restore_to_sheet(open_spreadsheet(), sheets)
+            target = "Google Sheets"
+        else:
+            restore_to_sqlite(options["to_sqlite"], sheets)
+            target = options["to_sqlite"]
+
+        rows = sum(max(len(values) - 1, 0) for values in sheets.values())
+        self.stdout.write(self.style.SUCCESS(f"{rows} baris dipulihkan ke {target}."))
@@ -0,0 +1,25 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from attendance.models import SheetSyncState
+from attendance.sheets import open_spreadsheet
+from attendance.sync import SheetSync
+
+
+class Command(BaseCommand):
+    help = "Sinkronisasi inkremental data rapat dan absensi antara database dan Google Sheets."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--full",
+            action="store_true",
+            help="Abaikan watermark: baca ulang seluruh sheet dan tulis ulang semua baris dari database.",
+        )
+
+    def handle(self, *args, **options):
+        if not settings.GOOGLE_SHEET_ID:
+            raise CommandError("GOOGLE_SHEET_ID belum diisi.")
+
+        state, _ = SheetSyncState.objects.get_or_create(spreadsheet_id=settings.GOOGLE_SHEET_ID)
+        report = SheetSync(open_spreadsheet(), state).run(full=options["full"])
+        self.stdout.write(self.style.SUCCESS(f"Sinkronisasi selesai: {report}"))
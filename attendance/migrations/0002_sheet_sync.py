@@ -0,0 +1,43 @@
+# Generated by Django 5.2.18 on 2026-10-19 17:55
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('attendance', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SheetSyncState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('spreadsheet_id', models.CharField(max_length=255, unique=True)),
+                ('pushed_at', models.DateTimeField(blank=True, null=True)),
+                ('sheet_revision', models.CharField(blank=True, max_length=64)),
+                ('synced_at', models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='attendance',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.CreateModel(
+            name='SheetRow',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('worksheet', models.CharField(max_length=100)),
+                ('key', models.CharField(max_length=255)),
+                ('row_number', models.PositiveIntegerField()),
+                ('row_hash', models.CharField(max_length=40)),
+                ('state', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='rows', to='attendance.sheetsyncstate')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('state', 'worksheet', 'key'), name='unique_sheet_row_per_state')],
+            },
+        ),
+    ]
@@ -0,0 +1,118 @@
+import base64
+import binascii
+import hashlib
+from io import BytesIO
+
+import attendance.storage
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+from django.db import migrations, models
+from PIL import Image
+
+# Logika dibekukan di sini (bukan import attendance.storage) agar migrasi tidak ikut berubah
+# saat validasi TTD di aplikasi diperketat. Data lama dipindahkan apa adanya, tanpa batas
+# ukuran atau cek tinta; baris yang tidak bisa dikonversi menggagalkan migrasi sebelum
+# kolom signature_base64 dihapus.
+STROKE_PREFIX = "strokes:v1:"
+PNG_MAGIC = b"\x89PNG\r\n\x1a\n"
+DATA_URL_PREFIX = "data:image/png;base64,"
+
+
+def _storage():
+    return FileSystemStorage(location=settings.MEDIA_ROOT, base_url=settings.MEDIA_URL)
+
+
+def _b64decode(value):
+    value = "".join(value.split())
+    return base64.b64decode(value + "=" * (-len(value) % 4), validate=True)
+
+
+def _legacy_signature(value):
+    """(bytes, ekstensi) dari nilai signature_base64 lama: goresan, data URL, atau base64 gambar."""
+    value = value.strip()
+    if value.startswith(STROKE_PREFIX):
+        return _b64decode(value[len(STROKE_PREFIX):]), "strokes"
+    if value.startswith("data:"):
+        value = value.split(",", 1)[-1]
+    data = _b64decode(value)
+    if data.startswith(PNG_MAGIC):
+        return data, "png"
+    # Format gambar lain (JPEG/WebP dari perangkat lama) diubah ke PNG tanpa diperkecil
+    buffer = BytesIO()
+    with Image.open(BytesIO(data)) as image:
+        image.save(buffer, format="PNG")
+    return buffer.getvalue(), "png"
+
+
+def _save(storage, data, ext):
+    digest = hashlib.sha256(data).hexdigest()
+    name = f"signatures/{digest[:2]}/{digest}.{ext}"
+    if not storage.exists(name):
+        storage.save(name, ContentFile(data))
+    return name
+
+
+def signatures_to_files(apps, schema_editor):
+    Attendance = apps.get_model("attendance", "Attendance")
+    storage = _storage()
+    batch = []
+    failed = []
+    for attendance in Attendance.objects.exclude(signature_base64="").only("id", "signature_base64").iterator(chunk_size=500):
+        if not attendance.signature_base64.strip():
+            continue
+        try:
+            data, ext = _legacy_signature(attendance.signature_base64)
+        except (binascii.Error, OSError, ValueError):
+            failed.append(attendance.pk)
+            continue
+        attendance.signature = _save(storage, data, ext)
+        batch.append(attendance)
+        if len(batch) >= 500:
+            Attendance.objects.bulk_update(batch, ["signature"])
+            batch = []
+    Attendance.objects.bulk_update(batch, ["signature"])
+    if failed:
+        # Transaksi migrasi dibatalkan: signature_base64 tetap utuh untuk diperbaiki manual
+        raise RuntimeError(
+            f"{len(failed)} TTD tidak bisa dikonversi ke file (id Attendance: {failed[:20]}). "
+            "Perbaiki atau kosongkan signature_base64 baris tersebut lalu jalankan migrate lagi."
+        )
+
+
+def files_to_signatures(apps, schema_editor):
+    Attendance = apps.get_model("attendance", "Attendance")
+    storage = _storage()
+    batch = []
+    for attendance in Attendance.objects.exclude(signature="").only("id", "signature").iterator(chunk_size=500):
+        name = attendance.signature.name
+        if not storage.exists(name):
+            raise RuntimeError(f"File TTD {name} (id Attendance {attendance.pk}) tidak ditemukan.")
+        with storage.open(name, "rb") as f:
+            encoded = base64.b64encode(f.read()).decode("ascii")
+        attendance.signature_base64 = (STROKE_PREFIX if name.endswith(".strokes") else DATA_URL_PREFIX) + encoded
+        batch.append(attendance)
+        if len(batch) >= 500:
+            Attendance.objects.bulk_update(batch, ["signature_base64"])
+            batch = []
+    Attendance.objects.bulk_update(batch, ["signature_base64"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('attendance', '0002_sheet_sync'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='attendance',
+            name='signature',
+            field=models.FileField(blank=True, storage=attendance.storage.get_signature_storage, upload_to=''),
+        ),
+        migrations.RunPython(signatures_to_files, files_to_signatures),
+        migrations.RemoveField(
+            model_name='attendance',
+            name='signature_base64',
+        ),
+    ]
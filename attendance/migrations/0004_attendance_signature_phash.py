@@ -0,0 +1,149 @@
+from io import BytesIO
+
+import numpy as np
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage
+from django.db import migrations, models
+from PIL import Image, ImageDraw
+
+# Salinan beku dHash 256-bit dari signature_utils.perceptual_hash (dan rasterisasi goresan
+# render_strokes pada 300x100 tanpa supersample), dihitung dari bytes file TTD yang tersimpan
+# seperti attendance.signatures.phash_for_data saat migrasi ini dibuat.
+INK_LUMA_THRESHOLD = 200
+CROP_PADDING = 6
+SIGNATURE_ASPECT = 3.0
+HASH_SIZE = 16
+STROKES_SIZE = (300, 100)
+
+
+def _read_varint(data, pos):
+    result = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return result, pos
+        shift += 7
+
+
+def _unzigzag(value):
+    return value >> 1 if not value & 1 else -((value + 1) >> 1)
+
+
+def _decode_strokes(data):
+    pos = 0
+    _, pos = _read_varint(data, pos)
+    _, pos = _read_varint(data, pos)
+    line_width, pos = _read_varint(data, pos)
+    count, pos = _read_varint(data, pos)
+    strokes = []
+    for _ in range(count):
+        n, pos = _read_varint(data, pos)
+        x, pos = _read_varint(data, pos)
+        y, pos = _read_varint(data, pos)
+        stroke = [(x, y)]
+        for _ in range(n - 1):
+            dx, pos = _read_varint(data, pos)
+            dy, pos = _read_varint(data, pos)
+            x += _unzigzag(dx)
+            y += _unzigzag(dy)
+            stroke.append((x, y))
+        strokes.append(stroke)
+    return line_width / 10, strokes
+
+
+def _render_strokes(data, size=STROKES_SIZE, padding_ratio=0.05):
+    line_width, strokes = _decode_strokes(data)
+    img = Image.new("L", size, 255)
+    if not strokes:
+        return img.resize(size)
+    xs = [x for stroke in strokes for x, _ in stroke]
+    ys = [y for stroke in strokes for _, y in stroke]
+    min_x, max_x = min(xs) - line_width, max(xs) + line_width
+    min_y, max_y = min(ys) - line_width, max(ys) + line_width
+    box_w, box_h = max(max_x - min_x, 1), max(max_y - min_y, 1)
+    scale = min(size[0] * (1 - 2 * padding_ratio) / box_w, size[1] * (1 - 2 * padding_ratio) / box_h)
+    offset_x = (size[0] - box_w * scale) / 2 - min_x * scale
+    offset_y = (size[1] - box_h * scale) / 2 - min_y * scale
+    pen = max(line_width * scale, 1)
+    radius = pen / 2
+    draw = ImageDraw.Draw(img)
+    for stroke in strokes:
+        points = [(x * scale + offset_x, y * scale + offset_y) for x, y in stroke]
+        if len(points) > 1:
+            draw.line(points, fill=0, width=int(round(pen)), joint="curve")
+        for x, y in (points[0], points[-1]):
+            draw.ellipse((x - radius, y - radius, x + radius, y + radius), fill=0)
+    return img.resize(size, Image.LANCZOS)
+
+
+def _crop_to_ink(gray):
+    mask = gray < INK_LUMA_THRESHOLD
+    rows = np.flatnonzero(mask.any(axis=1))
+    cols = np.flatnonzero(mask.any(axis=0))
+    if rows.size == 0:
+        return None
+    crop = gray[
+        max(rows[0] - CROP_PADDING, 0):rows[-1] + CROP_PADDING + 1,
+        max(cols[0] - CROP_PADDING, 0):cols[-1] + CROP_PADDING + 1,
+    ]
+    height, width = crop.shape
+    target_w = max(width, int(round(height * SIGNATURE_ASPECT)))
+    target_h = max(height, int(round(target_w / SIGNATURE_ASPECT)))
+    canvas = np.full((target_h, target_w), 255, dtype=np.uint8)
+    top = (target_h - height) // 2
+    left = (target_w - width) // 2
+    canvas[top:top + height, left:left + width] = crop
+    return canvas
+
+
+def _phash(data, ext):
+    if ext == "strokes":
+        gray = np.asarray(_render_strokes(data))
+    else:
+        gray = np.asarray(Image.open(BytesIO(data)).convert("L"))
+    cropped = _crop_to_ink(gray)
+    if cropped is None:
+        return "0" * 64
+    small = np.asarray(Image.fromarray(cropped).resize((HASH_SIZE + 1, HASH_SIZE), Image.BOX), dtype=np.int16)
+    bits = (small[:, 1:] < small[:, :-1]).flatten()
+    return f"{int.from_bytes(np.packbits(bits).tobytes(), 'big'):064x}"
+
+
+def backfill_phash(apps, schema_editor):
+    Attendance = apps.get_model("attendance", "Attendance")
+    storage = FileSystemStorage(location=settings.MEDIA_ROOT, base_url=settings.MEDIA_URL)
+    cache = {}
+    batch = []
+    for attendance in Attendance.objects.exclude(signature="").only("id", "signature").iterator(chunk_size=500):
+        name = attendance.signature.name
+        if name not in cache:
+            # Hash hanya data turunan: file yang hilang/rusak cukup dibiarkan kosong
+            try:
+                with storage.open(name, "rb") as f:
+                    cache[name] = _phash(f.read(), name.rsplit(".", 1)[-1])
+            except (IndexError, OSError, ValueError):
+                cache[name] = ""
+        attendance.signature_phash = cache[name]
+        batch.append(attendance)
+        if len(batch) >= 500:
+            Attendance.objects.bulk_update(batch, ["signature_phash"])
+            batch = []
+    Attendance.objects.bulk_update(batch, ["signature_phash"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('attendance', '0003_signature_files'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='attendance',
+            name='signature_phash',
+            field=models.CharField(blank=True, max_length=64),
+        ),
+        migrations.RunPython(backfill_phash, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,37 @@
+from django.db import migrations, models
+from django.db.models import Count, Max
+
+
+def backfill_counts(apps, schema_editor):
+    Meeting = apps.get_model("attendance", "Meeting")
+    batch = []
+    meetings = Meeting.objects.annotate(count=Count("attendances"), latest=Max("attendances__timestamp"))
+    for meeting in meetings.iterator(chunk_size=500):
+        meeting.attendance_count = meeting.count
+        meeting.last_attendance_at = meeting.latest
+        batch.append(meeting)
+        if len(batch) >= 500:
+            Meeting.objects.bulk_update(batch, ["attendance_count", "last_attendance_at"])
+            batch = []
+    Meeting.objects.bulk_update(batch, ["attendance_count", "last_attendance_at"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('attendance', '0004_attendance_signature_phash'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='meeting',
+            name='attendance_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='meeting',
+            name='last_attendance_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(backfill_counts, migrations.RunPython.noop),
+    ]
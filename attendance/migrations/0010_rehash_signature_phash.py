@@ -0,0 +1,18 @@
+import importlib
+
+from django.db import migrations
+
+# Sebelumnya hash saat submit dihitung dari gambar 8-bit sebelum kuantisasi PNG 4 tingkat,
+# sedangkan backfill 0004 dari file tersimpan; semua baris dihitung ulang dari file agar seragam.
+backfill_phash = importlib.import_module("attendance.migrations.0004_attendance_signature_phash").backfill_phash
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("attendance", "0009_attendance_idempotency_key"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_phash, migrations.RunPython.noop),
+    ]
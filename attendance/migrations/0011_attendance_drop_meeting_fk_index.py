@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-19 18:52
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('attendance', '0010_rehash_signature_phash'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='attendance',
+            name='meeting',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='attendances', to='attendance.meeting'),
+        ),
+    ]
@@ -1,8 +1,12 @@
 import uuid
 
 from django.db import models
+from django.urls import reverse
 from django.utils import timezone
 
+from .participants import ParticipantQuerySet, name_key
+from .storage import get_signature_storage, load_signature
+
 
 class Meeting(models.Model):
     STATUS_ACTIVE = "aktif"
@@ -22,28 +26,126 @@ class Meeting(models.Model):
     location = models.CharField(max_length=255)
     leader = models.CharField(max_length=255)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_ACTIVE)
+    # Dihitung ulang setiap absensi masuk/dihapus (signals.py); cek dengan reconcile_attendance_counts
+    attendance_count = models.PositiveIntegerField(default=0, editable=False)
+    last_attendance_at = models.DateTimeField(null=True, blank=True, editable=False)
     created_at = models.DateTimeField(default=timezone.now)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            # Daftar rapat: keyset (created_at, meeting_id) dan filter status/tanggal
+            models.Index(fields=["created_at", "meeting_id"], name="meeting_created_idx"),
+            models.Index(fields=["status", "meeting_date"], name="meeting_status_date_idx"),
+        ]
 
     def __str__(self):
         return f"{self.title} ({self.meeting_id})"
 
 
 class Attendance(models.Model):
-    meeting = models.ForeignKey(Meeting, on_delete=models.CASCADE, related_name="attendances")
+    # Tanpa indeks FK sendiri: attendance_meeting_time_idx (meeting, timestamp) sudah diawali meeting_id
+    meeting = models.ForeignKey(Meeting, on_delete=models.CASCADE, related_name="attendances", db_index=False)
     name = models.CharField(max_length=255)
     nip = models.CharField(max_length=50)
     timestamp = models.DateTimeField(default=timezone.now)
-    signature_base64 = models.TextField(blank=True)
+    # Hanya nama file beralamat isi (lihat storage.py); bytes TTD tidak ikut terbaca di query
+    signature = models.FileField(storage=get_signature_storage, max_length=100, blank=True)
+    # dHash 256-bit (hex) untuk mendeteksi TTD mirip, lihat duplicates.py
+    signature_phash = models.CharField(max_length=64, blank=True)
+    # Kunci dari klien API (submissions.py); kiriman ulang dengan kunci sama dijawab hasil yang lama
+    idempotency_key = models.CharField(max_length=64, null=True, blank=True, unique=True, editable=False)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ["-timestamp"]
         constraints = [
             models.UniqueConstraint(fields=["meeting", "nip"], name="unique_attendance_per_meeting_nip"),
         ]
+        indexes = [
+            # Daftar hadir per rapat urut waktu (detail, PDF) dan riwayat satu NIP lintas rapat
+            models.Index(fields=["meeting", "timestamp"], name="attendance_meeting_time_idx"),
+            models.Index(fields=["nip", "timestamp"], name="attendance_nip_time_idx"),
+        ]
 
     def __str__(self):
         return f"{self.name} - {self.meeting_id}"
+
+    @property
+    def signature_url(self):
+        if not self.signature:
+            return ""
+        digest, ext = self.signature.name.rsplit("/", 1)[-1].split(".", 1)
+        return reverse("signature_file", args=[digest, ext])
+
+    def signature_data(self):
+        return load_signature(self.signature.name)
+
+
+class Participant(models.Model):
+    """Daftar induk peserta (guru/staf) untuk autocomplete NIP/nama di form absensi."""
+
+    nip = models.CharField(max_length=50, unique=True)
+    name = models.CharField(max_length=255)
+    # Nama huruf kecil tanpa gelar/tanda baca untuk pencarian awalan (lihat participants.py)
+    name_key = models.CharField(max_length=255, db_index=True, editable=False)
+    position = models.CharField(max_length=255, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = ParticipantQuerySet.as_manager()
+
+    class Meta:
+        ordering = ["name"]
+
+    def __str__(self):
+        return f"{self.name} ({self.nip})"
+
+    def save(self, *args, **kwargs):
+        self.name_key = name_key(self.name)
+        super().save(*args, **kwargs)
+
+
+class RosterEntry(models.Model):
+    """Peserta yang diharapkan hadir; diimpor dari CSV/XLSX sebelum rapat (lihat roster.py)."""
+
+    meeting = models.ForeignKey(Meeting, on_delete=models.CASCADE, related_name="roster")
+    nip = models.CharField(max_length=50)
+    name = models.CharField(max_length=255)
+    position = models.CharField(max_length=255, blank=True)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ["name"]
+        constraints = [
+            models.UniqueConstraint(fields=["meeting", "nip"], name="unique_roster_per_meeting_nip"),
+        ]
+
+    def __str__(self):
+        return f"{self.name} ({self.nip})"
+
+
+class SheetSyncState(models.Model):
+    spreadsheet_id = models.CharField(max_length=255, unique=True)
+    pushed_at = models.DateTimeField(null=True, blank=True)
+    sheet_revision = models.CharField(max_length=64, blank=True)
+    synced_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.spreadsheet_id} ({self.synced_at})"
+
+
+class SheetRow(models.Model):
+    state = models.ForeignKey(SheetSyncState, on_delete=models.CASCADE, related_name="rows")
+    worksheet = models.CharField(max_length=100)
+    key = models.CharField(max_length=255)
+    row_number = models.PositiveIntegerField()
+    row_hash = models.CharField(max_length=40)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["state", "worksheet", "key"], name="unique_sheet_row_per_state"),
+        ]
+
+    def __str__(self):
+        return f"{self.worksheet}!{self.row_number} ({self.key})"
@@ -0,0 +1,44 @@
+import re
+import unicodedata
+
+from django.db import models
+
+AUTOCOMPLETE_LIMIT = 10
+MIN_NIP_PREFIX = 3
+MIN_NAME_PREFIX = 2
+LEADING_TITLES = {"dr", "drs", "dra", "h", "hj", "ir", "prof"}
+
+
+def name_key(name):
+    """Nama untuk pencarian: huruf kecil ASCII tanpa gelar, mis. "Dra. Siti A., M.Pd" -> "siti a"."""
+    text = unicodedata.normalize("NFKD", name).encode("ascii", "ignore").decode("ascii").lower()
+    # Gelar akademik ditulis setelah koma
+    words = re.sub(r"[^a-z0-9]+", " ", text.split(",", 1)[0]).split()
+    while len(words) > 1 and words[0] in LEADING_TITLES:
+        words.pop(0)
+    return " ".join(words)
+
+
+def prefix_range(prefix):
+    """Batas [awal, akhir) untuk pencarian awalan sebagai range B-tree biasa di database mana pun."""
+    return prefix, prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+class ParticipantQuerySet(models.QuerySet):
+    def with_prefix(self, field, prefix):
+        low, high = prefix_range(prefix)
+        # Range memakai indeks; startswith menjaga hasil tetap benar pada collation non-biner
+        return self.filter(**{f"{field}__gte": low, f"{field}__lt": high, f"{field}__startswith": prefix})
+
+    def search(self, query, limit=AUTOCOMPLETE_LIMIT):
+        """Cari berdasarkan awalan NIP (bila angka) atau awalan nama; daftar kosong bila terlalu pendek."""
+        query = (query or "").strip()
+        digits = re.sub(r"[\s.]", "", query)
+        if digits.isdigit():
+            if len(digits) < MIN_NIP_PREFIX:
+                return self.none()
+            return self.with_prefix("nip", digits).order_by("nip")[:limit]
+        key = name_key(query)
+        if len(key) < MIN_NAME_PREFIX:
+            return self.none()
+        return self.with_prefix("name_key", key).order_by("name_key")[:limit]
@@ -0,0 +1,169 @@
+import codecs
+import csv
+import re
+from dataclasses import dataclass, field
+from itertools import chain
+from zipfile import BadZipFile
+
+from django.db import transaction
+from openpyxl import load_workbook
+from openpyxl.utils.exceptions import InvalidFileException
+
+from .models import RosterEntry
+
+ROSTER_CHUNK_SIZE = 1000
+ROSTER_EXTENSIONS = (".csv", ".xlsx")
+CSV_FALLBACK_ENCODING = "cp1252"
+NIP_PATTERN = re.compile(r"^\d{1,50}$")
+COLUMN_ALIASES = {
+    "nip": ("nip", "nip/nik", "nik"),
+    "name": ("nama", "nama lengkap", "name"),
+    "position": ("jabatan", "position", "instansi"),
+}
+
+
+class RosterError(ValueError):
+    pass
+
+
+@dataclass
+class RosterReport:
+    created: int = 0
+    existing: int = 0
+    duplicates: int = 0
+    invalid: list = field(default_factory=list)
+
+    def __str__(self):
+        return (
+            f"{self.created} peserta ditambahkan, {self.existing} sudah terdaftar, "
+            f"{self.duplicates} NIP ganda di file, {len(self.invalid)} baris tidak valid"
+        )
+
+
+def _columns(header):
+    labels = [str(value or "").strip().lower() for value in header]
+    columns = {}
+    for key, aliases in COLUMN_ALIASES.items():
+        for index, label in enumerate(labels):
+            if label in aliases:
+                columns[key] = index
+                break
+    if "nip" not in columns or "name" not in columns:
+        raise RosterError("Baris pertama file harus berisi kolom NIP dan Nama.")
+    return columns
+
+
+def _decoded_lines(file):
+    # UTF-8 lebih dulu; baris yang bukan UTF-8 valid (CSV biasa dari Excel Windows) dibaca sebagai cp1252
+    for number, line in enumerate(file, start=1):
+        if number == 1 and line.startswith(codecs.BOM_UTF8):
+            line = line[len(codecs.BOM_UTF8):]
+        try:
+            yield line.decode("utf-8")
+        except UnicodeDecodeError:
+            try:
+                yield line.decode(CSV_FALLBACK_ENCODING)
+            except UnicodeDecodeError as exc:
+                raise RosterError(f'Baris {number} tidak bisa dibaca; simpan ulang file sebagai "CSV UTF-8".') from exc
+
+
+def _csv_rows(file):
+    lines = _decoded_lines(file)
+    first = next(lines, "")
+    # Excel berbahasa Indonesia menyimpan CSV dengan pemisah titik koma
+    delimiter = ";" if first.count(";") > first.count(",") else ","
+    reader = csv.reader(chain([first], lines), delimiter=delimiter)
+    try:
+        yield from reader
+    except csv.Error as exc:
+        raise RosterError(f"File CSV rusak di baris {reader.line_num}: {exc}") from exc
+
+
+def _xlsx_rows(file):
+    try:
+        workbook = load_workbook(file, read_only=True, data_only=True)
+    except (BadZipFile, InvalidFileException, KeyError, OSError) as exc:
+        raise RosterError("File Excel tidak bisa dibaca.") from exc
+    try:
+        yield from workbook.active.iter_rows(values_only=True)
+    finally:
+        workbook.close()
+
+
+def read_roster(file, filename):
+    """Baca file roster baris demi baris; hasilkan (nomor_baris, nip, nama, jabatan) dengan nilai mentah."""
+    name = filename.lower()
+    if name.endswith(".csv"):
+        rows = _csv_rows(file)
+    elif name.endswith(".xlsx"):
+        rows = _xlsx_rows(file)
+    else:
+        raise RosterError("Format file harus CSV atau XLSX.")
+
+    header = next(rows, None)
+    if header is None:
+        raise RosterError("File roster kosong.")
+    columns = _columns(header)
+    for number, row in enumerate(rows, start=2):
+        values = {key: row[index] if index < len(row) else None for key, index in columns.items()}
+        if not any(value not in (None, "") for value in values.values()):
+            continue
+        yield number, values["nip"], values["name"], values.get("position")
+
+
+def clean_nip(value):
+    """NIP sebagai teks angka; None bila tidak valid."""
+    if isinstance(value, float):
+        # NIP 18 digit yang tersimpan sebagai angka di Excel sudah kehilangan digit terakhirnya
+        return None
+    nip = re.sub(r"[\s.'-]", "", str(value if value is not None else ""))
+    return nip if NIP_PATTERN.match(nip) else None
+
+
+def _text(value, max_length=255):
+    return str(value if value is not None else "").strip()[:max_length]
+
+
+def import_roster(meeting, rows, chunk_size=ROSTER_CHUNK_SIZE):
+    """Simpan roster ``rows`` (dari read_roster) untuk ``meeting`` dengan bulk_create per potongan.
+
+    NIP yang sudah ada di roster rapat dicek sekali per potongan, bukan per baris;
+    NIP ganda di dalam file hanya disimpan sekali.
+    """
+    report = RosterReport()
+    seen = set()
+    chunk = []
+
+    def flush():
+        existing = set(
+            RosterEntry.objects.filter(meeting=meeting, nip__in=[entry.nip for entry in chunk]).values_list("nip", flat=True)
+        )
+        new = [entry for entry in chunk if entry.nip not in existing]
+        RosterEntry.objects.bulk_create(new, batch_size=chunk_size)
+        report.created += len(new)
+        report.existing += len(existing)
+        chunk.clear()
+
+    with transaction.atomic():
+        for number, raw_nip, raw_name, raw_position in rows:
+            nip = clean_nip(raw_nip)
+            name = _text(raw_name)
+            if isinstance(raw_nip, float):
+                report.invalid.append((number, "NIP tersimpan sebagai angka di Excel; format kolom NIP sebagai Teks"))
+                continue
+            if nip is None:
+                report.invalid.append((number, f"NIP tidak valid: {raw_nip!r}"))
+                continue
+            if not name:
+                report.invalid.append((number, f"Nama kosong untuk NIP {nip}"))
+                continue
+            if nip in seen:
+                report.duplicates += 1
+                continue
+            seen.add(nip)
+            chunk.append(RosterEntry(meeting=meeting, nip=nip, name=name, position=_text(raw_position)))
+            if len(chunk) >= chunk_size:
+                flush()
+        if chunk:
+            flush()
+    return report
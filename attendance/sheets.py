@@ -0,0 +1,221 @@
+import time
+from collections import Counter, deque
+
+from django.conf import settings
+from gspread.exceptions import WorksheetNotFound
+
+RAPAT_SHEET = "Data_Rapat"
+ABSENSI_SHEET = "Data_Absensi"
+
+RAPAT_HEADERS = ["Meeting ID", "Judul", "Tanggal", "Waktu", "Lokasi", "Pimpinan", "Timestamp Dibuat", "Status"]
+ABSENSI_HEADERS = ["Meeting ID", "Nama", "NIP", "Timestamp", "Signature"]
+
+
+class FakeAPIError(Exception):
+    """Meniru ``gspread.exceptions.APIError`` 429 saat kuota request habis."""
+
+    code = 429
+
+
+def column_letter(index):
+    letters = ""
+    while index > 0:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
+
+def parse_a1(label):
+    letters = "".join(ch for ch in label if ch.isalpha()).upper()
+    digits = "".join(ch for ch in label if ch.isdigit())
+    column = 0
+    for ch in letters:
+        column = column * 26 + ord(ch) - 64
+    return int(digits or 1), column or 1
+
+
+class FakeWorksheet:
+    """Worksheet in-memory dengan subset API gspread yang dipakai aplikasi."""
+
+    def __init__(self, spreadsheet, title):
+        self.spreadsheet = spreadsheet
+        self.title = title
+        self._rows = []
+
+    def _touch(self):
+        self.spreadsheet.revision += 1
+
+    @property
+    def row_count(self):
+        return len(self._rows)
+
+    @property
+    def col_count(self):
+        return max((len(row) for row in self._rows), default=0)
+
+    def get_all_values(self):
+        self.spreadsheet.api_call("get_all_values")
+        return [list(row) for row in self._rows]
+
+    def row_values(self, row):
+        self.spreadsheet.api_call("row_values")
+        if row > len(self._rows):
+            return []
+        return list(self._rows[row - 1])
+
+    def _write(self, row, column, values):
+        for offset, values_row in enumerate(values):
+            target = row + offset
+            while len(self._rows) < target:
+                self._rows.append([])
+            current = self._rows[target - 1]
+            end = column - 1 + len(values_row)
+            if len(current) < end:
+                current.extend([""] * (end - len(current)))
+            current[column - 1:end] = [str(value) for value in values_row]
+
+    def update(self, range_name, values=None, **kwargs):
+        self.spreadsheet.api_call("update")
+        # gspread >= 6 memakai urutan (values, range_name); terima keduanya
+        if isinstance(range_name, list):
+            range_name, values = values, range_name
+        row, column = parse_a1(str(range_name).split(":")[0])
+        self._write(row, column, values)
+        self._touch()
+
+    def update_cell(self, row, col, value):
+        self.spreadsheet.api_call("update_cell")
+        self._write(row, col, [[value]])
+        self._touch()
+
+    def batch_update(self, data, **kwargs):
+        self.spreadsheet.api_call("batch_update")
+        for item in data:
+            row, column = parse_a1(item["range"].split(":")[0])
+            self._write(row, column, item["values"])
+        self._touch()
+
+    def append_row(self, values, **kwargs):
+        self.append_rows([values])
+
+    def append_rows(self, values, **kwargs):
+        self.spreadsheet.api_call("append_rows")
+        first_row = len(self._rows) + 1
+        self._rows.extend([str(value) for value in row] for row in values)
+        self._touch()
+        width = max((len(row) for row in values), default=1)
+        updated_range = f"{self.title}!A{first_row}:{column_letter(width)}{len(self._rows)}"
+        return {"updates": {"updatedRange": updated_range, "updatedRows": len(values)}}
+
+    def clear(self):
+        self.spreadsheet.api_call("clear")
+        self._rows = []
+        self._touch()
+
+    def batch_clear(self, ranges):
+        self.spreadsheet.api_call("batch_clear")
+        for label in ranges:
+            start, _, end = label.partition(":")
+            first_row, first_column = parse_a1(start)
+            last_row, last_column = parse_a1(end or start)
+            for row in self._rows[first_row - 1:last_row]:
+                row[first_column - 1:last_column] = [""] * len(row[first_column - 1:last_column])
+        # Seperti Sheets: baris dan kolom yang kosong di ujung tidak ikut dikembalikan get_all_values
+        while self._rows and not any(self._rows[-1]):
+            self._rows.pop()
+        width = max((index + 1 for row in self._rows for index, value in enumerate(row) if value), default=0)
+        self._rows = [row[:width] for row in self._rows]
+        self._touch()
+
+    def delete_rows(self, start_index, end_index=None):
+        self.spreadsheet.api_call("delete_rows")
+        end_index = end_index or start_index
+        del self._rows[start_index - 1:end_index]
+        self._touch()
+
+
+class FakeSpreadsheet:
+    """Spreadsheet in-memory untuk test dan pengembangan lokal tanpa Google API."""
+
+    def __init__(self, latency=0.0, quota_per_minute=None):
+        self.revision = 0
+        self.latency = latency
+        self.quota_per_minute = quota_per_minute
+        self.calls = Counter()
+        self._recent_calls = deque()
+        self._worksheets = {}
+
+    @property
+    def api_calls(self):
+        return sum(self.calls.values())
+
+    def api_call(self, name):
+        self.calls[name] += 1
+        if self.quota_per_minute is not None:
+            now = time.monotonic()
+            while self._recent_calls and now - self._recent_calls[0] >= 60:
+                self._recent_calls.popleft()
+            if len(self._recent_calls) >= self.quota_per_minute:
+                raise FakeAPIError("APIError: [429]: Quota exceeded for quota metric 'Read requests'")
+            self._recent_calls.append(now)
+        if self.latency:
+            time.sleep(self.latency)
+
+    def seed(self, title, values):
+        """Isi worksheet langsung tanpa dihitung sebagai request API."""
+        worksheet = self._worksheets.get(title) or FakeWorksheet(self, title)
+        worksheet._rows = [[str(value) for value in row] for row in values]
+        self._worksheets[title] = worksheet
+        return worksheet
+
+    def get_lastUpdateTime(self):
+        self.api_call("get_lastUpdateTime")
+        return str(self.revision)
+
+    def worksheet(self, title):
+        self.api_call("worksheet")
+        try:
+            return self._worksheets[title]
+        except KeyError:
+            raise WorksheetNotFound(title) from None
+
+    def worksheets(self):
+        return list(self._worksheets.values())
+
+    def add_worksheet(self, title, rows=1000, cols=20, **kwargs):
+        self.api_call("add_worksheet")
+        worksheet = FakeWorksheet(self, title)
+        self._worksheets[title] = worksheet
+        self.revision += 1
+        return worksheet
+
+
+def open_spreadsheet():
+    import gspread
+
+    client = gspread.service_account_from_dict(
+        {
+            "type": "service_account",
+            "client_email": settings.GOOGLE_SERVICE_ACCOUNT_EMAIL,
+            "private_key": settings.GOOGLE_SERVICE_ACCOUNT_PRIVATE_KEY,
+            "token_uri": "https://oauth2.googleapis.com/token",
+        }
+    )
+    return client.open_by_key(settings.GOOGLE_SHEET_ID)
+
+
+def get_or_create_worksheet(spreadsheet, title, headers):
+    # Hanya "worksheet belum ada" yang dibuat; kuota/otorisasi/jaringan tetap dilempar
+    try:
+        worksheet = spreadsheet.worksheet(title)
+    except WorksheetNotFound:
+        worksheet = spreadsheet.add_worksheet(title=title, rows=1000, cols=len(headers))
+        worksheet.update([headers], "A1")
+    return worksheet
+
+
+def sheet_revision(spreadsheet):
+    try:
+        return str(spreadsheet.get_lastUpdateTime() or "")
+    except Exception:
+        return ""
@@ -0,0 +1,52 @@
+from django.db import transaction
+from django.db.models import F, Max, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, Greatest
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from . import live
+from .models import Attendance, Meeting
+
+
+def latest_attendance(meeting_ref=OuterRef("pk")):
+    return Subquery(
+        Attendance.objects.filter(meeting_id=meeting_ref)
+        .order_by()
+        .values("meeting_id")
+        .annotate(latest=Max("timestamp"))
+        .values("latest")
+    )
+
+
+# Penghitung di Meeting diperbarui dengan UPDATE ... SET x = x + 1, jadi absen yang masuk
+# bersamaan tidak saling menimpa; pemanggil membungkus insert/delete dalam transaction.atomic
+# agar penghitung ikut batal bila absensi batal disimpan
+
+
+def attendances_added(meeting_id, count, latest):
+    """Perbarui penghitung rapat untuk ``count`` absensi baru; juga dipakai insert massal tanpa signal."""
+    latest = Value(latest)
+    changes = {"last_attendance_at": Greatest(Coalesce("last_attendance_at", latest), latest)}
+    if count:
+        changes["attendance_count"] = F("attendance_count") + count
+    Meeting.objects.filter(pk=meeting_id).update(**changes)
+    if count:
+        transaction.on_commit(lambda: live.notify(meeting_id))
+
+
+@receiver(post_save, sender=Attendance)
+def attendance_saved(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    attendances_added(instance.meeting_id, 1 if created else 0, instance.timestamp)
+
+
+@receiver(post_delete, sender=Attendance)
+def attendance_deleted(sender, instance, origin=None, **kwargs):
+    # Rapatnya sendiri ikut dihapus, tidak ada yang perlu diperbarui
+    if isinstance(origin, Meeting):
+        return
+    Meeting.objects.filter(pk=instance.meeting_id).update(
+        attendance_count=Greatest(F("attendance_count") - 1, Value(0)),
+        last_attendance_at=latest_attendance(),
+    )
@@ -0,0 +1,80 @@
+import base64
+import os
+import tempfile
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+
+from signature_utils import STROKE_PREFIX
+
+from .signatures import normalize_signature
+
+SIGNATURE_PREFIX = "data:image/png;base64,"
+SIGNATURE_DIR = "signatures"
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """Nama file ditentukan oleh hash isinya; isi yang sama hanya disimpan sekali."""
+
+    def get_available_name(self, name, max_length=None):
+        return name
+
+    def _save(self, name, content):
+        if self.exists(name):
+            return name
+        # Bukan O_EXCL seperti FileSystemStorage: penyimpan yang bersamaan menulis isi yang
+        # sama, jadi file sementara cukup di-os.replace (yang terakhir menang) dan file
+        # tidak pernah terlihat setengah jadi
+        full_path = self.path(name)
+        directory = os.path.dirname(full_path)
+        os.makedirs(directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                for chunk in content.chunks():
+                    f.write(chunk)
+            os.chmod(temp_path, self.file_permissions_mode or 0o644)
+            os.replace(temp_path, full_path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+        return name
+
+
+def get_signature_storage():
+    return ContentAddressedStorage(location=settings.MEDIA_ROOT, base_url=settings.MEDIA_URL)
+
+
+def signature_name(digest, ext):
+    return f"{SIGNATURE_DIR}/{digest[:2]}/{digest}.{ext}"
+
+
+def encode_signature(data, ext):
+    """Bytes file TTD sebagai data URL PNG atau teks goresan."""
+    if ext == "strokes":
+        return STROKE_PREFIX + base64.b64encode(data).decode("ascii")
+    return SIGNATURE_PREFIX + base64.b64encode(data).decode("ascii")
+
+
+def save_signature(signature, storage=None):
+    """Simpan ``Signature`` hasil normalize_signature dan kembalikan nama filenya ('' bila None)."""
+    if signature is None:
+        return ""
+    name = signature_name(signature.digest, signature.ext)
+    return (storage or get_signature_storage()).save(name, ContentFile(signature.data))
+
+
+def store_signature(value, storage=None):
+    """Validasi, normalisasi, dan simpan TTD mentah; SignatureError bila tidak valid."""
+    return save_signature(normalize_signature(value), storage)
+
+
+def load_signature(name, storage=None):
+    """Baca file TTD kembali sebagai data URL PNG atau teks goresan ('' bila tidak ada)."""
+    storage = storage or get_signature_storage()
+    if not name or not storage.exists(name):
+        return ""
+    with storage.open(name, "rb") as f:
+        data = f.read()
+    return encode_signature(data, name.rsplit(".", 1)[-1])
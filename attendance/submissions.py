@@ -0,0 +1,275 @@
+import re
+import uuid
+from collections import defaultdict
+from dataclasses import dataclass
+
+from django.db import transaction
+from django.utils import timezone
+
+from .forms import AttendanceForm
+from .models import Attendance, Meeting, Participant, RosterEntry
+from .signals import attendances_added
+from .storage import get_signature_storage, save_signature
+
+IDEMPOTENCY_KEY_PATTERN = re.compile(r"^[A-Za-z0-9_-]{8,64}$")
+PAYLOAD_FIELDS = ("id", "meeting_id", "name", "nip", "timestamp", "idempotency_key")
+MAX_BATCH_SIZE = 50
+
+CREATED = "created"
+REPLAYED = "replayed"
+DUPLICATE = "duplicate"
+INVALID = "invalid"
+CONFLICT = "conflict"
+KEY_CONFLICT_ERRORS = {"idempotency_key": ["Kunci idempoten sudah dipakai untuk rapat lain."]}
+
+
+@dataclass
+class Submission:
+    """Satu absensi dari API yang sudah divalidasi dan siap disimpan."""
+
+    key: str
+    meeting_id: object
+    name: str
+    nip: str
+    signature: object
+
+
+def registered_name(meeting, nip):
+    # Peserta yang sudah ada di roster/daftar induk cukup isi NIP; nama resmi yang disimpan
+    return (
+        RosterEntry.objects.filter(meeting=meeting, nip=nip).values_list("name", flat=True).first()
+        or Participant.objects.filter(nip=nip).values_list("name", flat=True).first()
+    )
+
+
+def registered_names(pairs):
+    """registered_name untuk banyak pasangan (meeting_id, nip) sekaligus dengan dua query."""
+    if not pairs:
+        return {}
+    nips = {nip for _, nip in pairs}
+    roster = {
+        (meeting_id, nip): name
+        for meeting_id, nip, name in RosterEntry.objects.filter(
+            meeting_id__in={meeting_id for meeting_id, _ in pairs}, nip__in=nips
+        ).values_list("meeting_id", "nip", "name")
+    }
+    participants = dict(Participant.objects.filter(nip__in=nips).values_list("nip", "name"))
+    return {(meeting_id, nip): roster.get((meeting_id, nip)) or participants.get(nip) for meeting_id, nip in pairs}
+
+
+def check_attendance(form, name, signature):
+    if not name:
+        form.add_error("name", "Nama wajib diisi bila NIP belum terdaftar di roster.")
+    elif signature is None:
+        form.add_error(None, "Tanda tangan wajib diisi.")
+    return not form.errors
+
+
+def attendance_payload(row):
+    return {
+        "id": row["id"],
+        "meeting_id": str(row["meeting_id"]),
+        "name": row["name"],
+        "nip": row["nip"],
+        "timestamp": row["timestamp"].isoformat(),
+    }
+
+
+def find_replays(keys):
+    """Hasil tersimpan untuk kunci yang sudah pernah diproses: {kunci: payload}. Hanya baca.
+
+    Kunci unik di semua rapat, jadi pemanggil wajib mencocokkan rapatnya lewat replay_status.
+    """
+    rows = Attendance.objects.filter(idempotency_key__in=keys).values(*PAYLOAD_FIELDS)
+    return {row["idempotency_key"]: attendance_payload(row) for row in rows}
+
+
+def replay_status(payload, meeting_id):
+    # Kunci yang sudah dipakai di rapat lain ditolak, bukan dijawab dengan absensi rapat tersebut
+    return REPLAYED if payload["meeting_id"] == str(meeting_id) else CONFLICT
+
+
+def form_errors(form):
+    # Nama field API: "signature" alih-alih "signature_base64"
+    return {
+        "signature" if field == "signature_base64" else field: list(messages) for field, messages in form.errors.items()
+    }
+
+
+def validate_submission(key, data):
+    """Validasi kunci dan form satu kiriman JSON tanpa query database (hanya decode TTD).
+
+    Kembalikan (form, None) atau (None, errors).
+    """
+    if not isinstance(key, str) or not IDEMPOTENCY_KEY_PATTERN.match(key):
+        return None, {"idempotency_key": ["Kunci idempoten wajib diisi (8-64 karakter huruf/angka/-/_)."]}
+    form = AttendanceForm(
+        {
+            "name": str(data.get("name") or ""),
+            "nip": str(data.get("nip") or ""),
+            "signature_base64": str(data.get("signature") or ""),
+        }
+    )
+    if not form.is_valid():
+        return None, form_errors(form)
+    return form, None
+
+
+def submitted_nip(form):
+    return form.cleaned_data["nip"].strip()
+
+
+def build_submission(meeting, key, form, registered):
+    """Submission dari form yang sudah valid; ``registered`` = nama di roster/daftar induk (atau None)."""
+    name = registered or form.cleaned_data["name"].strip()
+    signature = form.cleaned_data["signature_base64"]
+    if not check_attendance(form, name, signature):
+        return None, form_errors(form)
+    submission = Submission(key=key, meeting_id=meeting.meeting_id, name=name, nip=submitted_nip(form), signature=signature)
+    return submission, None
+
+
+def prepare_submission(meeting, key, data):
+    """Validasi satu kiriman JSON (nip, name, signature); kembalikan (Submission, None) atau (None, errors)."""
+    form, errors = validate_submission(key, data)
+    if errors:
+        return None, errors
+    return build_submission(meeting, key, form, registered_name(meeting, submitted_nip(form)))
+
+
+def insert_submissions(submissions, batch_size=500):
+    """Simpan absensi dengan insert-or-ignore; kembalikan {kunci: (status, payload)}.
+
+    Duplikat (NIP yang sudah absen atau kunci yang sudah dipakai) diabaikan oleh
+    database (ON CONFLICT DO NOTHING / INSERT OR IGNORE) alih-alih memicu
+    IntegrityError dan transaksi gagal; hasilnya dibaca ulang sekali berdasarkan kunci.
+    """
+    if not submissions:
+        return {}
+    now = timezone.now()
+    objects = [
+        Attendance(
+            meeting_id=item.meeting_id,
+            name=item.name,
+            nip=item.nip,
+            timestamp=now,
+            signature=save_signature(item.signature),
+            signature_phash=item.signature.phash,
+            idempotency_key=item.key,
+        )
+        for item in submissions
+    ]
+    keys = [item.key for item in submissions]
+    with transaction.atomic():
+        Attendance.objects.bulk_create(objects, batch_size=batch_size, ignore_conflicts=True)
+        rows = {
+            row["idempotency_key"]: row
+            for row in Attendance.objects.filter(idempotency_key__in=keys).values(*PAYLOAD_FIELDS)
+        }
+        added = defaultdict(int)
+        results = {}
+        for item in submissions:
+            row = rows.get(item.key)
+            if row is None:
+                results[item.key] = (DUPLICATE, None)
+            elif row["meeting_id"] != item.meeting_id:
+                results[item.key] = (CONFLICT, None)
+            elif row["timestamp"] == now and row["nip"] == item.nip:
+                added[item.meeting_id] += 1
+                results[item.key] = (CREATED, attendance_payload(row))
+            else:
+                # Kunci yang sama baru saja disimpan oleh request lain
+                results[item.key] = (REPLAYED, attendance_payload(row))
+        # bulk_create tidak memicu post_save, jadi penghitung rapat diperbarui di sini
+        for meeting_id, count in added.items():
+            attendances_added(meeting_id, count, now)
+        ignored = [obj.signature.name for obj in objects if results[obj.idempotency_key][0] != CREATED]
+        if ignored:
+            transaction.on_commit(lambda: discard_unused_signatures(ignored))
+    return results
+
+
+def discard_unused_signatures(names):
+    # File TTD sudah ditulis sebelum insert; milik kiriman yang diabaikan dihapus bila tidak dipakai baris lain
+    used = set(Attendance.objects.filter(signature__in=names).values_list("signature", flat=True))
+    storage = get_signature_storage()
+    for name in set(names) - used:
+        storage.delete(name)
+
+
+def parse_meeting_id(value):
+    try:
+        return uuid.UUID(str(value))
+    except ValueError:
+        return None
+
+
+def batch_result(key, status, payload=None, errors=None):
+    result = {"idempotency_key": key, "status": status}
+    if payload is not None:
+        result["attendance"] = payload
+    if status == DUPLICATE:
+        result["errors"] = {"nip": ["NIP ini sudah absen untuk rapat ini."]}
+    elif status == CONFLICT:
+        result["errors"] = KEY_CONFLICT_ERRORS
+    elif errors:
+        result["errors"] = errors
+    return result
+
+
+def process_batch(items):
+    """Proses antrean absensi offline: daftar {idempotency_key, meeting_id, nip, name, signature}.
+
+    Setiap item dijawab dengan statusnya sendiri, urut sesuai kiriman; kunci yang
+    sudah pernah diproses langsung dijawab dari baris tersimpan dan sisanya
+    disimpan dalam satu insert-or-ignore.
+    """
+    keys = [item.get("idempotency_key") if isinstance(item, dict) else None for item in items]
+    replays = find_replays([key for key in keys if isinstance(key, str)])
+    meetings = Meeting.objects.only("meeting_id").in_bulk(
+        {parse_meeting_id(item.get("meeting_id")) for item in items if isinstance(item, dict)} - {None}
+    )
+
+    results = []
+    validated = []
+    answered = {}
+    for key, item in zip(keys, items):
+        if isinstance(key, str) and key in answered:
+            # Kunci berulang dalam satu batch dijawab sama dengan kemunculan pertamanya
+            results.append(answered[key])
+            continue
+        meeting_id = parse_meeting_id(item.get("meeting_id")) if isinstance(item, dict) else None
+        meeting = meetings.get(meeting_id)
+        if isinstance(key, str) and key in replays:
+            status = replay_status(replays[key], meeting_id)
+            result = batch_result(key, status, replays[key] if status == REPLAYED else None)
+        elif meeting is None:
+            result = batch_result(key, INVALID, errors={"meeting_id": ["Rapat tidak ditemukan."]})
+        else:
+            form, errors = validate_submission(key, item)
+            if errors:
+                result = batch_result(key, INVALID, errors=errors)
+            else:
+                result = batch_result(key, None)
+                validated.append((result, meeting, form))
+        results.append(result)
+        if isinstance(key, str):
+            answered[key] = result
+
+    # Nama terdaftar semua NIP dalam batch diambil sekaligus, bukan per item
+    names = registered_names({(meeting.meeting_id, submitted_nip(form)) for _, meeting, form in validated})
+    pending = []
+    for result, meeting, form in validated:
+        key = result["idempotency_key"]
+        submission, errors = build_submission(meeting, key, form, names[meeting.meeting_id, submitted_nip(form)])
+        if errors:
+            result.update(batch_result(key, INVALID, errors=errors))
+        else:
+            pending.append(submission)
+
+    inserted = insert_submissions(pending)
+    for result in results:
+        if result["status"] is None:
+            status, payload = inserted[result["idempotency_key"]]
+            result.update(batch_result(result["idempotency_key"], status, payload))
+    return results
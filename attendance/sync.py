@@ -0,0 +1,299 @@
+import hashlib
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+
+from django.db import transaction
+from django.utils import timezone
+
+from .models import Attendance, Meeting, SheetRow
+from .sheets import (
+    ABSENSI_HEADERS,
+    ABSENSI_SHEET,
+    RAPAT_HEADERS,
+    RAPAT_SHEET,
+    column_letter,
+    get_or_create_worksheet,
+    parse_a1,
+    sheet_revision,
+)
+from .signatures import normalize_signature
+from .storage import SIGNATURE_PREFIX, save_signature
+
+SHEET_DATE_FORMAT = "%d-%m-%Y"
+SHEET_TIME_FORMAT = "%H:%M"
+SHEET_TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+@dataclass
+class SyncReport:
+    pushed: int = 0
+    appended: int = 0
+    pulled: int = 0
+    skipped: int = 0
+    requests: int = 0
+
+    def __str__(self):
+        return (
+            f"{self.pushed} baris diperbarui, {self.appended} baris ditambahkan ke Sheets, "
+            f"{self.pulled} baris diambil dari Sheets, {self.skipped} dilewati, "
+            f"{self.requests} request API"
+        )
+
+
+def row_hash(row):
+    return hashlib.sha1("\x1f".join(row).encode("utf-8")).hexdigest()
+
+
+def format_timestamp(value):
+    return timezone.localtime(value).strftime(SHEET_TIMESTAMP_FORMAT)
+
+
+def parse_timestamp(value):
+    return timezone.make_aware(datetime.strptime(value, SHEET_TIMESTAMP_FORMAT))
+
+
+class MeetingSheet:
+    title = RAPAT_SHEET
+    headers = RAPAT_HEADERS
+    status_by_label = {label: value for value, label in Meeting.STATUS_CHOICES}
+
+    def key_for_row(self, row):
+        return row[0].strip()
+
+    def key_for(self, meeting):
+        return str(meeting.meeting_id)
+
+    def to_row(self, meeting):
+        return [
+            str(meeting.meeting_id),
+            meeting.title,
+            meeting.meeting_date.strftime(SHEET_DATE_FORMAT),
+            meeting.meeting_time.strftime(SHEET_TIME_FORMAT),
+            meeting.location,
+            meeting.leader,
+            format_timestamp(meeting.created_at),
+            meeting.get_status_display(),
+        ]
+
+    def changed_since(self, since):
+        queryset = Meeting.objects.order_by()
+        return queryset.filter(updated_at__gte=since) if since else queryset
+
+    def get_by_keys(self, keys):
+        return Meeting.objects.filter(meeting_id__in=keys)
+
+    def apply(self, row, since):
+        meeting_id = uuid.UUID(row[0].strip())
+        fields = {
+            "title": row[1],
+            "meeting_date": datetime.strptime(row[2].strip(), SHEET_DATE_FORMAT).date(),
+            "meeting_time": datetime.strptime(row[3].strip(), SHEET_TIME_FORMAT).time(),
+            "location": row[4],
+            "leader": row[5],
+            "status": self.status_by_label.get(row[7].strip(), Meeting.STATUS_ACTIVE),
+        }
+        meeting = Meeting.objects.filter(meeting_id=meeting_id).first()
+        if meeting is None:
+            Meeting.objects.create(meeting_id=meeting_id, created_at=parse_timestamp(row[6].strip()), **fields)
+            return True
+        if since is None or meeting.updated_at >= since:
+            return False
+        for name, value in fields.items():
+            setattr(meeting, name, value)
+        meeting.save()
+        return True
+
+
+class AttendanceSheet:
+    title = ABSENSI_SHEET
+    headers = ABSENSI_HEADERS
+
+    def key_for_row(self, row):
+        meeting_id, nip = row[0].strip(), row[2].strip()
+        return f"{meeting_id}|{nip}" if meeting_id and nip else ""
+
+    def key_for(self, attendance):
+        return f"{attendance.meeting_id}|{attendance.nip}"
+
+    def to_row(self, attendance):
+        signature = attendance.signature_data()
+        if signature.startswith(SIGNATURE_PREFIX):
+            signature = signature[len(SIGNATURE_PREFIX):]
+        return [
+            str(attendance.meeting_id),
+            attendance.name,
+            attendance.nip,
+            format_timestamp(attendance.timestamp),
+            signature,
+        ]
+
+    def changed_since(self, since):
+        queryset = Attendance.objects.order_by()
+        return queryset.filter(updated_at__gte=since) if since else queryset
+
+    def get_by_keys(self, keys):
+        pairs = [key.split("|", 1) for key in keys]
+        meeting_ids = {meeting_id for meeting_id, _ in pairs}
+        nips = {nip for _, nip in pairs}
+        return Attendance.objects.filter(meeting_id__in=meeting_ids, nip__in=nips)
+
+    def apply(self, row, since):
+        meeting = Meeting.objects.filter(meeting_id=uuid.UUID(row[0].strip())).first()
+        if meeting is None:
+            raise ValueError(f"Rapat {row[0]} tidak ditemukan")
+        signature = normalize_signature(row[4])
+        signature_name = save_signature(signature)
+        signature_phash = signature.phash if signature else ""
+        nip = row[2].strip()
+        attendance = Attendance.objects.filter(meeting=meeting, nip=nip).first()
+        if attendance is None:
+            Attendance.objects.create(
+                meeting=meeting,
+                name=row[1],
+                nip=nip,
+                timestamp=parse_timestamp(row[3].strip()),
+                signature=signature_name,
+                signature_phash=signature_phash,
+            )
+            return True
+        if since is None or attendance.updated_at >= since:
+            return False
+        attendance.name = row[1]
+        attendance.signature = signature_name
+        attendance.signature_phash = signature_phash
+        attendance.save()
+        return True
+
+
+class SheetSync:
+    """Sinkronisasi dua arah inkremental antara database Django dan Google Sheets.
+
+    Baris yang berubah di database sejak watermark terakhir ditulis ke Sheets
+    dalam satu ``batch_update`` dan satu ``append_rows`` per worksheet. Isi
+    worksheet hanya dibaca ulang bila revisi spreadsheet berubah; baris yang
+    hash-nya berbeda dari sinkronisasi terakhir dianggap diedit di Sheets dan
+    diambil kembali, kecuali baris yang sama juga berubah di database (database
+    menang dan baris ditulis ulang).
+    """
+
+    specs = (MeetingSheet(), AttendanceSheet())
+
+    def __init__(self, spreadsheet, state):
+        self.spreadsheet = spreadsheet
+        self.state = state
+        self.report = SyncReport()
+
+    def _call(self, func, *args, **kwargs):
+        self.report.requests += 1
+        return func(*args, **kwargs)
+
+    def run(self, full=False):
+        started = timezone.now()
+        since = None if full else self.state.pushed_at
+        revision = self._call(sheet_revision, self.spreadsheet)
+        pull = full or not revision or revision != self.state.sheet_revision
+
+        for spec in self.specs:
+            worksheet = self._call(get_or_create_worksheet, self.spreadsheet, spec.title, spec.headers)
+            known = {row.key: row for row in self.state.rows.filter(worksheet=spec.title)}
+            original = {key: (row.row_number, row.row_hash) for key, row in known.items()}
+            removed = []
+            forced = set()
+            with transaction.atomic():
+                if pull:
+                    removed, forced = self._pull(spec, worksheet, known, since)
+                self._push(spec, worksheet, known, since, forced)
+                self._save_rows(known, original, removed)
+
+        self.state.pushed_at = started
+        self.state.sheet_revision = self._call(sheet_revision, self.spreadsheet)
+        self.state.synced_at = timezone.now()
+        self.state.save()
+        return self.report
+
+    def _pull(self, spec, worksheet, known, since):
+        values = self._call(worksheet.get_all_values)
+        width = len(spec.headers)
+        seen = set()
+        for row_number, row in enumerate(values[1:], start=2):
+            row = (list(row) + [""] * width)[:width]
+            key = spec.key_for_row(row)
+            if not key or key in seen:
+                continue
+            seen.add(key)
+            digest = row_hash(row)
+            entry = known.get(key)
+            if entry is None:
+                entry = known[key] = SheetRow(state=self.state, worksheet=spec.title, key=key)
+            entry.row_number = row_number
+            if entry.row_hash == digest:
+                continue
+            try:
+                applied = spec.apply(row, since)
+            except ValueError:
+                applied = False
+                self.report.skipped += 1
+            if applied:
+                self.report.pulled += 1
+            entry.row_hash = digest
+
+        # Baris yang hilang dari sheet ditulis ulang dari database
+        missing = [key for key in known if key not in seen]
+        removed = [known.pop(key) for key in missing]
+        return removed, set(missing)
+
+    def _push(self, spec, worksheet, known, since, forced):
+        objects = list(spec.changed_since(since))
+        if forced:
+            objects.extend(spec.get_by_keys(forced))
+        last_column = column_letter(len(spec.headers))
+        updates = []
+        appends = []
+        seen = set()
+        for obj in objects:
+            key = spec.key_for(obj)
+            if key in seen:
+                continue
+            seen.add(key)
+            row = spec.to_row(obj)
+            digest = row_hash(row)
+            entry = known.get(key)
+            if entry is not None and entry.row_hash == digest:
+                continue
+            if entry is not None:
+                updates.append(
+                    {"range": f"A{entry.row_number}:{last_column}{entry.row_number}", "values": [row]}
+                )
+                entry.row_hash = digest
+            else:
+                appends.append((key, row, digest))
+
+        if updates:
+            self._call(worksheet.batch_update, updates, value_input_option="RAW")
+            self.report.pushed += len(updates)
+        if appends:
+            response = self._call(
+                worksheet.append_rows, [row for _, row, _ in appends], value_input_option="RAW"
+            )
+            updated_range = response["updates"]["updatedRange"].split("!")[-1]
+            first_row, _ = parse_a1(updated_range.split(":")[0])
+            for offset, (key, _, digest) in enumerate(appends):
+                known[key] = SheetRow(
+                    state=self.state,
+                    worksheet=spec.title,
+                    key=key,
+                    row_number=first_row + offset,
+                    row_hash=digest,
+                )
+            self.report.appended += len(appends)
+
+    def _save_rows(self, known, original, removed):
+        SheetRow.objects.filter(pk__in=[row.pk for row in removed if row.pk]).delete()
+        SheetRow.objects.bulk_create([row for row in known.values() if row.pk is None], batch_size=500)
+        changed = [
+            row
+            for key, row in known.items()
+            if row.pk is not None and original.get(key) != (row.row_number, row.row_hash)
+        ]
+        SheetRow.objects.bulk_update(changed, ["row_number", "row_hash"], batch_size=500)
@@ -0,0 +1,958 @@
+import asyncio
+import base64
+import csv
+import datetime
+import os
+import re
+import uuid
+import tempfile
+from io import BytesIO, StringIO
+from unittest import mock, skipUnless
+from urllib.parse import urlencode
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.http import QueryDict
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import include, path, reverse
+from django.utils import timezone
+from openpyxl import load_workbook
+from PIL import Image, ImageDraw
+
+from benchmarks.common import make_signature_base64
+from signature_utils import SignatureCache, encode_strokes
+
+from . import backup, live, views
+from .duplicates import MAX_SAME_SIGNATURE_DISTANCE
+from .excel import write_meeting_workbook
+from .models import Attendance, Meeting, Participant, RosterEntry, SheetSyncState
+from .roster import RosterError, read_roster
+from .sheets import ABSENSI_SHEET, RAPAT_SHEET, FakeAPIError, FakeSpreadsheet, get_or_create_worksheet
+from .signatures import MAX_STROKE_POINTS, SignatureError, normalize_signature, phash_for_data
+from .storage import encode_signature, get_signature_storage, load_signature, save_signature, signature_name
+from .submissions import CONFLICT, CREATED, REPLAYED, insert_submissions, prepare_submission, process_batch
+from .sync import SheetSync
+from .views import build_meeting_pdf
+
+
+class TempMediaMixin:
+    """MEDIA_ROOT di direktori sementara agar file TTD hasil test tidak tertinggal."""
+
+    def setUp(self):
+        super().setUp()
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        settings_override = override_settings(MEDIA_ROOT=media.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+
+class ContentAddressedStorageTests(TempMediaMixin, SimpleTestCase):
+    def test_same_content_saved_twice_keeps_one_file(self):
+        signature = normalize_signature(make_signature_base64(1))
+
+        names = {save_signature(signature), save_signature(signature)}
+
+        self.assertEqual(names, {signature_name(signature.digest, signature.ext)})
+        self.assertEqual(load_signature(names.pop()), encode_signature(signature.data, signature.ext))
+
+    def test_concurrent_save_of_same_name_does_not_loop(self):
+        # Dua request yang lolos cek exists() bersamaan: file sudah ada saat yang kedua menulis
+        storage = get_signature_storage()
+        name = signature_name("a" * 64, "png")
+        storage.save(name, ContentFile(b"isi"))
+
+        with mock.patch.object(storage, "exists", return_value=False):
+            self.assertEqual(storage.save(name, ContentFile(b"isi")), name)
+
+        directory = os.path.dirname(storage.path(name))
+        self.assertEqual(os.listdir(directory), [os.path.basename(name)])
+
+
+class SheetSyncRoundTripTests(TempMediaMixin, TestCase):
+    """Sinkronisasi database <-> Sheets memakai FakeSpreadsheet in-memory."""
+
+    def setUp(self):
+        super().setUp()
+        self.spreadsheet = FakeSpreadsheet()
+        self.state = SheetSyncState.objects.create(spreadsheet_id="test")
+        self.meeting = Meeting.objects.create(
+            title="Rapat Dinas",
+            meeting_date=datetime.date(2026, 1, 5),
+            meeting_time=datetime.time(8, 0),
+            location="Aula",
+            leader="Kepala Sekolah",
+        )
+        signature = normalize_signature(encode_strokes([[(10, 10), (80, 60), (150, 20)]], 300, 100, 25))
+        self.attendance = Attendance.objects.create(
+            meeting=self.meeting,
+            name="Budi Santoso",
+            nip="197501011998031001",
+            timestamp=timezone.now(),
+            signature=save_signature(signature),
+            signature_phash=signature.phash,
+        )
+
+    def sync(self, full=False):
+        return SheetSync(self.spreadsheet, self.state).run(full=full)
+
+    def rows(self, title):
+        return self.spreadsheet.worksheet(title)._rows
+
+    def test_push_creates_worksheets_and_appends_rows(self):
+        report = self.sync()
+
+        self.assertEqual(report.appended, 2)
+        meeting_rows = self.rows(RAPAT_SHEET)
+        attendance_rows = self.rows(ABSENSI_SHEET)
+        self.assertEqual(meeting_rows[1][:2], [str(self.meeting.meeting_id), "Rapat Dinas"])
+        self.assertEqual(attendance_rows[1][:3], [str(self.meeting.meeting_id), "Budi Santoso", "197501011998031001"])
+        self.assertTrue(attendance_rows[1][4])
+
+    def test_second_sync_without_changes_writes_nothing(self):
+        self.sync()
+        self.spreadsheet.calls.clear()
+
+        report = self.sync()
+
+        self.assertEqual((report.pushed, report.appended, report.pulled), (0, 0, 0))
+        self.assertFalse({"update", "batch_update", "append_rows", "get_all_values"} & set(self.spreadsheet.calls))
+
+    def test_database_change_updates_existing_row(self):
+        self.sync()
+        Meeting.objects.filter(pk=self.meeting.pk).update(location="Ruang Guru", updated_at=timezone.now())
+
+        report = self.sync()
+
+        self.assertEqual(report.pushed, 1)
+        self.assertEqual(self.rows(RAPAT_SHEET)[1][4], "Ruang Guru")
+        self.assertEqual(len(self.rows(RAPAT_SHEET)), 2)
+
+    def test_sheet_edit_is_pulled_into_database(self):
+        self.sync()
+        self.spreadsheet.worksheet(RAPAT_SHEET).update_cell(2, 2, "Rapat Dinas (revisi)")
+
+        report = self.sync()
+
+        self.assertEqual(report.pulled, 1)
+        self.meeting.refresh_from_db()
+        self.assertEqual(self.meeting.title, "Rapat Dinas (revisi)")
+
+    def test_row_added_in_sheet_round_trips_back_unchanged(self):
+        self.sync()
+        row = list(self.rows(ABSENSI_SHEET)[1])
+        row[1:3] = ["Siti Aminah", "198002022005012002"]
+        self.spreadsheet.worksheet(ABSENSI_SHEET).append_rows([row])
+
+        report = self.sync()
+
+        self.assertEqual(report.pulled, 1)
+        attendance = Attendance.objects.get(meeting=self.meeting, nip="198002022005012002")
+        self.assertEqual(attendance.name, "Siti Aminah")
+        self.assertEqual(attendance.signature.name, self.attendance.signature.name)
+        self.assertEqual(len(self.rows(ABSENSI_SHEET)), 3)
+
+    def test_row_deleted_in_sheet_is_rewritten_from_database(self):
+        self.sync()
+        self.spreadsheet.worksheet(ABSENSI_SHEET).delete_rows(2)
+
+        self.sync()
+
+        self.assertEqual(self.rows(ABSENSI_SHEET)[1][2], "197501011998031001")
+
+
+class GetOrCreateWorksheetTests(TestCase):
+    def test_missing_worksheet_is_created_with_headers(self):
+        spreadsheet = FakeSpreadsheet()
+
+        worksheet = get_or_create_worksheet(spreadsheet, "Baru", ["A", "B"])
+
+        self.assertEqual(worksheet._rows, [["A", "B"]])
+
+    def test_api_errors_are_not_treated_as_missing_worksheet(self):
+        spreadsheet = FakeSpreadsheet(quota_per_minute=0)
+
+        with self.assertRaises(FakeAPIError):
+            get_or_create_worksheet(spreadsheet, "Baru", ["A", "B"])
+        self.assertEqual(spreadsheet.calls["add_worksheet"], 0)
+
+
+class BackupTests(TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        self.spreadsheet = FakeSpreadsheet()
+        self.spreadsheet.seed(RAPAT_SHEET, [backup.RAPAT_HEADERS])
+        self.spreadsheet.seed(ABSENSI_SHEET, [backup.ABSENSI_HEADERS, ["m1", "Budi", "1", "t", ""]])
+
+    def add_row(self, nip):
+        self.spreadsheet.worksheet(ABSENSI_SHEET).append_rows([["m1", f"Peserta {nip}", nip, "t", ""]])
+
+    def test_diff_chain_restores_latest_rows(self):
+        backup.create_backup(self.spreadsheet, self.directory)
+        self.add_row("2")
+        result = backup.create_backup(self.spreadsheet, self.directory)
+
+        self.assertEqual(result.kind, "diff")
+        self.assertEqual(backup.load_snapshot(self.directory), backup.read_sheets(self.spreadsheet))
+
+    def test_crash_before_manifest_does_not_corrupt_next_diff(self):
+        backup.create_backup(self.spreadsheet, self.directory)
+        self.add_row("2")
+        with mock.patch.object(backup, "_save_manifest", side_effect=OSError("disk penuh")):
+            with self.assertRaises(OSError):
+                backup.create_backup(self.spreadsheet, self.directory)
+        self.add_row("3")
+
+        backup.create_backup(self.spreadsheet, self.directory)
+
+        self.assertEqual(backup.load_snapshot(self.directory), backup.read_sheets(self.spreadsheet))
+
+
+    def test_diff_of_many_identical_rows_is_linear(self):
+        rows = [backup.ABSENSI_HEADERS] + [["", "", "", "", ""]] * 20000
+        self.spreadsheet.seed(ABSENSI_SHEET, rows)
+        backup.create_backup(self.spreadsheet, self.directory)
+        self.spreadsheet.seed(ABSENSI_SHEET, rows[:10000] + [["m1", "Baru", "9", "t", ""]] + rows[10000:])
+
+        with mock.patch.object(backup.difflib, "SequenceMatcher", wraps=backup.difflib.SequenceMatcher) as matcher:
+            result = backup.create_backup(self.spreadsheet, self.directory)
+
+        matcher.assert_not_called()
+        self.assertEqual(result.changed_rows, 1)
+        self.assertEqual(backup.load_snapshot(self.directory), backup.read_sheets(self.spreadsheet))
+
+    def test_changes_inside_repeated_rows_round_trip(self):
+        old = [[str(index % 3)] for index in range(3000)]
+        new = [["awal"]] + old[:1500] + [["tengah"]] + old[1500:2999] + [["akhir"]]
+
+        ops = backup._diff_ops([row[0] for row in old], [row[0] for row in new], new)
+
+        self.assertEqual(backup._apply_ops(old, ops), new)
+
+    def test_restore_replaces_longer_sheet(self):
+        snapshot = backup.read_sheets(self.spreadsheet)
+        for nip in range(2, 6):
+            self.add_row(str(nip))
+
+        backup.restore_to_sheet(self.spreadsheet, snapshot)
+
+        self.assertEqual(backup.read_sheets(self.spreadsheet), snapshot)
+
+    def test_failed_restore_leaves_current_rows(self):
+        snapshot = {ABSENSI_SHEET: [backup.ABSENSI_HEADERS]}
+        before = backup.read_sheets(self.spreadsheet)
+        worksheet = self.spreadsheet.worksheet(ABSENSI_SHEET)
+
+        with mock.patch.object(worksheet, "update", side_effect=FakeAPIError("kuota habis")):
+            with self.assertRaises(FakeAPIError):
+                backup.restore_to_sheet(self.spreadsheet, snapshot)
+
+        self.assertEqual(backup.read_sheets(self.spreadsheet), before)
+
+
+class MeetingExportTests(TempMediaMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.meeting = Meeting.objects.create(
+            title="Rapat",
+            meeting_date=datetime.date(2026, 1, 5),
+            meeting_time=datetime.time(8, 0),
+            location="Aula",
+            leader="Kepala Sekolah",
+        )
+
+    def test_malformed_stroke_file_does_not_abort_pdf(self):
+        storage = get_signature_storage()
+        name = storage.save(signature_name("f" * 64, "strokes"), ContentFile(b"\xff\xff\xff"))
+        Attendance.objects.create(meeting=self.meeting, name="Budi", nip="1", timestamp=timezone.now(), signature=name)
+
+        data = build_meeting_pdf(self.meeting)
+
+        self.assertTrue(data.startswith(b"%PDF"))
+
+    def get_pdf(self, **headers):
+        return self.client.get(reverse("meeting_pdf", args=[self.meeting.meeting_id]), headers=headers)
+
+    def test_pdf_is_rendered_once_per_version(self):
+        with mock.patch("attendance.views.build_meeting_pdf", wraps=build_meeting_pdf) as build:
+            first = self.get_pdf()
+            second = self.get_pdf()
+            unchanged = self.get_pdf(if_none_match=first["ETag"])
+
+        self.assertEqual(build.call_count, 1)
+        body = first.getvalue()
+        self.assertTrue(body.startswith(b"%PDF"))
+        self.assertEqual(second.getvalue(), body)
+        self.assertEqual(unchanged.status_code, 304)
+
+    def test_pdf_is_regenerated_when_attendance_changes(self):
+        first = self.get_pdf()
+        Attendance.objects.create(meeting=self.meeting, name="Siti", nip="2", timestamp=timezone.now())
+
+        second = self.get_pdf(if_none_match=first["ETag"])
+
+        self.assertEqual(second.status_code, 200)
+        self.assertNotEqual(second["ETag"], first["ETag"])
+        self.assertNotEqual(second.getvalue(), first.getvalue())
+        directory = os.path.join(settings.MEDIA_ROOT, "pdf", str(self.meeting.meeting_id))
+        self.assertEqual(len(os.listdir(directory)), 1)
+
+    def test_malformed_stroke_file_is_left_out_of_excel(self):
+        storage = get_signature_storage()
+        name = storage.save(signature_name("e" * 64, "strokes"), ContentFile(b"\xff\xff\xff"))
+        Attendance.objects.create(meeting=self.meeting, name="Budi", nip="1", timestamp=timezone.now(), signature=name)
+        output = BytesIO()
+
+        write_meeting_workbook(self.meeting, output)
+
+        sheet = load_workbook(BytesIO(output.getvalue())).active
+        self.assertEqual(sheet["E4"].value, "(TTD tidak tersedia)")
+
+
+class SignatureCacheTests(SimpleTestCase):
+    def test_png_miss_is_counted_once(self):
+        cache = SignatureCache()
+        data = encode_strokes([[(1, 1), (40, 30)]], 100, 50, 25)
+
+        cache.png(data, (100, 50))
+        cache.png(data, (100, 50))
+
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        self.assertEqual(cache.stats()["hit_rate"], 0.5)
+
+
+
+def webp_data_url(size=(680, 220)):
+    """TTD tinta biru di kanvas transparen sebagai data URL WebP, seperti kiriman form"""
+    image = Image.new("RGBA", size, (0, 0, 0, 0))
+    ImageDraw.Draw(image).line([(40, 150), (200, 60), (400, 170), (640, 50)], fill=(20, 40, 200, 255), width=8)
+    buffer = BytesIO()
+    image.save(buffer, format="WEBP", lossless=True)
+    return "data:image/webp;base64," + base64.b64encode(buffer.getvalue()).decode("ascii")
+
+
+class NormalizeSignatureTests(SimpleTestCase):
+    def test_webp_is_stored_as_grayscale_png(self):
+        signature = normalize_signature(webp_data_url())
+        image = Image.open(BytesIO(signature.data))
+
+        self.assertEqual((signature.ext, image.format), ("png", "PNG"))
+        self.assertTrue(image.width <= 600 and image.height <= 200, image.size)
+        self.assertEqual(set(image.convert("RGB").getdata()) - {(v, v, v) for v in range(256)}, set())
+
+    def test_empty_value_is_none(self):
+        self.assertIsNone(normalize_signature("  "))
+
+    def test_rejects_invalid_signatures(self):
+        gif = BytesIO()
+        Image.new("L", (60, 20)).save(gif, format="GIF")
+        bomb = BytesIO()
+        Image.new("1", (4000, 2000), 1).save(bomb, format="PNG")
+        blank = BytesIO()
+        Image.new("RGBA", (600, 200), (255, 255, 255, 255)).save(blank, format="PNG")
+        cases = {
+            "terlalu besar": ("x" * 101, 100),
+            "tidak valid": ("data:image/png;base64,bukan base64!", None),
+            "PNG atau WebP": (base64.b64encode(gif.getvalue()).decode(), None),
+            "Ukuran gambar": (base64.b64encode(bomb.getvalue()).decode(), None),
+            "kosong": (base64.b64encode(blank.getvalue()).decode(), None),
+            "rumit": (encode_strokes([[(i % 500, i % 7 * 20) for i in range(MAX_STROKE_POINTS + 10)]], 600, 200), None),
+        }
+        for message, (value, max_bytes) in cases.items():
+            with self.subTest(message), override_settings(SIGNATURE_MAX_BYTES=10**7):
+                with self.assertRaisesMessage(SignatureError, message):
+                    normalize_signature(value, max_bytes)
+
+    def test_same_signature_in_any_encoding_has_same_digest(self):
+        png = BytesIO()
+        Image.open(BytesIO(base64.b64decode(webp_data_url().split(",", 1)[1]))).save(png, format="PNG")
+
+        from_webp = normalize_signature(webp_data_url())
+        from_png = normalize_signature("data:image/png;base64," + base64.b64encode(png.getvalue()).decode())
+
+        self.assertEqual(from_png.digest, from_webp.digest)
+
+
+class AttendanceFormTests(TestCase):
+    @override_settings(SIGNATURE_MAX_BYTES=12345)
+    def test_canvas_gets_signature_limit(self):
+        meeting = Meeting.objects.create(
+            title="Rapat",
+            meeting_date=datetime.date(2026, 1, 5),
+            meeting_time=datetime.time(8, 0),
+            location="Aula",
+            leader="Kepala Sekolah",
+        )
+
+        response = self.client.get(reverse("attendance_form", args=[meeting.meeting_id]))
+
+        self.assertContains(response, 'data-max-bytes="12345"')
+
+class SignatureReportTests(TestCase):
+    def setUp(self):
+        from django.contrib.auth.models import User
+
+        self.client.force_login(User.objects.create_superuser("admin", "admin@example.com", "x"))
+
+    def test_out_of_range_distances_are_clamped(self):
+        url = reverse("admin:attendance_attendance_signature_report")
+        for query in ("distance=-3", "distance=100000", "inconsistent_distance=-1", "distance=abc"):
+            response = self.client.get(f"{url}?{query}")
+            self.assertEqual(response.status_code, 200, query)
+            self.assertTrue(0 <= response.context["distance"] <= MAX_SAME_SIGNATURE_DISTANCE)
+
+    def test_phash_matches_hash_of_stored_bytes(self):
+        signature = normalize_signature(make_signature_base64(3))
+
+        self.assertEqual(signature.phash, phash_for_data(signature.data, signature.ext))
+
+
+# URL tambahan agar view async bisa dites apa pun nilai ASYNC_ATTENDANCE
+urlpatterns = [
+    path("async/a/<uuid:meeting_id>/", views.attendance_form_view_async, name="attendance_form_async"),
+    path("", include("webapp.urls")),
+]
+
+
+@override_settings(ROOT_URLCONF=__name__, MESSAGE_STORAGE="django.contrib.messages.storage.session.SessionStorage")
+class AsyncAttendanceFormTests(TempMediaMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.meeting = Meeting.objects.create(
+            title="Rapat",
+            meeting_date=datetime.date(2026, 1, 5),
+            meeting_time=datetime.time(8, 0),
+            location="Aula",
+            leader="Kepala Sekolah",
+        )
+        self.url = reverse("attendance_form_async", args=[self.meeting.meeting_id])
+
+    async def test_post_through_async_view(self):
+        # Pesan di session: template base membacanya lewat query session saat render
+        user = await User.objects.acreate(username="panitia")
+        await self.async_client.aforce_login(user)
+        data = {"nip": "1975", "name": "Budi", "signature_base64": make_signature_base64(1)}
+
+        invalid = await self.async_client.post(self.url, {**data, "signature_base64": ""})
+        created = await self.async_client.post(self.url, data)
+
+        self.assertContains(invalid, "Tanda tangan wajib diisi.")
+        self.assertTemplateUsed(created, "attendance/attendance_success.html")
+        self.assertEqual(await self.meeting.attendances.acount(), 1)
+
+
+
+class MeetingQrTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.meeting = Meeting.objects.create(
+            title="Rapat",
+            meeting_date=datetime.date(2026, 1, 5),
+            meeting_time=datetime.time(8, 0),
+            location="Aula",
+            leader="Kepala Sekolah",
+        )
+
+    def url(self, fmt):
+        return reverse("meeting_qr", kwargs={"meeting_id": str(self.meeting.meeting_id), "fmt": fmt})
+
+    def test_png_and_svg(self):
+        png = self.client.get(self.url("png"), {"size": 100000})
+        svg = self.client.get(self.url("svg"))
+
+        self.assertEqual(png["Content-Type"], "image/png")
+        # Ukuran dibatasi QR_MAX_SIZE (dibulatkan ke kelipatan modul)
+        self.assertTrue(views.QR_MAX_SIZE * 0.9 < Image.open(BytesIO(png.content)).width <= views.QR_MAX_SIZE)
+        self.assertEqual(svg["Content-Type"], "image/svg+xml")
+        self.assertIn(b"<svg", svg.content)
+        for response in (png, svg):
+            self.assertIn("public", response["Cache-Control"])
+            self.assertIn(f"max-age={views.QR_CACHE_TIMEOUT}", response["Cache-Control"])
+
+    def test_etag_revalidation_and_render_once(self):
+        with mock.patch.object(views, "render_qrcode", wraps=views.render_qrcode) as render:
+            first = self.client.get(self.url("png"))
+            again = self.client.get(self.url("png"))
+            cached = self.client.get(self.url("png"), HTTP_IF_NONE_MATCH=first["ETag"])
+            other_host = self.client.get(self.url("png"), HTTP_HOST="absen.example.sch.id")
+
+        self.assertEqual(again.content, first.content)
+        self.assertEqual(cached.status_code, 304)
+        self.assertNotEqual(other_host["ETag"], first["ETag"])
+        self.assertEqual(render.call_count, 2)
+
+    def test_unknown_meeting_is_404(self):
+        url = self.url("png")
+        self.meeting.delete()
+
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+
+class MeetingListTests(TestCase):
+    def setUp(self):
+        created_at = timezone.now()
+        self.meetings = [
+            Meeting.objects.create(
+                title=f"Rapat {number}",
+                meeting_date=datetime.date(2026, 1, 1 + number % 28),
+                meeting_time=datetime.time(8, 0),
+                location="Aula",
+                leader="Kepala Sekolah",
+                status=Meeting.STATUS_DONE if number % 3 == 0 else Meeting.STATUS_ACTIVE,
+                # Sebagian created_at sama persis: urutan ditentukan meeting_id
+                created_at=created_at - datetime.timedelta(minutes=number // 4),
+            )
+            for number in range(views.MEETINGS_PER_PAGE * 2 + 10)
+        ]
+        self.url = reverse("meeting_list_create")
+
+    def pages(self, params):
+        pages = []
+        query = urlencode(params)
+        while query is not None:
+            response = self.client.get(f"{self.url}?{query}")
+            pages.append(response.context["meetings"])
+            query = response.context["next_query"]
+            if query:
+                self.assertEqual(QueryDict(query).dict().keys() - {"cursor"}, params.keys())
+        return pages
+
+    def test_cursor_pages_cover_every_meeting_once_in_order(self):
+        pages = self.pages({})
+        expected = sorted(self.meetings, key=lambda m: (m.created_at, m.meeting_id), reverse=True)
+
+        self.assertEqual([len(page) for page in pages], [views.MEETINGS_PER_PAGE, views.MEETINGS_PER_PAGE, 10])
+        self.assertEqual([m.pk for page in pages for m in page], [m.pk for m in expected])
+
+    def test_filters_are_kept_across_pages(self):
+        params = {"status": Meeting.STATUS_ACTIVE, "date_from": "2026-01-05"}
+        pages = self.pages(params)
+        meetings = [m for page in pages for m in page]
+
+        self.assertEqual(len(pages), 2)
+        self.assertEqual(
+            {m.pk for m in meetings},
+            {m.pk for m in self.meetings if m.status == Meeting.STATUS_ACTIVE and m.meeting_date >= datetime.date(2026, 1, 5)},
+        )
+
+    def test_page_shows_attendance_count_in_one_query(self):
+        meeting = self.meetings[0]
+        for nip in ("1", "2"):
+            Attendance.objects.create(meeting=meeting, name="Budi", nip=nip, timestamp=timezone.now())
+
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url)
+            meetings = response.context["meetings"]
+
+        self.assertEqual({m.pk: m.attendance_count for m in meetings}[meeting.pk], 2)
+
+    def test_invalid_cursor_shows_first_page(self):
+        response = self.client.get(self.url, {"cursor": "bukan-cursor"})
+
+        self.assertEqual(len(response.context["meetings"]), views.MEETINGS_PER_PAGE)
+        self.assertEqual(response.context["first_query"], "")
+
+
+class AttendanceCounterTests(TestCase):
+    def setUp(self):
+        self.meeting = Meeting.objects.create(
+            title="Rapat",
+            meeting_date=datetime.date(2026, 1, 5),
+            meeting_time=datetime.time(8, 0),
+            location="Aula",
+            leader="Kepala Sekolah",
+        )
+        self.start = timezone.now()
+
+    def attend(self, nip, minutes):
+        return Attendance.objects.create(
+            meeting=self.meeting, name="Budi", nip=nip, timestamp=self.start + datetime.timedelta(minutes=minutes)
+        )
+
+    def counter(self):
+        self.meeting.refresh_from_db()
+        return self.meeting.attendance_count, self.meeting.last_attendance_at
+
+    def test_create_and_delete_update_counter(self):
+        first = self.attend("1", 5)
+        second = self.attend("2", 1)
+        self.assertEqual(self.counter(), (2, first.timestamp))
+
+        second.name = "Budi S."
+        second.save()
+        self.assertEqual(self.counter(), (2, first.timestamp))
+
+        first.delete()
+        self.assertEqual(self.counter(), (1, second.timestamp))
+        second.delete()
+        self.assertEqual(self.counter(), (0, None))
+
+    def test_counter_never_goes_negative(self):
+        attendance = self.attend("1", 0)
+        Meeting.objects.filter(pk=self.meeting.pk).update(attendance_count=0)
+
+        attendance.delete()
+
+        self.assertEqual(self.counter(), (0, None))
+
+    def test_failed_insert_rolls_back_counter(self):
+        with self.assertRaises(RuntimeError), transaction.atomic():
+            self.attend("1", 0)
+            raise RuntimeError
+
+        self.assertEqual(self.counter(), (0, None))
+
+    def test_reconcile_repairs_drift(self):
+        attendance = self.attend("1", 0)
+        Meeting.objects.filter(pk=self.meeting.pk).update(attendance_count=7, last_attendance_at=None)
+        out = StringIO()
+
+        call_command("reconcile_attendance_counts", "--dry-run", stdout=out)
+        self.assertEqual(self.counter(), (7, None))
+        call_command("reconcile_attendance_counts", stdout=out)
+
+        self.assertIn("7 -> 1", out.getvalue())
+        self.assertEqual(self.counter(), (1, attendance.timestamp))
+
+
+class ParticipantSearchTests(TestCase):
+    def setUp(self):
+        people = [("197501", "Dra. Siti Aminah, M.Pd"), ("197502", "Sitorus"), ("198001", "Budi Santoso"), ("2975", "Ani Siti")]
+        people += [(f"1990{number:02d}", f"Guru {number:02d}") for number in range(15)]
+        for nip, name in people:
+            Participant.objects.create(nip=nip, name=name, position="Guru")
+        self.url = reverse("participant_search")
+
+    def search(self, query):
+        response = self.client.get(self.url, {"q": query})
+        self.assertEqual(response.status_code, 200)
+        return response, [row["nip"] for row in response.json()["results"]]
+
+    def test_nip_and_name_prefix(self):
+        self.assertEqual(self.search("1975")[1], ["197501", "197502"])
+        self.assertEqual(self.search("1975 02")[1], ["197502"])
+        # Gelar dan tanda baca diabaikan; hanya awalan nama, bukan kata di tengah
+        self.assertEqual(self.search("siti")[1], ["197501"])
+        self.assertEqual(self.search("Sit")[1], ["197501", "197502"])
+
+    def test_short_query_returns_nothing(self):
+        for query in ("", "19", "s", "  "):
+            self.assertEqual(self.search(query)[1], [], query)
+
+    def test_results_are_limited_and_cacheable(self):
+        response, nips = self.search("guru")
+
+        self.assertEqual(nips, [f"1990{number:02d}" for number in range(10)])
+        self.assertEqual(set(response.json()["results"][0]), {"nip", "name", "position"})
+        self.assertIn("private", response["Cache-Control"])
+        self.assertIn(f"max-age={views.PARTICIPANT_SEARCH_MAX_AGE}", response["Cache-Control"])
+
+
+def create_meeting():
+    return Meeting.objects.create(
+        title="Rapat",
+        meeting_date=datetime.date(2026, 1, 5),
+        meeting_time=datetime.time(8, 0),
+        location="Aula",
+        leader="Kepala Sekolah",
+    )
+
+
+def sse_ids(text):
+    return [int(value) for value in re.findall(r"^id: (\d+)$", text, re.M)]
+
+
+class MeetingEventsTests(TestCase):
+    def setUp(self):
+        self.meeting = create_meeting()
+        self.attendances = [
+            Attendance.objects.create(meeting=self.meeting, name="Budi", nip=nip, timestamp=timezone.now())
+            for nip in ("1", "2", "3")
+        ]
+        self.url = reverse("meeting_events", args=[self.meeting.meeting_id])
+
+    def test_wsgi_long_poll_returns_new_events_and_closes(self):
+        first, second, third = self.attendances
+
+        response = self.client.get(self.url, {"after": first.id})
+        resumed = self.client.get(self.url, {"after": first.id}, HTTP_LAST_EVENT_ID=str(second.id))
+
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        self.assertEqual(response["Cache-Control"], "no-cache")
+        self.assertFalse(response.streaming)
+        text = response.content.decode()
+        self.assertTrue(text.startswith(f"retry: {views.EVENTS_POLL_INTERVAL * 1000}\n\n"))
+        self.assertEqual(sse_ids(text), [second.id, third.id])
+        self.assertEqual(sse_ids(resumed.content.decode()), [third.id])
+
+    def test_unknown_meeting_is_404(self):
+        self.assertEqual(self.client.get(reverse("meeting_events", args=[uuid.uuid4()])).status_code, 404)
+
+
+class MeetingEventsStreamTests(TransactionTestCase):
+    async def subscribed(self, meeting):
+        while str(meeting.meeting_id) not in live._subscribers:
+            await asyncio.sleep(0.01)
+
+    async def test_asgi_stream_pushes_new_attendance_without_polling_delay(self):
+        meeting = await sync_to_async(create_meeting)()
+        first = await Attendance.objects.acreate(meeting=meeting, name="Budi", nip="1", timestamp=timezone.now())
+        url = reverse("meeting_events", args=[meeting.meeting_id])
+
+        response = await self.async_client.get(url)
+        self.assertTrue(response.streaming)
+        chunks = aiter(response.streaming_content)
+        try:
+            self.assertEqual(await anext(chunks), f"retry: {views.EVENTS_RETRY_MS}\n\n".encode())
+            self.assertEqual(sse_ids((await anext(chunks)).decode()), [first.id])
+            # Absensi baru membangunkan stream lewat live.notify, jauh sebelum EVENTS_POLL_INTERVAL
+            pending = asyncio.ensure_future(anext(chunks))
+            await asyncio.wait_for(self.subscribed(meeting), 1)
+            second = await Attendance.objects.acreate(meeting=meeting, name="Sari", nip="2", timestamp=timezone.now())
+            chunk = await asyncio.wait_for(pending, views.EVENTS_POLL_INTERVAL / 2)
+        finally:
+            await chunks.aclose()
+
+        self.assertEqual(sse_ids(chunk.decode()), [second.id])
+
+class RosterCsvTests(SimpleTestCase):
+    def read(self, data):
+        return list(read_roster(SimpleUploadedFile("roster.csv", data), "roster.csv"))
+
+    def test_utf8_with_bom(self):
+        rows = self.read("NIP;Nama\n1975;Andi Müller\n".encode("utf-8-sig"))
+
+        self.assertEqual(rows, [(2, "1975", "Andi Müller", None)])
+
+    def test_cp1252_from_excel(self):
+        rows = self.read("NIP;Nama;Jabatan\r\n1975;José Ramírez;Guru\r\n".encode("cp1252"))
+
+        self.assertEqual(rows, [(2, "1975", "José Ramírez", "Guru")])
+
+    def test_undecodable_or_broken_csv_raises_roster_error(self):
+        with self.assertRaises(RosterError):
+            self.read(b"NIP;Nama\n1975;\x81\x8d\n")
+        with self.assertRaises(RosterError):
+            self.read(b"NIP;Nama\n1975;" + b"x" * (csv.field_size_limit() + 1) + b"\n")
+
+
+class AttendanceApiTests(TempMediaMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.meetings = [
+            Meeting.objects.create(
+                title=f"Rapat {number}",
+                meeting_date=datetime.date(2026, 1, 5),
+                meeting_time=datetime.time(8, 0),
+                location="Aula",
+                leader="Kepala Sekolah",
+            )
+            for number in range(2)
+        ]
+        self.item = {"nip": "1975", "name": "Budi", "signature": make_signature_base64(1)}
+
+    def post(self, meeting, key="kunci-0001"):
+        url = reverse("api_attendance_create", args=[meeting.meeting_id])
+        return self.client.post(url, self.item, content_type="application/json", headers={"Idempotency-Key": key})
+
+    def test_replay_returns_stored_attendance(self):
+        created = self.post(self.meetings[0])
+
+        replayed = self.post(self.meetings[0])
+
+        self.assertEqual(created.status_code, 201)
+        self.assertEqual(replayed.status_code, 200)
+        self.assertEqual(replayed.json(), created.json())
+
+    def test_key_reused_for_another_meeting_is_rejected(self):
+        self.post(self.meetings[0])
+
+        response = self.post(self.meetings[1])
+
+        self.assertEqual(response.status_code, 422)
+        self.assertNotIn("attendance", response.json())
+        self.assertFalse(self.meetings[1].attendances.exists())
+
+    def test_batch_creates_then_replays(self):
+        item = {**self.item, "idempotency_key": "kunci-0002", "meeting_id": str(self.meetings[0].meeting_id)}
+        url = reverse("api_attendance_batch")
+
+        first = self.client.post(url, {"items": [item]}, content_type="application/json").json()["results"]
+        second = self.client.post(url, {"items": [item]}, content_type="application/json").json()["results"]
+
+        self.assertEqual([result["status"] for result in first + second], [CREATED, REPLAYED])
+        self.assertEqual(self.meetings[0].attendances.count(), 1)
+
+    def test_rejected_duplicate_leaves_no_signature_file(self):
+        self.post(self.meetings[0])
+        self.item["signature"] = make_signature_base64(2)
+        signature = normalize_signature(self.item["signature"])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.post(self.meetings[0], key="kunci-0009")
+
+        self.assertEqual(response.status_code, 409)
+        self.assertFalse(get_signature_storage().exists(signature_name(signature.digest, signature.ext)))
+
+    def test_offline_queue_batches_stay_under_upload_limit(self):
+        with override_settings(DATA_UPLOAD_MAX_MEMORY_SIZE=1000):
+            script = self.client.get(reverse("service_worker")).content.decode()
+        with override_settings(DATA_UPLOAD_MAX_MEMORY_SIZE=None):
+            unlimited = self.client.get(reverse("service_worker")).content.decode()
+
+        self.assertIn("const BATCH_MAX_BYTES = 1000;", script)
+        self.assertIn("const BATCH_MAX_BYTES = Infinity;", unlimited)
+
+    def test_batch_repeated_key_gets_a_result_per_item(self):
+        item = {**self.item, "idempotency_key": "kunci-0003", "meeting_id": str(self.meetings[0].meeting_id)}
+        items = [item, {**item, "idempotency_key": "kunci-0004", "nip": "1976"}, item]
+
+        response = self.client.post(reverse("api_attendance_batch"), {"items": items}, content_type="application/json")
+
+        results = response.json()["results"]
+        self.assertEqual([result["idempotency_key"] for result in results], ["kunci-0003", "kunci-0004", "kunci-0003"])
+        self.assertEqual(results[2], results[0])
+        self.assertEqual(results[0]["status"], CREATED)
+        self.assertEqual(self.meetings[0].attendances.count(), 2)
+
+    def test_batch_queries_do_not_grow_with_items(self):
+        RosterEntry.objects.create(meeting=self.meetings[0], nip="2000", name="Nama Roster")
+        Participant.objects.create(nip="2001", name="Nama Induk")
+
+        def post_batch(count, offset):
+            items = [
+                {
+                    **self.item,
+                    "idempotency_key": f"kunci-{offset + number:04}",
+                    "meeting_id": str(self.meetings[number % 2].meeting_id),
+                    "nip": str(offset + number),
+                    "name": "Peserta",
+                }
+                for number in range(count)
+            ]
+            with CaptureQueriesContext(connection) as queries:
+                results = process_batch(items)
+            return results, len(queries)
+
+        small, small_queries = post_batch(2, 2000)
+        _, large_queries = post_batch(6, 3000)
+
+        self.assertEqual(small_queries, large_queries)
+        self.assertEqual([result["attendance"]["name"] for result in small], ["Nama Roster", "Nama Induk"])
+
+    def test_batch_key_reused_for_another_meeting_is_conflict(self):
+        self.post(self.meetings[0])
+        item = {**self.item, "idempotency_key": "kunci-0001", "meeting_id": str(self.meetings[1].meeting_id)}
+
+        response = self.client.post(reverse("api_attendance_batch"), {"items": [item]}, content_type="application/json")
+
+        [result] = response.json()["results"]
+        self.assertEqual(result["status"], CONFLICT)
+        self.assertNotIn("attendance", result)
+
+    def test_concurrent_key_reuse_for_another_meeting_is_conflict(self):
+        self.post(self.meetings[0])
+        submission, _ = prepare_submission(self.meetings[1], "kunci-0001", {**self.item, "nip": "1976"})
+
+        self.assertEqual(insert_submissions([submission])["kunci-0001"], (CONFLICT, None))
+
+
+# Jumlah query per halaman; naik berarti ada N+1 atau COUNT baru
+QUERY_BUDGETS = (
+    ("meeting_list_create", (), "", 1),
+    ("meeting_detail", ("meeting",), "", 3),
+    ("attendance_form", ("meeting",), "", 1),
+    ("meeting_pdf", ("meeting",), "", 4),
+    ("meeting_qr", ("meeting", "svg"), "", 1),
+    ("participant_search", (), "q=1975", 1),
+)
+SQLITE_FULL_SCAN = re.compile(r"\bSCAN (\w+)\b(?! USING)")
+SQLITE_SORT = "USE TEMP B-TREE FOR ORDER BY"
+
+
+def query_plans(meeting):
+    """(label, queryset, boleh_sort) untuk query yang dipakai view; masing-masing harus memakai indeks."""
+    today = timezone.localdate()
+    return (
+        ("daftar rapat (keyset)", Meeting.objects.order_by("-created_at", "-meeting_id")[:26], False),
+        (
+            "daftar rapat per status/tanggal",
+            Meeting.objects.filter(status=Meeting.STATUS_ACTIVE, meeting_date__gte=today).order_by("-created_at", "-meeting_id")[:26],
+            True,
+        ),
+        ("daftar hadir satu rapat", Attendance.objects.filter(meeting=meeting).order_by("timestamp"), False),
+        ("riwayat satu NIP", Attendance.objects.filter(nip="000").order_by("-timestamp"), False),
+        ("absensi NIP di satu rapat", Attendance.objects.filter(meeting=meeting, nip="000"), False),
+        ("roster NIP di satu rapat", RosterEntry.objects.filter(meeting=meeting, nip="000"), False),
+        ("replay kunci idempoten", Attendance.objects.filter(idempotency_key__in=["abcdefgh"]), False),
+        ("autocomplete NIP", Participant.objects.search("1975"), False),
+        ("autocomplete nama", Participant.objects.search("budi"), False),
+    )
+
+
+def plan_problems(plan, allow_sort):
+    problems = []
+    if connection.vendor == "sqlite":
+        problems += [f"full scan {table}" for table in SQLITE_FULL_SCAN.findall(plan)]
+        if not allow_sort and SQLITE_SORT in plan:
+            problems.append("sort tanpa indeks")
+    elif connection.vendor == "postgresql":
+        problems += [f"full scan {table}" for table in re.findall(r"Seq Scan on (\w+)", plan)]
+        if not allow_sort and re.search(r"^\s*(->\s*)?Sort\b", plan, re.M):
+            problems.append("sort tanpa indeks")
+    return problems
+
+
+class QueryBudgetTests(TempMediaMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        now = timezone.now()
+        cls.meeting = Meeting.objects.create(
+            title="Cek query",
+            meeting_date=timezone.localdate(),
+            meeting_time=datetime.time(8, 0),
+            location="-",
+            leader="-",
+        )
+        Attendance.objects.bulk_create(
+            Attendance(
+                meeting=cls.meeting,
+                name=f"Peserta {index}",
+                nip=f"{index:018d}",
+                timestamp=now - datetime.timedelta(minutes=index),
+            )
+            for index in range(30)
+        )
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+
+    def test_views_stay_within_query_budget(self):
+        for name, args, query, budget in QUERY_BUDGETS:
+            url = reverse(name, args=[self.meeting.meeting_id if arg == "meeting" else arg for arg in args])
+            with self.subTest(name), self.assertNumQueries(budget):
+                response = self.client.get(f"{url}?{query}" if query else url)
+                self.assertEqual(response.status_code, 200)
+
+    @skipUnless(connection.vendor in ("sqlite", "postgresql"), "EXPLAIN hanya diperiksa di SQLite dan PostgreSQL")
+    def test_main_queries_use_indexes(self):
+        with connection.cursor() as cursor:
+            if connection.vendor == "postgresql":
+                # Tabel contoh kecil; paksa planner memilih indeks bila memang bisa dipakai
+                cursor.execute("SET LOCAL enable_seqscan = off")
+            else:
+                cursor.execute("ANALYZE")
+        for label, queryset, allow_sort in query_plans(self.meeting):
+            with self.subTest(label):
+                plan = queryset.explain()
+                self.assertEqual(plan_problems(plan, allow_sort), [], plan)
@@ -1,4 +1,5 @@
-from django.urls import path
+from django.conf import settings
+from django.urls import path, re_path
 
 from . import views
 
@@ -7,5 +8,18 @@ urlpatterns = [
     path("meetings/", views.meeting_list_create, name="meeting_list_create"),
     path("meetings/<uuid:meeting_id>/", views.meeting_detail, name="meeting_detail"),
     path("meetings/<uuid:meeting_id>/pdf/", views.meeting_pdf, name="meeting_pdf"),
-    path("a/<uuid:meeting_id>/", views.attendance_form_view, name="attendance_form"),
+    path("meetings/<uuid:meeting_id>/xlsx/", views.meeting_xlsx, name="meeting_xlsx"),
+    path("meetings/<uuid:meeting_id>/events/", views.meeting_events, name="meeting_events"),
+    path("meetings/<uuid:meeting_id>/roster/", views.meeting_roster_upload, name="meeting_roster_upload"),
+    re_path(r"^meetings/(?P<meeting_id>[0-9a-f-]{36})/qr\.(?P<fmt>png|svg)$", views.meeting_qr, name="meeting_qr"),
+    path(
+        "a/<uuid:meeting_id>/",
+        views.attendance_form_view_async if settings.ASYNC_ATTENDANCE else views.attendance_form_view,
+        name="attendance_form",
+    ),
+    path("participants/search/", views.participant_search, name="participant_search"),
+    path("api/meetings/<uuid:meeting_id>/attendances/", views.api_attendance_create, name="api_attendance_create"),
+    path("api/attendances/batch/", views.api_attendance_batch, name="api_attendance_batch"),
+    path("sw.js", views.service_worker, name="service_worker"),
+    re_path(r"^signatures/(?P<digest>[0-9a-f]{64})\.(?P<ext>png|strokes)$", views.signature_file, name="signature_file"),
 ]
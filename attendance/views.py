@@ -1,41 +1,134 @@
+import asyncio
 import base64
+import hashlib
+import json
+import os
+import tempfile
+import uuid
+from datetime import datetime
 from io import BytesIO
+from pathlib import Path
 
 import qrcode
+from asgiref.sync import sync_to_async
+from django.conf import settings
 from django.contrib import messages
-from django.db import IntegrityError
-from django.http import FileResponse
-from django.shortcuts import get_object_or_404, redirect, render
+from django.core.cache import cache
+from django.core.handlers.asgi import ASGIRequest
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Max, Q
+from django.http import FileResponse, Http404, HttpResponse, JsonResponse, StreamingHttpResponse
+from django.shortcuts import aget_object_or_404, get_object_or_404, redirect, render
 from django.urls import reverse
-from django.utils import timezone
+from django.utils import formats, timezone
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import etag, require_POST
 from fpdf import FPDF
+from qrcode.image.svg import SvgPathImage
 
-from .forms import AttendanceForm, MeetingForm
-from .models import Attendance, Meeting
+from signature_utils import STROKE_PREFIX, draw_strokes_pdf, render_strokes
+
+from . import live
+from .excel import write_meeting_workbook
+from .forms import AttendanceForm, MeetingFilterForm, MeetingForm, RosterUploadForm
+from .models import Attendance, Meeting, Participant, RosterEntry
+from .roster import RosterError, import_roster, read_roster
+from .storage import get_signature_storage, save_signature, signature_name
+from .submissions import (
+    CONFLICT,
+    CREATED,
+    DUPLICATE,
+    KEY_CONFLICT_ERRORS,
+    MAX_BATCH_SIZE,
+    REPLAYED,
+    build_submission,
+    check_attendance,
+    find_replays,
+    insert_submissions,
+    process_batch,
+    registered_name,
+    replay_status,
+    submitted_nip,
+    validate_submission,
+)
+
+
+QR_CONTENT_TYPES = {"png": "image/png", "svg": "image/svg+xml"}
+QR_DEFAULT_SIZE = 320
+QR_MAX_SIZE = 2048
+QR_CACHE_TIMEOUT = 60 * 60 * 24 * 30
 
 
 def build_absolute_url(request, path):
     return request.build_absolute_uri(path)
 
 
-def qrcode_for_meeting(request, meeting):
-    url = build_absolute_url(request, reverse("attendance_form", args=[meeting.meeting_id]))
-    qr = qrcode.QRCode(version=1, box_size=8, border=4)
+def attendance_url(request, meeting_id):
+    return build_absolute_url(request, reverse("attendance_form", args=[meeting_id]))
+
+
+def qr_size(request):
+    try:
+        size = int(request.GET.get("size", QR_DEFAULT_SIZE))
+    except ValueError:
+        size = QR_DEFAULT_SIZE
+    return min(max(size, 64), QR_MAX_SIZE)
+
+
+def qr_etag(request, meeting_id, fmt):
+    key = f"{attendance_url(request, meeting_id)}|{fmt}|{qr_size(request)}"
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+def render_qrcode(url, fmt, size):
+    qr = qrcode.QRCode(border=4)
     qr.add_data(url)
     qr.make(fit=True)
-    image = qr.make_image(fill_color="black", back_color="white")
+    qr.box_size = max(size // (qr.modules_count + 2 * qr.border), 1)
     buffer = BytesIO()
-    image.save(buffer, format="PNG")
-    buffer.seek(0)
-    return buffer, url
+    if fmt == "svg":
+        qr.make_image(image_factory=SvgPathImage).save(buffer)
+    else:
+        qr.make_image(fill_color="black", back_color="white").save(buffer, format="PNG")
+    return buffer.getvalue()
 
 
 def home(request):
     return redirect("meeting_list_create")
 
 
+MEETINGS_PER_PAGE = 25
+
+
+def encode_cursor(meeting):
+    raw = f"{meeting.created_at.isoformat()}|{meeting.meeting_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode("ascii")
+
+
+def decode_cursor(cursor):
+    try:
+        created_at, meeting_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(created_at), uuid.UUID(meeting_id)
+    except (ValueError, UnicodeDecodeError):
+        return None
+
+
+def keyset_page(queryset, cursor, size=MEETINGS_PER_PAGE):
+    """Satu halaman rapat terbaru sesudah ``cursor`` (created_at, meeting_id), tanpa OFFSET/COUNT."""
+    queryset = queryset.order_by("-created_at", "-meeting_id")
+    position = decode_cursor(cursor) if cursor else None
+    if position:
+        created_at, meeting_id = position
+        queryset = queryset.filter(
+            Q(created_at__lt=created_at) | Q(created_at=created_at, meeting_id__lt=meeting_id)
+        )
+    rows = list(queryset[: size + 1])
+    next_cursor = encode_cursor(rows[size - 1]) if len(rows) > size else None
+    return rows[:size], next_cursor
+
+
 def meeting_list_create(request):
-    meetings = Meeting.objects.all()
     form = MeetingForm(request.POST or None)
 
     if request.method == "POST" and form.is_valid():
@@ -43,14 +136,37 @@ def meeting_list_create(request):
         messages.success(request, f"Rapat dibuat: {meeting.meeting_id}")
         return redirect("meeting_detail", meeting_id=meeting.meeting_id)
 
-    return render(request, "attendance/meeting_list.html", {"meetings": meetings, "form": form})
+    filter_form = MeetingFilterForm(request.GET or None)
+    meetings = filter_form.filter(Meeting.objects.all())
+    meetings, next_cursor = keyset_page(meetings, request.GET.get("cursor"))
+
+    next_query = None
+    if next_cursor:
+        params = request.GET.copy()
+        params["cursor"] = next_cursor
+        next_query = params.urlencode()
+    first_query = None
+    if "cursor" in request.GET:
+        params = request.GET.copy()
+        del params["cursor"]
+        first_query = params.urlencode()
+
+    return render(
+        request,
+        "attendance/meeting_list.html",
+        {
+            "meetings": meetings,
+            "form": form,
+            "filter_form": filter_form,
+            "next_query": next_query,
+            "first_query": first_query,
+        },
+    )
 
 
 def meeting_detail(request, meeting_id):
     meeting = get_object_or_404(Meeting, meeting_id=meeting_id)
-    attendances = meeting.attendances.order_by("timestamp")
-    qr_buffer, qr_url = qrcode_for_meeting(request, meeting)
-    qr_data_uri = base64.b64encode(qr_buffer.getvalue()).decode("ascii")
+    attendances = list(meeting.attendances.order_by("timestamp").only("id", "meeting_id", "name", "nip", "timestamp"))
 
     return render(
         request,
@@ -58,9 +174,144 @@ def meeting_detail(request, meeting_id):
         {
             "meeting": meeting,
             "attendances": attendances,
-            "attendance_count": attendances.count(),
-            "qr_url": qr_url,
-            "qr_data_uri": qr_data_uri,
+            "last_attendance_id": max((attendance.id for attendance in attendances), default=0),
+            "roster_count": meeting.roster.count(),
+            "roster_form": RosterUploadForm(),
+            "qr_url": attendance_url(request, meeting.meeting_id),
+        },
+    )
+
+
+# Feed absensi live (SSE): satu koneksi per admin menggantikan reload halaman detail
+EVENTS_POLL_INTERVAL = 5
+EVENTS_MAX_DURATION = 30 * 60
+EVENTS_RETRY_MS = 3000
+
+
+def attendance_event(attendance):
+    data = {
+        "id": attendance["id"],
+        "name": attendance["name"],
+        "nip": attendance["nip"],
+        "timestamp": formats.date_format(timezone.localtime(attendance["timestamp"]), "DATETIME_FORMAT"),
+    }
+    return f"id: {attendance['id']}\nevent: attendance\ndata: {json.dumps(data)}\n\n"
+
+
+async def new_attendances(meeting_id, after):
+    queryset = Attendance.objects.filter(meeting_id=meeting_id, id__gt=after).order_by("id")
+    return [attendance async for attendance in queryset.values("id", "name", "nip", "timestamp")]
+
+
+def close_connection():
+    connection.close()
+
+
+def event_stream_response(content):
+    if isinstance(content, str):
+        response = HttpResponse(content, content_type="text/event-stream")
+    else:
+        response = StreamingHttpResponse(content, content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    # Matikan buffering proxy (nginx/Render) agar event langsung sampai
+    response["X-Accel-Buffering"] = "no"
+    return response
+
+
+async def meeting_events(request, meeting_id):
+    if not await Meeting.objects.filter(meeting_id=meeting_id).aexists():
+        raise Http404("Rapat tidak ditemukan.")
+    try:
+        after = int(request.headers.get("Last-Event-ID") or request.GET.get("after") or 0)
+    except ValueError:
+        after = 0
+
+    if not isinstance(request, ASGIRequest):
+        # Worker WSGI tidak boleh ditahan stream: kirim absensi baru lalu tutup, EventSource
+        # tersambung lagi setelah ``retry`` (long-poll). Di ASGI stream tetap terbuka.
+        rows = await new_attendances(meeting_id, after)
+        return event_stream_response(
+            f"retry: {EVENTS_POLL_INTERVAL * 1000}\n\n" + "".join(attendance_event(row) for row in rows)
+        )
+
+    async def stream():
+        nonlocal after
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + EVENTS_MAX_DURATION
+        yield f"retry: {EVENTS_RETRY_MS}\n\n"
+        while loop.time() < deadline:
+            rows = await new_attendances(meeting_id, after)
+            # Koneksi baru dilepas saat response selesai; kembalikan ke pool selama menunggu
+            await sync_to_async(close_connection)()
+            for row in rows:
+                after = row["id"]
+                yield attendance_event(row)
+            if not rows:
+                yield ": ping\n\n"
+            await live.wait_for_change(meeting_id, EVENTS_POLL_INTERVAL)
+
+    return event_stream_response(stream())
+
+
+ROSTER_ERRORS_SHOWN = 10
+
+
+def meeting_roster_upload(request, meeting_id):
+    meeting = get_object_or_404(Meeting, meeting_id=meeting_id)
+    if request.method != "POST":
+        return redirect("meeting_detail", meeting_id=meeting.meeting_id)
+
+    form = RosterUploadForm(request.POST, request.FILES)
+    if not form.is_valid():
+        for error in form.errors.get("file", []):
+            messages.error(request, error)
+        return redirect("meeting_detail", meeting_id=meeting.meeting_id)
+
+    upload = form.cleaned_data["file"]
+    try:
+        report = import_roster(meeting, read_roster(upload, upload.name))
+    except RosterError as exc:
+        messages.error(request, str(exc))
+        return redirect("meeting_detail", meeting_id=meeting.meeting_id)
+
+    messages.success(request, f"Roster diimpor: {report}.")
+    for number, message in report.invalid[:ROSTER_ERRORS_SHOWN]:
+        messages.warning(request, f"Baris {number}: {message}")
+    if len(report.invalid) > ROSTER_ERRORS_SHOWN:
+        messages.warning(request, f"... dan {len(report.invalid) - ROSTER_ERRORS_SHOWN} baris tidak valid lainnya.")
+    return redirect("meeting_detail", meeting_id=meeting.meeting_id)
+
+
+async def aregistered_name(meeting, nip):
+    return (
+        await RosterEntry.objects.filter(meeting=meeting, nip=nip).values_list("name", flat=True).afirst()
+        or await Participant.objects.filter(nip=nip).values_list("name", flat=True).afirst()
+    )
+
+
+def create_attendance(meeting, name, nip, signature):
+    # Penghitung di Meeting (signals.py) ikut dalam transaksi yang sama
+    with transaction.atomic():
+        return Attendance.objects.create(
+            meeting=meeting,
+            name=name,
+            nip=nip,
+            timestamp=timezone.now(),
+            signature=save_signature(signature),
+            signature_phash=signature.phash,
+        )
+
+
+def render_attendance_form(request, meeting, form):
+    return render(
+        request,
+        "attendance/attendance_form.html",
+        {
+            "meeting": meeting,
+            "form": form,
+            "signature_format": settings.SIGNATURE_FORMAT,
+            "signature_max_bytes": settings.SIGNATURE_MAX_BYTES,
+            **offline_queue_context(),
         },
     )
 
@@ -70,26 +321,182 @@ def attendance_form_view(request, meeting_id):
     form = AttendanceForm(request.POST or None)
 
     if request.method == "POST" and form.is_valid():
-        name = form.cleaned_data["name"].strip()
         nip = form.cleaned_data["nip"].strip()
-        signature_base64 = form.cleaned_data.get("signature_base64", "")
-
-        if not signature_base64:
-            form.add_error(None, "Tanda tangan wajib diisi.")
-        else:
+        name = registered_name(meeting, nip) or form.cleaned_data["name"].strip()
+        signature = form.cleaned_data.get("signature_base64")
+        if check_attendance(form, name, signature):
             try:
-                Attendance.objects.create(
-                    meeting=meeting,
-                    name=name,
-                    nip=nip,
-                    timestamp=timezone.now(),
-                    signature_base64=signature_base64,
-                )
+                create_attendance(meeting, name, nip, signature)
                 return render(request, "attendance/attendance_success.html", {"meeting": meeting})
             except IntegrityError:
                 form.add_error(None, "NIP ini sudah absen untuk rapat ini.")
 
-    return render(request, "attendance/attendance_form.html", {"meeting": meeting, "form": form})
+    return render_attendance_form(request, meeting, form)
+
+
+async def attendance_form_view_async(request, meeting_id):
+    """Versi ASGI attendance_form_view: query lewat ORM async, kerja blocking di thread.
+
+    Validasi TTD (decode/resize PNG) dijalankan di thread pool agar event loop tetap
+    melayani submission lain; insert tetap satu transaksi bersama penghitung rapat.
+    """
+    meeting = await aget_object_or_404(Meeting, meeting_id=meeting_id)
+    form = AttendanceForm(request.POST or None)
+
+    if request.method == "POST" and await sync_to_async(form.is_valid, thread_sensitive=False)():
+        nip = form.cleaned_data["nip"].strip()
+        name = await aregistered_name(meeting, nip) or form.cleaned_data["name"].strip()
+        signature = form.cleaned_data.get("signature_base64")
+        if check_attendance(form, name, signature):
+            try:
+                await sync_to_async(create_attendance)(meeting, name, nip, signature)
+                return await sync_to_async(render)(request, "attendance/attendance_success.html", {"meeting": meeting})
+            except IntegrityError:
+                form.add_error(None, "NIP ini sudah absen untuk rapat ini.")
+
+    # Render di thread: context processor (messages, user) bisa memuat session dari database
+    return await sync_to_async(render_attendance_form)(request, meeting, form)
+
+
+def parse_json(request):
+    try:
+        return json.loads(request.body)
+    except (UnicodeDecodeError, ValueError):
+        return None
+
+
+@csrf_exempt
+@require_POST
+async def api_attendance_create(request, meeting_id):
+    """Absensi lewat JSON: {"nip", "name", "signature"} dengan header Idempotency-Key.
+
+    Kiriman ulang dengan kunci yang sama dijawab dari baris yang sudah tersimpan
+    (200, header Idempotent-Replayed) tanpa validasi TTD maupun query tulis; kunci
+    yang sudah dipakai untuk rapat lain ditolak dengan 422.
+    """
+    meeting = await Meeting.objects.filter(meeting_id=meeting_id).only("meeting_id").afirst()
+    if meeting is None:
+        return JsonResponse({"error": "Rapat tidak ditemukan."}, status=404)
+    data = parse_json(request)
+    if not isinstance(data, dict):
+        return JsonResponse({"error": "Body harus berupa objek JSON."}, status=400)
+    key = request.headers.get("Idempotency-Key") or data.get("idempotency_key")
+
+    if isinstance(key, str):
+        replay = (await sync_to_async(find_replays)([key])).get(key)
+        if replay is not None:
+            if replay_status(replay, meeting.meeting_id) == CONFLICT:
+                return JsonResponse({"errors": KEY_CONFLICT_ERRORS}, status=422)
+            response = JsonResponse(replay)
+            response["Idempotent-Replayed"] = "true"
+            return response
+
+    # Hanya validasi TTD (Pillow) yang ke thread pool; query nama terdaftar lewat ORM async
+    form, errors = await sync_to_async(validate_submission, thread_sensitive=False)(key, data)
+    if errors:
+        return JsonResponse({"errors": errors}, status=400)
+    registered = await aregistered_name(meeting, submitted_nip(form))
+    submission, errors = build_submission(meeting, key, form, registered)
+    if errors:
+        return JsonResponse({"errors": errors}, status=400)
+    status, payload = (await sync_to_async(insert_submissions)([submission]))[key]
+    if status == DUPLICATE:
+        return JsonResponse({"error": "NIP ini sudah absen untuk rapat ini."}, status=409)
+    if status == CONFLICT:
+        return JsonResponse({"errors": KEY_CONFLICT_ERRORS}, status=422)
+    response = JsonResponse(payload, status=201 if status == CREATED else 200)
+    if status == REPLAYED:
+        response["Idempotent-Replayed"] = "true"
+    return response
+
+
+@csrf_exempt
+@require_POST
+async def api_attendance_batch(request):
+    """Antrean absensi offline dari service worker: {"items": [...]}, maksimal MAX_BATCH_SIZE.
+
+    Selalu 200 dengan hasil per item (created/replayed/duplicate/invalid) agar klien
+    bisa menghapus item yang sudah final dari antreannya; 400 hanya untuk body rusak.
+    """
+    data = parse_json(request)
+    items = data.get("items") if isinstance(data, dict) else None
+    if not isinstance(items, list) or not items:
+        return JsonResponse({"error": "Body harus berupa objek JSON dengan daftar items."}, status=400)
+    if len(items) > MAX_BATCH_SIZE:
+        return JsonResponse({"error": f"Maksimal {MAX_BATCH_SIZE} absensi per batch."}, status=400)
+    # Batch membaca dan menulis database: harus di thread request (thread-sensitive) agar
+    # koneksinya ditutup di akhir request, bukan tertinggal di thread pool
+    results = await sync_to_async(process_batch)(items)
+    return JsonResponse({"results": results})
+
+
+OFFLINE_SYNC_TAG = "absensi-sync"
+
+
+def offline_queue_context():
+    # Antrean offline membagi batch per jumlah item dan per ukuran body request
+    return {
+        "sync_tag": OFFLINE_SYNC_TAG,
+        "batch_size": MAX_BATCH_SIZE,
+        "batch_max_bytes": settings.DATA_UPLOAD_MAX_MEMORY_SIZE,
+    }
+
+
+def service_worker(request):
+    # Disajikan dari root agar scope-nya mencakup semua halaman form absensi (/a/<id>/)
+    form_prefix = reverse("attendance_form", args=[uuid.UUID(int=0)]).rsplit("/", 2)[0] + "/"
+    response = render(
+        request,
+        "attendance/service_worker.js",
+        {"form_prefix": form_prefix, **offline_queue_context()},
+        content_type="application/javascript",
+    )
+    patch_cache_control(response, no_cache=True)
+    return response
+
+
+PARTICIPANT_SEARCH_MAX_AGE = 300
+
+
+def participant_search(request):
+    # Autocomplete form absensi: awalan NIP (angka) atau awalan nama, maksimal 10 hasil
+    results = list(Participant.objects.search(request.GET.get("q")).values("nip", "name", "position"))
+    response = JsonResponse({"results": results})
+    patch_cache_control(response, private=True, max_age=PARTICIPANT_SEARCH_MAX_AGE)
+    return response
+
+
+@etag(qr_etag)
+def meeting_qr(request, meeting_id, fmt):
+    # QR hanya bergantung pada URL absensi, format, dan ukuran; dibuat sekali lalu diambil dari cache
+    get_object_or_404(Meeting.objects.only("meeting_id"), meeting_id=meeting_id)
+    key = f"meeting-qr:{qr_etag(request, meeting_id, fmt)}"
+    data = cache.get(key)
+    if data is None:
+        data = render_qrcode(attendance_url(request, meeting_id), fmt, qr_size(request))
+        cache.set(key, data, QR_CACHE_TIMEOUT)
+    response = HttpResponse(data, content_type=QR_CONTENT_TYPES[fmt])
+    patch_cache_control(response, public=True, max_age=QR_CACHE_TIMEOUT)
+    patch_vary_headers(response, ["Host", "X-Forwarded-Proto"])
+    return response
+
+
+@etag(lambda request, digest, ext: digest)
+def signature_file(request, digest, ext):
+    # Nama file = hash isi, jadi URL tidak pernah berubah isi dan boleh di-cache selamanya
+    storage = get_signature_storage()
+    name = signature_name(digest, ext)
+    if not storage.exists(name):
+        raise Http404("Tanda tangan tidak ditemukan.")
+    with storage.open(name, "rb") as f:
+        data = f.read()
+    if ext == "strokes":
+        buffer = BytesIO()
+        render_strokes(STROKE_PREFIX + base64.b64encode(data).decode("ascii")).save(buffer, format="PNG")
+        data = buffer.getvalue()
+    response = HttpResponse(data, content_type="image/png")
+    patch_cache_control(response, public=True, max_age=31536000, immutable=True)
+    return response
 
 
 class MeetingPDF(FPDF):
@@ -99,9 +506,55 @@ class MeetingPDF(FPDF):
         self.ln(2)
 
 
-def meeting_pdf(request, meeting_id):
-    meeting = get_object_or_404(Meeting, meeting_id=meeting_id)
-    attendances = meeting.attendances.order_by("timestamp")
+PDF_CHUNK_SIZE = 100
+PDF_DIR = "pdf"
+PDF_COLUMNS = ((10, "No"), (55, "Nama"), (40, "NIP"), (40, "Waktu Absen"), (45, "Tanda Tangan"))
+PDF_ROW_HEIGHT = 15
+
+
+def meeting_pdf_version(meeting_id):
+    """Hash versi data PDF: berubah bila rapat diedit atau absensi ditambah/diubah/dihapus."""
+    meeting = (
+        Meeting.objects.filter(meeting_id=meeting_id)
+        .annotate(latest=Max("attendances__updated_at"))
+        .values("updated_at", "attendance_count", "latest")
+        .first()
+    )
+    if meeting is None:
+        return None
+    key = f"{meeting_id}|{meeting['updated_at'].isoformat()}|{meeting['attendance_count']}|{meeting['latest']}"
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+def _pdf_table_header(pdf):
+    pdf.set_font("Arial", "B", 9)
+    pdf.set_fill_color(200, 200, 200)
+    for width, label in PDF_COLUMNS:
+        pdf.cell(width, 7, label, 1, 0, "C", True)
+    pdf.ln()
+    pdf.set_font("Arial", "", 8)
+
+
+def _pdf_signature(pdf, storage, name, x, y, w, h):
+    if not name or not storage.exists(name):
+        return False
+    if name.endswith(".strokes"):
+        # Goresan rusak tidak menggagalkan seluruh PDF, selnya ditandai "-"
+        with storage.open(name, "rb") as f:
+            return draw_strokes_pdf(pdf, STROKE_PREFIX + base64.b64encode(f.read()).decode("ascii"), x, y, w, h)
+    else:
+        # Nama file = hash isi, jadi fpdf hanya menyematkan TTD yang sama sekali saja
+        pdf.image(storage.path(name), x=x, y=y, w=w, h=h)
+    return True
+
+
+def build_meeting_pdf(meeting):
+    storage = get_signature_storage()
+    attendances = (
+        meeting.attendances.order_by("timestamp")
+        .only("meeting_id", "name", "nip", "timestamp", "signature")
+        .iterator(chunk_size=PDF_CHUNK_SIZE)
+    )
 
     pdf = MeetingPDF()
     pdf.add_page()
@@ -113,11 +566,86 @@ def meeting_pdf(request, meeting_id):
     pdf.cell(0, 8, f"Lokasi: {meeting.location}", 0, 1)
     pdf.cell(0, 8, f"Pimpinan: {meeting.leader}", 0, 1)
     pdf.ln(4)
-    pdf.cell(0, 8, f"Daftar Hadir ({attendances.count()} peserta)", 0, 1)
+    pdf.cell(0, 8, f"Daftar Hadir ({meeting.attendance_count} peserta)", 0, 1)
+    _pdf_table_header(pdf)
 
+    signature_width = PDF_COLUMNS[-1][0]
     for index, attendance in enumerate(attendances, start=1):
-        pdf.cell(0, 7, f"{index}. {attendance.name} | {attendance.nip} | {attendance.timestamp}", 0, 1)
+        if pdf.get_y() + PDF_ROW_HEIGHT > pdf.page_break_trigger:
+            pdf.add_page()
+            _pdf_table_header(pdf)
+        timestamp = timezone.localtime(attendance.timestamp).strftime("%Y-%m-%d %H:%M:%S")
+        for (width, _), value in zip(PDF_COLUMNS, (str(index), attendance.name, attendance.nip, timestamp)):
+            pdf.cell(width, PDF_ROW_HEIGHT, value, 1, 0, "C" if width == 10 else "L")
+        x, y = pdf.get_x(), pdf.get_y()
+        drawn = _pdf_signature(pdf, storage, attendance.signature.name, x + 2, y + 1, signature_width - 4, PDF_ROW_HEIGHT - 2)
+        pdf.set_xy(x, y)
+        pdf.cell(signature_width, PDF_ROW_HEIGHT, "" if drawn else "-", 1, 1, "C")
+
+    return bytes(pdf.output())
+
+
+def open_meeting_pdf(meeting):
+    """PDF rapat untuk versi data saat ini sebagai file biner yang sudah dibuka.
+
+    Dibuat sekali per versi di MEDIA_ROOT/pdf/<meeting_id>/ dan dipakai bersama semua
+    worker; versi lama dihapus begitu versi baru ditulis.
+    """
+    directory = Path(settings.MEDIA_ROOT) / PDF_DIR / str(meeting.meeting_id)
+    path = directory / f"{meeting_pdf_version(meeting.meeting_id)}.pdf"
+    try:
+        return open(path, "rb")
+    except FileNotFoundError:
+        pass
+    directory.mkdir(parents=True, exist_ok=True)
+    fd, temp = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(build_meeting_pdf(meeting))
+        # Dibuka sebelum di-rename: tetap terbaca walau request lain menghapusnya sebagai versi lama
+        file = open(temp, "rb")
+        os.replace(temp, path)
+    except BaseException:
+        Path(temp).unlink(missing_ok=True)
+        raise
+    for old in directory.glob("*.pdf"):
+        if old != path:
+            old.unlink(missing_ok=True)
+    return file
+
+
+@etag(lambda request, meeting_id: meeting_pdf_version(meeting_id))
+def meeting_pdf(request, meeting_id):
+    meeting = get_object_or_404(Meeting, meeting_id=meeting_id)
+    response = FileResponse(
+        open_meeting_pdf(meeting),
+        as_attachment=True,
+        filename=f"notulensi_{meeting.meeting_id}.pdf",
+        content_type="application/pdf",
+    )
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
 
-    response = FileResponse(BytesIO(pdf.output(dest="S").encode("latin-1")), content_type="application/pdf")
-    response["Content-Disposition"] = f'attachment; filename="notulensi_{meeting.meeting_id}.pdf"'
+XLSX_CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+
+@etag(lambda request, meeting_id: meeting_pdf_version(meeting_id))
+def meeting_xlsx(request, meeting_id):
+    meeting = get_object_or_404(Meeting, meeting_id=meeting_id)
+    # Workbook ditulis ke file sementara lalu dialirkan per blok, tidak pernah utuh di memori
+    output = tempfile.TemporaryFile()
+    try:
+        write_meeting_workbook(meeting, output)
+    except BaseException:
+        output.close()
+        raise
+    output.seek(0)
+    response = FileResponse(
+        output,
+        as_attachment=True,
+        filename=f"daftar_hadir_{meeting.meeting_id}.xlsx",
+        content_type=XLSX_CONTENT_TYPE,
+    )
+    patch_cache_control(response, private=True, no_cache=True)
     return response
@@ -0,0 +1,110 @@
+"""Benchmark helper Google Sheets, PDF, dan Excel di app.py tanpa koneksi internet.
+
+Worksheet diganti ``FakeSpreadsheet`` in-memory (bisa diberi latency dan batas
+kuota per menit) sehingga jumlah request API ikut terukur.
+
+Contoh:
+    python -m benchmarks.bench_app_helpers --scales 100 1000 --json hasil.json
+    python -m benchmarks.bench_app_helpers --compare hasil.json
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from attendance.sheets import ABSENSI_HEADERS, ABSENSI_SHEET, FakeSpreadsheet  # noqa: E402
+from benchmarks.common import compare_with_baseline, make_signature_base64, measure, print_results  # noqa: E402
+
+DEFAULT_SCALES = (100, 1_000, 10_000, 50_000)
+PESERTA_PER_RAPAT = 200
+
+
+def build_absensi_rows(total_rows, signature):
+    rows = [ABSENSI_HEADERS]
+    for i in range(total_rows):
+        meeting = f"MTG{i // PESERTA_PER_RAPAT:06d}"
+        rows.append([meeting, f"Peserta {i}", f"{197501011998031000 + i}", "2026-01-02 08:00:00", signature])
+    return rows
+
+
+def build_peserta(signature_count):
+    return [
+        {
+            "Nama": f"Peserta {i}",
+            "NIP": f"{197501011998031000 + i}",
+            "Timestamp": "2026-01-02 08:00:00",
+            "Signature": make_signature_base64(seed=i),
+        }
+        for i in range(signature_count)
+    ]
+
+
+def record(results, name, spreadsheet, func, *args):
+    spreadsheet.calls.clear()
+    _, seconds, peak = measure(func, *args)
+    results[name] = {"seconds": seconds, "api_calls": spreadsheet.api_calls, "peak_mb": peak / 1_048_576}
+
+
+def run(scales, latency, quota_per_minute):
+    import pandas as pd
+
+    import app
+
+    results = {}
+    signature = make_signature_base64()
+    for scale in scales:
+        spreadsheet = FakeSpreadsheet(latency=latency, quota_per_minute=quota_per_minute)
+        worksheet = spreadsheet.seed(ABSENSI_SHEET, build_absensi_rows(scale, signature))
+        record(results, f"read_sheet_as_dataframe[{scale}]", spreadsheet,
+               app.read_sheet_as_dataframe, worksheet, ABSENSI_HEADERS)
+
+        last_meeting = f"MTG{(scale - 1) // PESERTA_PER_RAPAT:06d}"
+        record(results, f"delete_rows_by_meeting_id[{scale}]", spreadsheet,
+               app.delete_rows_by_meeting_id, worksheet, last_meeting)
+
+    peserta = build_peserta(PESERTA_PER_RAPAT)
+    data_rapat = {
+        "meeting_id": "MTG000000",
+        "judul": "Rapat Koordinasi",
+        "tanggal": "02-01-2026",
+        "waktu": "08:00",
+        "lokasi": "Ruang Guru",
+        "pimpinan": "Kepala Sekolah",
+    }
+    empty = FakeSpreadsheet()
+    record(results, f"generate_pdf[{PESERTA_PER_RAPAT} ttd]", empty,
+           app.generate_pdf, data_rapat, peserta, "Isi notulensi rapat.")
+    record(results, f"generate_excel_daftar_hadir[{PESERTA_PER_RAPAT} ttd]", empty,
+           app.generate_excel_daftar_hadir, pd.DataFrame(peserta), "MTG000000")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scales", type=int, nargs="+", default=list(DEFAULT_SCALES))
+    parser.add_argument("--latency", type=float, default=0.0, help="Latency buatan per request API (detik).")
+    parser.add_argument("--quota-per-minute", type=int, default=None, help="Batas request per menit (error 429).")
+    parser.add_argument("--json", help="Simpan hasil ke file JSON untuk dijadikan baseline.")
+    parser.add_argument("--compare", help="Bandingkan dengan baseline JSON; exit 1 bila ada regresi.")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Toleransi waktu/memori relatif (default 0.25).")
+    args = parser.parse_args()
+
+    results = run(args.scales, args.latency, args.quota_per_minute)
+    print_results(results)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    if args.compare:
+        regressions = compare_with_baseline(results, args.compare, args.tolerance)
+        for line in regressions:
+            print(f"REGRESI: {line}")
+        sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+"""Benchmark lonjakan submission form absensi: view sync vs async (attendance.views).
+
+Mensimulasikan N peserta yang scan QR bersamaan. Jalur sync dilayani oleh
+``--workers`` thread (seperti worker gunicorn sync), jalur async oleh satu event
+loop (seperti satu worker Uvicorn). ``--db-latency`` menambahkan jeda per query
+untuk meniru PostgreSQL di jaringan, bukan SQLite lokal. Data dibuat di rapat
+baru lalu dihapus.
+
+Contoh:
+    DATABASE_URL=sqlite:////tmp/bench.sqlite3 python manage.py migrate
+    DATABASE_URL=sqlite:////tmp/bench.sqlite3 python -m benchmarks.bench_attendance_burst --burst 100 --db-latency 5
+"""
+
+import argparse
+import asyncio
+import base64
+import datetime
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from pathlib import Path
+from urllib.parse import urlencode
+from wsgiref.util import setup_testing_defaults
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "webapp.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.db import connection  # noqa: E402
+from django.db.backends.signals import connection_created  # noqa: E402
+from django.core.handlers.asgi import ASGIHandler  # noqa: E402
+from django.core.handlers.wsgi import WSGIHandler  # noqa: E402
+from django.test import override_settings  # noqa: E402
+from django.urls import include, path  # noqa: E402
+
+from attendance import views  # noqa: E402
+from attendance.models import Meeting  # noqa: E402
+from benchmarks.common import make_signature_png  # noqa: E402
+
+urlpatterns = [
+    path("sync/<uuid:meeting_id>/", views.attendance_form_view),
+    path("async/<uuid:meeting_id>/", views.attendance_form_view_async),
+    path("", include("webapp.urls")),
+]
+
+
+def add_db_latency(seconds):
+    def delay(execute, sql, params, many, context):
+        # Di dalam transaksi SQLite memegang kunci tulis untuk seluruh database, sedangkan
+        # PostgreSQL tidak saling mengunci untuk insert baris berbeda; jeda hanya di luar transaksi
+        if not context["connection"].in_atomic_block:
+            time.sleep(seconds)
+        return execute(sql, params, many, context)
+
+    def install(sender, connection, **kwargs):
+        connection.execute_wrappers.append(delay)
+
+    connection_created.connect(install, weak=False)
+    if connection.connection is not None:
+        connection.execute_wrappers.append(delay)
+
+
+def submissions(burst, offset):
+    signature = "data:image/png;base64," + base64.b64encode(make_signature_png(seed=7)).decode()
+    return [
+        {"name": f"Peserta {i}", "nip": f"{197501011998031000 + offset + i}", "signature_base64": signature}
+        for i in range(burst)
+    ]
+
+
+CSRF_SECRET = "b" * 32
+
+
+def encode(data):
+    return urlencode({**data, "csrfmiddlewaretoken": CSRF_SECRET}).encode()
+
+
+def wsgi_post(handler, url, body, started):
+    environ = {
+        "REQUEST_METHOD": "POST",
+        "PATH_INFO": url,
+        "CONTENT_TYPE": "application/x-www-form-urlencoded",
+        "CONTENT_LENGTH": str(len(body)),
+        "HTTP_COOKIE": f"csrftoken={CSRF_SECRET}",
+        "wsgi.input": BytesIO(body),
+    }
+    setup_testing_defaults(environ)
+    status = []
+    result = handler(environ, lambda code, headers, exc_info=None: status.append(int(code.split()[0])))
+    b"".join(result)
+    result.close()
+    return time.perf_counter() - started, status[0]
+
+
+async def asgi_post(application, url, body, started):
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": url,
+        "raw_path": url.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [
+            (b"host", b"testserver"),
+            (b"content-type", b"application/x-www-form-urlencoded"),
+            (b"content-length", str(len(body)).encode()),
+            (b"cookie", f"csrftoken={CSRF_SECRET}".encode()),
+        ],
+        "client": ("127.0.0.1", 50000),
+        "server": ("testserver", 80),
+    }
+    messages = [{"type": "http.request", "body": body, "more_body": False}]
+    disconnected = asyncio.Event()
+    status = []
+
+    async def receive():
+        if messages:
+            return messages.pop()
+        await disconnected.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            status.append(message["status"])
+
+    await application(scope, receive, send)
+    disconnected.set()
+    return time.perf_counter() - started, status[0]
+
+
+def run_sync(meeting, payloads, workers):
+    # Server WSGI dengan N worker sync: paling banyak N submission diproses bersamaan
+    handler = WSGIHandler()
+    url = f"/sync/{meeting.meeting_id}/"
+    bodies = [encode(data) for data in payloads]
+    started = time.perf_counter()
+    with ThreadPoolExecutor(workers) as pool:
+        return list(pool.map(lambda body: wsgi_post(handler, url, body, started), bodies))
+
+
+async def run_async(meeting, payloads):
+    # Satu worker ASGI: semua submission diterima sekaligus oleh event loop
+    application = ASGIHandler()
+    url = f"/async/{meeting.meeting_id}/"
+    bodies = [encode(data) for data in payloads]
+    started = time.perf_counter()
+    return await asyncio.gather(*(asgi_post(application, url, body, started) for body in bodies))
+
+
+def report(label, results, elapsed):
+    latencies = sorted(latency for latency, _ in results)
+    ok = sum(1 for _, status in results if status == 200)
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    print(
+        f"{label:<22} {ok:>4}/{len(results):<4} {elapsed:>8.2f} {len(results) / elapsed:>8.1f} "
+        f"{statistics.median(latencies) * 1000:>8.0f} {p95 * 1000:>8.0f}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--burst", type=int, default=100)
+    parser.add_argument("--workers", type=int, default=3, help="Jumlah worker sync (default 3).")
+    parser.add_argument("--db-latency", type=float, default=0.0, help="Jeda tambahan per query (ms).")
+    args = parser.parse_args()
+
+    if args.db_latency:
+        add_db_latency(args.db_latency / 1000)
+
+    meeting = Meeting.objects.create(
+        title="Bench burst",
+        meeting_date=datetime.date.today(),
+        meeting_time=datetime.time(8, 0),
+        location="-",
+        leader="-",
+    )
+    print(f"{'jalur':<22} {'sukses':>9} {'detik':>8} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8}")
+    try:
+        with override_settings(ROOT_URLCONF=sys.modules[__name__]):
+            payloads = submissions(args.burst, 0)
+            started = time.perf_counter()
+            results = run_sync(meeting, payloads, args.workers)
+            report(f"sync ({args.workers} worker)", results, time.perf_counter() - started)
+
+            payloads = submissions(args.burst, args.burst)
+            started = time.perf_counter()
+            results = asyncio.run(run_async(meeting, payloads))
+            report("async (1 event loop)", results, time.perf_counter() - started)
+    finally:
+        meeting.delete()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""Benchmark ekspor Excel daftar hadir (attendance.excel) dengan gambar TTD.
+
+Absensi dibuat di dalam transaksi yang dibatalkan dan file TTD ditulis ke
+MEDIA_ROOT sementara, jadi database dan media tidak berubah. Puncak memori
+(tracemalloc) naik linear dengan jumlah peserta, sekitar 8 KB per gambar TTD
+(objek drawing openpyxl): kira-kira 1 MB untuk 100 peserta dan 8 MB untuk 1000.
+
+Contoh:
+    DATABASE_URL=sqlite:////tmp/bench.sqlite3 python manage.py migrate
+    DATABASE_URL=sqlite:////tmp/bench.sqlite3 python -m benchmarks.bench_excel_export --rows 100 1000
+"""
+
+import argparse
+import datetime
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "webapp.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.db import transaction  # noqa: E402
+from django.test import override_settings  # noqa: E402
+from django.utils import timezone  # noqa: E402
+
+from attendance.excel import write_meeting_workbook  # noqa: E402
+from attendance.models import Attendance, Meeting  # noqa: E402
+from attendance.storage import save_signature  # noqa: E402
+from attendance.signatures import normalize_signature  # noqa: E402
+from benchmarks.common import make_signature_base64  # noqa: E402
+from signature_utils import encode_strokes  # noqa: E402
+
+
+class Rollback(Exception):
+    pass
+
+
+def make_signatures(count):
+    # Separuh PNG, separuh goresan (dirender saat ekspor)
+    for seed in range(count):
+        if seed % 2:
+            yield encode_strokes([[(10 + seed % 50, 20), (120, 80 - seed % 40), (250, 30)]], 300, 100, 25)
+        else:
+            yield make_signature_base64(seed)
+
+
+def run(rows, signatures):
+    try:
+        with transaction.atomic():
+            meeting = Meeting.objects.create(
+                title="Bench Excel",
+                meeting_date=datetime.date.today(),
+                meeting_time=datetime.time(8, 0),
+                location="-",
+                leader="-",
+            )
+            now = timezone.now()
+            Attendance.objects.bulk_create(
+                Attendance(
+                    meeting=meeting,
+                    name=f"Peserta {i}",
+                    nip=f"{197501011998031000 + i}",
+                    timestamp=now + datetime.timedelta(seconds=i),
+                    signature=signatures[i % len(signatures)],
+                )
+                for i in range(rows)
+            )
+            with tempfile.TemporaryFile() as output:
+                tracemalloc.start()
+                started = time.perf_counter()
+                write_meeting_workbook(meeting, output)
+                elapsed = time.perf_counter() - started
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                size = output.tell()
+            raise Rollback
+    except Rollback:
+        pass
+    return elapsed, peak, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[100, 1000])
+    parser.add_argument("--unique", type=int, default=200, help="jumlah TTD berbeda")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as media, override_settings(MEDIA_ROOT=media):
+        signatures = [save_signature(normalize_signature(value)) for value in make_signatures(args.unique)]
+        print(f"{'peserta':>8} {'detik':>7} {'puncak memori (MB)':>19} {'ukuran (KB)':>12}")
+        for rows in args.rows:
+            elapsed, peak, size = run(rows, signatures)
+            print(f"{rows:>8} {elapsed:>7.2f} {peak / 2**20:>19.1f} {size / 1024:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Benchmark impor roster CSV/XLSX (attendance.roster) ke database yang dikonfigurasi.
+
+Data dibuat di dalam transaksi yang dibatalkan, jadi database tidak berubah.
+Target: roster 10.000 baris dalam beberapa detik.
+
+Contoh:
+    DATABASE_URL=sqlite:////tmp/bench.sqlite3 python manage.py migrate
+    DATABASE_URL=sqlite:////tmp/bench.sqlite3 python -m benchmarks.bench_roster_import --rows 10000
+"""
+
+import argparse
+import datetime
+import os
+import sys
+import time
+from io import BytesIO, StringIO
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "webapp.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.core.files.uploadedfile import SimpleUploadedFile  # noqa: E402
+from django.db import transaction  # noqa: E402
+from openpyxl import Workbook  # noqa: E402
+
+from attendance.models import Meeting  # noqa: E402
+from attendance.roster import import_roster, read_roster  # noqa: E402
+
+
+class Rollback(Exception):
+    pass
+
+
+def build_rows(count):
+    rows = [("NIP", "Nama", "Jabatan")]
+    for i in range(count):
+        rows.append((f"{197501011998031000 + i}", f"Peserta {i}", "Guru"))
+    # Sebagian kecil baris bermasalah: NIP ganda dan NIP bukan angka
+    rows += [rows[1], ("12-AB", "Salah", "")]
+    return rows
+
+
+def build_csv(rows):
+    buffer = StringIO()
+    for row in rows:
+        buffer.write(";".join(row) + "\n")
+    return buffer.getvalue().encode("utf-8-sig")
+
+
+def build_xlsx(rows):
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    for row in rows:
+        sheet.append(row)
+    buffer = BytesIO()
+    workbook.save(buffer)
+    return buffer.getvalue()
+
+
+def run(filename, data):
+    upload = SimpleUploadedFile(filename, data)
+    try:
+        with transaction.atomic():
+            meeting = Meeting.objects.create(
+                title="Bench roster",
+                meeting_date=datetime.date.today(),
+                meeting_time=datetime.time(8, 0),
+                location="-",
+                leader="-",
+            )
+            started = time.perf_counter()
+            report = import_roster(meeting, read_roster(upload, filename))
+            elapsed = time.perf_counter() - started
+            raise Rollback
+    except Rollback:
+        pass
+    return report, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10_000)
+    args = parser.parse_args()
+
+    rows = build_rows(args.rows)
+    print(f"{'format':<6} {'ukuran (KB)':>11} {'detik':>7} {'baris/detik':>12}  hasil")
+    for filename, data in (("roster.csv", build_csv(rows)), ("roster.xlsx", build_xlsx(rows))):
+        report, elapsed = run(filename, data)
+        print(f"{filename[7:]:<6} {len(data) / 1024:>11.1f} {elapsed:>7.2f} {len(rows) / elapsed:>12.0f}  {report}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Benchmark validasi + normalisasi TTD di attendance_form_view (attendance.signatures).
+
+Mengukur waktu per submission untuk TTD kanvas ukuran HP (devicePixelRatio 3),
+kanvas desktop, hasil normalisasi di browser, dan format goresan. Target:
+beberapa milidetik per submission.
+
+Contoh:
+    python -m benchmarks.bench_signature_pipeline --repeat 200
+"""
+
+import argparse
+import base64
+import os
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "webapp.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from attendance.signatures import normalize_signature  # noqa: E402
+from benchmarks.common import make_signature_png  # noqa: E402
+from signature_utils import encode_strokes  # noqa: E402
+
+MAX_BYTES = 10_000_000
+
+
+def build_cases():
+    phone = make_signature_png(seed=1, size=(2040, 660))
+    desktop = make_signature_png(seed=2, size=(680, 220))
+    browser = make_signature_png(seed=3, size=(600, 200))
+    strokes = encode_strokes(
+        [[(40 + i * 3, 100 + (i * 7) % 60) for i in range(150)], [(60, 60), (400, 150)]], 680, 220
+    )
+    return {
+        "png_hp_2040x660": "data:image/png;base64," + base64.b64encode(phone).decode(),
+        "png_desktop_680x220": "data:image/png;base64," + base64.b64encode(desktop).decode(),
+        "png_browser_600x200": "data:image/png;base64," + base64.b64encode(browser).decode(),
+        "strokes": strokes,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=100)
+    args = parser.parse_args()
+
+    print(f"{'kasus':<24} {'input (KB)':>10} {'hasil (KB)':>10} {'ms/TTD':>8}")
+    for name, value in build_cases().items():
+        signature = normalize_signature(value, max_bytes=MAX_BYTES)
+        started = time.perf_counter()
+        for _ in range(args.repeat):
+            normalize_signature(value, max_bytes=MAX_BYTES)
+        elapsed = (time.perf_counter() - started) / args.repeat
+        print(f"{name:<24} {len(value) / 1024:>10.1f} {len(signature.data) / 1024:>10.1f} {elapsed * 1000:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
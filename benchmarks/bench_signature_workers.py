@@ -0,0 +1,77 @@
+"""Benchmark skala waktu export PDF/Excel terhadap jumlah worker penyiapan gambar TTD.
+
+Setiap percobaan memakai ``SignatureCache`` baru sehingga semua TTD benar-benar
+di-decode dan di-resize ulang.
+
+Contoh:
+    python -m benchmarks.bench_signature_workers --peserta 300 --workers 1 2 4 8
+    python -m benchmarks.bench_signature_workers --executor process
+"""
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from benchmarks.bench_app_helpers import build_peserta  # noqa: E402
+from benchmarks.common import measure  # noqa: E402
+from signature_utils import SignatureCache  # noqa: E402
+
+
+def default_workers():
+    cores = os.cpu_count() or 1
+    counts = [1]
+    while counts[-1] * 2 <= cores:
+        counts.append(counts[-1] * 2)
+    if counts[-1] != cores:
+        counts.append(cores)
+    return counts
+
+
+def run(peserta_count, worker_counts, executor):
+    import pandas as pd
+
+    import app
+
+    peserta = build_peserta(peserta_count)
+    df = pd.DataFrame(peserta)
+    data_rapat = {
+        "meeting_id": "MTG000000",
+        "judul": "Rapat Koordinasi Se-Kecamatan",
+        "tanggal": "02-01-2026",
+        "waktu": "08:00",
+        "lokasi": "Aula Kecamatan",
+        "pimpinan": "Koordinator Wilayah",
+    }
+
+    results = {}
+    for workers in worker_counts:
+        _, pdf_seconds, _ = measure(app.generate_pdf, data_rapat, peserta, "Isi notulensi rapat.",
+                                    cache=SignatureCache(), workers=workers, executor=executor)
+        _, excel_seconds, _ = measure(app.generate_excel_daftar_hadir, df, "MTG000000",
+                                      cache=SignatureCache(), workers=workers, executor=executor)
+        results[workers] = {"pdf": pdf_seconds, "excel": excel_seconds}
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--peserta", type=int, default=300, help="Jumlah peserta (TTD) per export.")
+    parser.add_argument("--workers", type=int, nargs="+", default=default_workers())
+    parser.add_argument("--executor", choices=("thread", "process"), default="thread")
+    args = parser.parse_args()
+
+    results = run(args.peserta, args.workers, args.executor)
+    base = results[args.workers[0]]
+    print(f"{os.cpu_count()} core, {args.peserta} TTD, executor={args.executor}")
+    print(f"{'worker':>6} {'PDF (s)':>10} {'speedup':>8} {'Excel (s)':>10} {'speedup':>8}")
+    for workers, row in results.items():
+        print(f"{workers:>6} {row['pdf']:>10.3f} {base['pdf'] / row['pdf']:>7.2f}x "
+              f"{row['excel']:>10.3f} {base['excel'] / row['excel']:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Utilitas bersama untuk benchmark: data sintetis, pengukuran, dan perbandingan baseline."""
+
+import base64
+import json
+import random
+import time
+import tracemalloc
+from io import BytesIO
+
+from PIL import Image, ImageDraw
+
+
+def make_signature_png(seed=0, size=(600, 200)):
+    """Buat PNG tanda tangan sintetis seperti hasil st_canvas (RGBA, latar putih)."""
+    rng = random.Random(seed)
+    img = Image.new("RGBA", size, (255, 255, 255, 255))
+    draw = ImageDraw.Draw(img)
+    x, y = rng.randint(40, 120), rng.randint(60, 140)
+    for _ in range(40):
+        nx = min(size[0] - 20, max(20, x + rng.randint(-25, 35)))
+        ny = min(size[1] - 20, max(20, y + rng.randint(-30, 30)))
+        draw.line((x, y, nx, ny), fill=(0, 0, 0, 255), width=3)
+        x, y = nx, ny
+    buffer = BytesIO()
+    img.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def make_signature_base64(seed=0):
+    return base64.b64encode(make_signature_png(seed)).decode()
+
+
+def measure(func, *args, **kwargs):
+    """Jalankan ``func`` sekali; kembalikan (hasil, detik, puncak memori dalam byte)."""
+    tracemalloc.start()
+    started = time.perf_counter()
+    try:
+        result = func(*args, **kwargs)
+        elapsed = time.perf_counter() - started
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def print_results(results):
+    print(f"{'kasus':<44} {'waktu (s)':>10} {'API':>7} {'memori (MB)':>12}")
+    for name, row in results.items():
+        print(f"{name:<44} {row['seconds']:>10.3f} {row['api_calls']:>7} {row['peak_mb']:>12.1f}")
+
+
+def compare_with_baseline(results, baseline_path, tolerance):
+    """Kembalikan daftar regresi terhadap file JSON baseline hasil ``--json``."""
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = json.load(f)
+    regressions = []
+    for name, row in results.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        if row["api_calls"] > base["api_calls"]:
+            regressions.append(f"{name}: API {base['api_calls']} -> {row['api_calls']}")
+        for metric in ("seconds", "peak_mb"):
+            if base[metric] and row[metric] > base[metric] * (1 + tolerance):
+                regressions.append(f"{name}: {metric} {base[metric]:.3f} -> {row[metric]:.3f}")
+    return regressions
@@ -0,0 +1,468 @@
+"""
+Pengolahan tanda tangan dari kanvas untuk app.py.
+
+Kanvas st_canvas menghasilkan array RGBA 600x200 yang sebagian besar berisi
+piksel kosong. Modul ini mendeteksi piksel tinta secara vektor dengan NumPy,
+memotong ke area tanda tangan, mengubahnya ke 4 tingkat abu-abu (atau 1-bit), lalu
+menyimpan sebagai PNG teroptimasi agar muat di satu sel Google Sheets.
+"""
+
+import base64
+import binascii
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from io import BytesIO
+
+import numpy as np
+from PIL import Image
+
+# Piksel dengan kecerahan di bawah nilai ini (setelah digabung ke latar putih) dianggap tinta
+INK_LUMA_THRESHOLD = 200
+# Minimal proporsi piksel tinta agar kanvas tidak dianggap kosong
+MIN_INK_COVERAGE = 0.001
+# Batas karakter per sel Google Sheets
+SHEETS_CELL_LIMIT = 50000
+CROP_PADDING = 6
+# Rasio lebar:tinggi hasil crop, sama dengan kanvas agar PDF/Excel tidak gepeng
+SIGNATURE_ASPECT = 3.0
+
+
+def to_grayscale(image_data):
+    """Gabungkan RGBA ke latar putih dan kembalikan array kecerahan uint8"""
+    arr = np.asarray(image_data)
+    if arr.ndim == 2:
+        return arr.astype(np.uint8)
+    rgb = arr[..., :3].astype(np.uint32)
+    luma = (rgb[..., 0] * 299 + rgb[..., 1] * 587 + rgb[..., 2] * 114) // 1000
+    if arr.shape[2] == 4:
+        alpha = arr[..., 3].astype(np.uint32)
+        luma = 255 - (alpha * (255 - luma)) // 255
+    return luma.astype(np.uint8)
+
+
+def ink_mask(image_data):
+    return to_grayscale(image_data) < INK_LUMA_THRESHOLD
+
+
+def ink_coverage(image_data):
+    """Proporsi piksel tinta (0..1); kanvas putih atau transparen bernilai 0"""
+    if image_data is None:
+        return 0.0
+    return float(ink_mask(image_data).mean())
+
+
+def has_ink(image_data, min_coverage=MIN_INK_COVERAGE):
+    return ink_coverage(image_data) >= min_coverage
+
+
+def crop_to_ink(gray, padding=CROP_PADDING, aspect=SIGNATURE_ASPECT):
+    """Potong array grayscale ke bounding box tinta, diperlebar ke rasio ``aspect``"""
+    mask = gray < INK_LUMA_THRESHOLD
+    rows = np.flatnonzero(mask.any(axis=1))
+    cols = np.flatnonzero(mask.any(axis=0))
+    if rows.size == 0:
+        return None
+    crop = gray[max(rows[0] - padding, 0):rows[-1] + padding + 1,
+                max(cols[0] - padding, 0):cols[-1] + padding + 1]
+
+    height, width = crop.shape
+    target_w = max(width, int(round(height * aspect)))
+    target_h = max(height, int(round(target_w / aspect)))
+    canvas = np.full((target_h, target_w), 255, dtype=np.uint8)
+    top = (target_h - height) // 2
+    left = (target_w - width) // 2
+    canvas[top:top + height, left:left + width] = crop
+    return canvas
+
+
+def perceptual_hash(gray, hash_size=16):
+    """dHash (default 16x16 = 256-bit) dari array grayscale: TTD yang mirip memberi hash dengan jarak Hamming kecil.
+
+    Gambar dipotong ke tinta dulu sehingga posisi dan margin di kanvas tidak
+    berpengaruh. Kanvas kosong bernilai 0.
+    """
+    cropped = crop_to_ink(np.asarray(gray))
+    if cropped is None:
+        return 0
+    small = np.asarray(Image.fromarray(cropped).resize((hash_size + 1, hash_size), Image.BOX), dtype=np.int16)
+    bits = (small[:, 1:] < small[:, :-1]).flatten()
+    return int.from_bytes(np.packbits(bits).tobytes(), 'big')
+
+
+def hamming(a, b):
+    return (a ^ b).bit_count()
+
+
+def encode_png(gray, mode='P4', optimize=True):
+    """Encode array grayscale ke PNG: '1' (1-bit), 'P4' (4 tingkat abu-abu, 2-bit), atau 'L' (8-bit)
+
+    ``optimize=False`` ~8x lebih cepat dengan file sekitar 8% lebih besar.
+    """
+    if mode == '1':
+        img = Image.fromarray(gray >= 128)
+        bits = None
+    elif mode == 'P4':
+        # 4 tingkat abu-abu tetap menjaga tepi halus goresan, tapi cukup 2 bit per piksel
+        levels = ((gray.astype(np.uint16) * 3 + 127) // 255).astype(np.uint8)
+        img = Image.frombytes('P', (gray.shape[1], gray.shape[0]), levels.tobytes())
+        img.putpalette([0, 0, 0, 85, 85, 85, 170, 170, 170, 255, 255, 255])
+        bits = 2
+    else:
+        img = Image.fromarray(gray)
+        bits = None
+    buffer = BytesIO()
+    if bits:
+        img.save(buffer, format='PNG', optimize=optimize, bits=bits)
+    else:
+        img.save(buffer, format='PNG', optimize=optimize)
+    return buffer.getvalue()
+
+
+def encode_signature(image_data, mode='P4', limit=SHEETS_CELL_LIMIT):
+    """Ubah image_data kanvas menjadi base64 PNG ringkas; None bila kanvas kosong"""
+    if not has_ink(image_data):
+        return None
+    gray = crop_to_ink(to_grayscale(image_data))
+    img = Image.fromarray(gray)
+    while True:
+        encoded = base64.b64encode(encode_png(np.asarray(img), mode)).decode()
+        if len(encoded) <= limit or img.width < 60:
+            return encoded
+        # Perkecil bertahap sampai muat di satu sel
+        img = img.resize((int(img.width * 0.75), int(img.height * 0.75)), Image.LANCZOS)
+
+
+# ============= FORMAT GORESAN (VEKTOR) =============
+# Tanda tangan disimpan sebagai daftar goresan berkoordinat bulat (piksel kanvas):
+#   "strokes:v1:" + base64(varint lebar, tinggi, tebal*10, jumlah goresan,
+#                         lalu per goresan: jumlah titik, x0, y0, delta zigzag x/y)
+# Dipakai bersama oleh app.py dan form absensi Django (attendance_form.html).
+STROKE_PREFIX = 'strokes:v1:'
+DEFAULT_LINE_WIDTH = 3.0
+
+
+def is_stroke_signature(data):
+    return isinstance(data, str) and data.startswith(STROKE_PREFIX)
+
+
+def _write_varint(out, value):
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return
+
+
+def _read_varint(data, pos):
+    result = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return result, pos
+        shift += 7
+
+
+def _zigzag(value):
+    return value * 2 if value >= 0 else -value * 2 - 1
+
+
+def _unzigzag(value):
+    return value >> 1 if not value & 1 else -((value + 1) >> 1)
+
+
+def simplify_stroke(points, min_distance=1.0):
+    """Bulatkan titik ke piksel dan buang titik yang terlalu rapat"""
+    result = []
+    for x, y in points:
+        point = (max(int(round(x)), 0), max(int(round(y)), 0))
+        if result and abs(point[0] - result[-1][0]) < min_distance and abs(point[1] - result[-1][1]) < min_distance:
+            continue
+        result.append(point)
+    return result
+
+
+def encode_strokes(strokes, width, height, line_width=DEFAULT_LINE_WIDTH):
+    out = bytearray()
+    strokes = [simplify_stroke(stroke) for stroke in strokes]
+    strokes = [stroke for stroke in strokes if stroke]
+    for value in (int(width), int(height), int(round(line_width * 10)), len(strokes)):
+        _write_varint(out, value)
+    for stroke in strokes:
+        _write_varint(out, len(stroke))
+        _write_varint(out, stroke[0][0])
+        _write_varint(out, stroke[0][1])
+        for (px, py), (x, y) in zip(stroke, stroke[1:]):
+            _write_varint(out, _zigzag(x - px))
+            _write_varint(out, _zigzag(y - py))
+    return STROKE_PREFIX + base64.b64encode(bytes(out)).decode()
+
+
+def decode_strokes(text):
+    """Kembalikan (lebar, tinggi, tebal garis, daftar goresan [(x, y), ...])"""
+    data = base64.b64decode(text[len(STROKE_PREFIX):])
+    pos = 0
+    width, pos = _read_varint(data, pos)
+    height, pos = _read_varint(data, pos)
+    line_width, pos = _read_varint(data, pos)
+    count, pos = _read_varint(data, pos)
+    strokes = []
+    for _ in range(count):
+        n, pos = _read_varint(data, pos)
+        x, pos = _read_varint(data, pos)
+        y, pos = _read_varint(data, pos)
+        stroke = [(x, y)]
+        for _ in range(n - 1):
+            dx, pos = _read_varint(data, pos)
+            dy, pos = _read_varint(data, pos)
+            x += _unzigzag(dx)
+            y += _unzigzag(dy)
+            stroke.append((x, y))
+        strokes.append(stroke)
+    return width, height, line_width / 10, strokes
+
+
+def strokes_from_fabric(json_data):
+    """Ambil titik goresan dari json_data st_canvas (objek path freedraw fabric.js)"""
+    strokes = []
+    for obj in (json_data or {}).get('objects', []):
+        if obj.get('type') != 'path':
+            continue
+        points = []
+        for command in obj.get('path', []):
+            # Titik akhir setiap perintah M/L/Q/C ada di dua angka terakhir
+            if len(command) >= 3:
+                points.append((command[-2], command[-1]))
+        if points:
+            strokes.append(points)
+    return strokes
+
+
+def _fit_transform(strokes, line_width, size, padding_ratio=0.05):
+    """Skala dan offset agar bounding box goresan pas di ``size`` dengan rasio tetap"""
+    xs = [x for stroke in strokes for x, _ in stroke]
+    ys = [y for stroke in strokes for _, y in stroke]
+    min_x, max_x = min(xs) - line_width, max(xs) + line_width
+    min_y, max_y = min(ys) - line_width, max(ys) + line_width
+    box_w, box_h = max(max_x - min_x, 1), max(max_y - min_y, 1)
+    target_w, target_h = size[0] * (1 - 2 * padding_ratio), size[1] * (1 - 2 * padding_ratio)
+    scale = min(target_w / box_w, target_h / box_h)
+    offset_x = (size[0] - box_w * scale) / 2 - min_x * scale
+    offset_y = (size[1] - box_h * scale) / 2 - min_y * scale
+    return scale, offset_x, offset_y
+
+
+def render_strokes(text, size=(600, 200), supersample=2):
+    """Rasterisasi goresan ke gambar grayscale ``size`` (latar putih, goresan di tengah)"""
+    from PIL import ImageDraw
+
+    _, _, line_width, strokes = decode_strokes(text)
+    work = (size[0] * supersample, size[1] * supersample)
+    img = Image.new('L', work, 255)
+    if not strokes:
+        return img.resize(size)
+    scale, offset_x, offset_y = _fit_transform(strokes, line_width, work)
+    pen = max(line_width * scale, supersample)
+    draw = ImageDraw.Draw(img)
+    radius = pen / 2
+    for stroke in strokes:
+        points = [(x * scale + offset_x, y * scale + offset_y) for x, y in stroke]
+        if len(points) > 1:
+            draw.line(points, fill=0, width=int(round(pen)), joint='curve')
+        for x, y in (points[0], points[-1]):
+            draw.ellipse((x - radius, y - radius, x + radius, y + radius), fill=0)
+    return img.resize(size, Image.LANCZOS)
+
+
+def draw_strokes_pdf(pdf, text, x, y, w, h):
+    """Gambar goresan sebagai vektor di area (x, y, w, h) halaman fpdf (satuan mm).
+
+    Mengembalikan False tanpa menggambar apa pun bila data goresan kosong atau rusak.
+    """
+    try:
+        _, _, line_width, strokes = decode_strokes(text)
+    except (binascii.Error, IndexError, ValueError):
+        return False
+    if not strokes:
+        return False
+    scale, offset_x, offset_y = _fit_transform(strokes, line_width, (w, h))
+    pen = max(line_width * scale, 0.15)
+    pdf.set_draw_color(0, 0, 0)
+    pdf.set_fill_color(0, 0, 0)
+    pdf.set_line_width(pen)
+    for stroke in strokes:
+        points = [(x + px * scale + offset_x, y + py * scale + offset_y) for px, py in stroke]
+        if len(points) > 1:
+            pdf.polyline(points)
+        else:
+            px, py = points[0]
+            pdf.ellipse(px - pen / 2, py - pen / 2, pen, pen, style='F')
+    pdf.set_line_width(0.2)
+    return True
+
+
+def signature_image(data, size=None):
+    """Buka tanda tangan (format goresan, base64 PNG, atau data URL) sebagai gambar PIL.
+
+    Goresan dirasterisasi langsung di ``size``; PNG hanya diubah ukurannya bila
+    ``size`` diberikan. Mengembalikan None bila data kosong atau rusak.
+    """
+    if not data:
+        return None
+    try:
+        if is_stroke_signature(data):
+            return render_strokes(data, size or (600, 200))
+        data = str(data)
+        if data.startswith('data:'):
+            data = data.split(',', 1)[1]
+        img = Image.open(BytesIO(base64.b64decode(data)))
+        img.load()
+        if size:
+            img = img.convert('L' if img.mode in ('1', 'L', 'P') else 'RGBA').resize(size, Image.LANCZOS)
+        return img
+    except Exception:
+        return None
+
+
+def signature_png(data, size=None):
+    """Bytes PNG TTD pada ``size``; fungsi level modul agar bisa dikirim ke worker proses"""
+    img = signature_image(data, size)
+    if img is None:
+        return None
+    buffer = BytesIO()
+    img.save(buffer, format='PNG')
+    return buffer.getvalue()
+
+
+# ============= CACHE GAMBAR TTD =============
+class SignatureCache:
+    """Cache LRU gambar TTD yang sudah di-decode dan di-resize.
+
+    Kunci cache adalah hash isi data TTD plus ukuran tujuan, sehingga galeri,
+    PDF, dan Excel yang membutuhkan ukuran sama memakai hasil decode yang sama
+    antar rerun. Entri terlama dibuang saat total memori melewati ``max_bytes``.
+    """
+
+    def __init__(self, max_bytes=64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _digest(data):
+        return hashlib.blake2b(str(data).encode(), digest_size=16).hexdigest()
+
+    def _get(self, key, count=True):
+        with self._lock:
+            entry = self._items.get(key)
+            if entry is None:
+                if count:
+                    self.misses += 1
+                return None
+            if count:
+                self.hits += 1
+            self._items.move_to_end(key)
+            return entry[0]
+
+    def _put(self, key, value, nbytes):
+        if nbytes > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._items:
+                return
+            self._items[key] = (value, nbytes)
+            self.current_bytes += nbytes
+            while self.current_bytes > self.max_bytes:
+                _, (_, old_bytes) = self._items.popitem(last=False)
+                self.current_bytes -= old_bytes
+                self.evictions += 1
+
+    def image(self, data, size=None):
+        """Gambar PIL untuk ``data`` pada ``size``; None bila TTD kosong atau rusak"""
+        if not data:
+            return None
+        return self._decoded(data, size, count=True)
+
+    def _decoded(self, data, size, count):
+        key = (self._digest(data), size, 'image')
+        img = self._get(key, count)
+        if img is None:
+            img = signature_image(data, size)
+            if img is None:
+                return None
+            self._put(key, img, img.width * img.height * len(img.getbands()))
+        return img
+
+    def png(self, data, size=None):
+        """Bytes PNG untuk ``data`` pada ``size`` (untuk fpdf dan openpyxl)"""
+        if not data:
+            return None
+        key = (self._digest(data), size, 'png')
+        png = self._get(key)
+        if png is None:
+            # Miss PNG sudah dihitung; cek cache gambar tidak dihitung lagi sebagai request
+            img = self._decoded(data, size, count=False)
+            if img is None:
+                return None
+            buffer = BytesIO()
+            img.save(buffer, format='PNG')
+            png = buffer.getvalue()
+            self._put(key, png, len(png))
+        return png
+
+    def png_many(self, values, size=None, workers=1, executor='thread'):
+        """Bytes PNG untuk setiap nilai di ``values``, urut sesuai input.
+
+        TTD yang belum ada di cache di-decode dan di-resize paralel di
+        ``workers`` thread (Pillow melepas GIL saat decode/resize) atau proses
+        bila ``executor='process'``. TTD yang isinya sama hanya diproses sekali.
+        """
+        values = list(values)
+        keys = [(self._digest(v), size, 'png') if v else None for v in values]
+        results = [None] * len(values)
+        pending = {}
+        for i, key in enumerate(keys):
+            if key is None:
+                continue
+            png = self._get(key)
+            if png is not None:
+                results[i] = png
+            else:
+                pending.setdefault(key, []).append(i)
+
+        if pending:
+            jobs = [values[indexes[0]] for indexes in pending.values()]
+            if workers and workers > 1 and len(jobs) > 1:
+                pool_class = ProcessPoolExecutor if executor == 'process' else ThreadPoolExecutor
+                with pool_class(max_workers=min(workers, len(jobs))) as pool:
+                    pngs = list(pool.map(signature_png, jobs, [size] * len(jobs), chunksize=8 if executor == 'process' else 1))
+            else:
+                pngs = [signature_png(data, size) for data in jobs]
+            for (key, indexes), png in zip(pending.items(), pngs):
+                if png is None:
+                    continue
+                self._put(key, png, len(png))
+                for i in indexes:
+                    results[i] = png
+        return results
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            'items': len(self._items),
+            'bytes': self.current_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / total if total else 0.0,
+        }
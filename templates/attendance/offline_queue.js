@@ -0,0 +1,98 @@
+// Antrean absensi offline di IndexedDB, dipakai bersama oleh halaman form dan service worker
+const attendanceQueue = (() => {
+  const DB_NAME = 'absensi-offline';
+  const STORE = 'submissions';
+  const BATCH_SIZE = {{ batch_size }};
+  const BATCH_URL = '{% url "api_attendance_batch" %}';
+  const open = () => new Promise((resolve, reject) => {
+    const request = indexedDB.open(DB_NAME, 1);
+    request.onupgradeneeded = () => request.result.createObjectStore(STORE, { keyPath: 'idempotency_key' });
+    request.onsuccess = () => resolve(request.result);
+    request.onerror = () => reject(request.error);
+  });
+  const run = async (mode, action) => {
+    const db = await open();
+    return new Promise((resolve, reject) => {
+      const tx = db.transaction(STORE, mode);
+      const request = action(tx.objectStore(STORE));
+      tx.oncomplete = () => { db.close(); resolve(request ? request.result : undefined); };
+      tx.onerror = () => { db.close(); reject(tx.error); };
+    });
+  };
+  const add = (item) => run('readwrite', (store) => store.put(item));
+  const all = () => run('readonly', (store) => store.getAll());
+  const remove = (keys) => run('readwrite', (store) => { keys.forEach((key) => store.delete(key)); });
+  // Batch dibatasi jumlah item dan ukuran body: body di atas DATA_UPLOAD_MAX_MEMORY_SIZE
+  // server ditolak 400 (50 TTD x 60 KB sudah melewati batas bawaan 2,5 MB)
+  const BATCH_MAX_BYTES = {{ batch_max_bytes|default:"Infinity" }};
+  const BODY_OVERHEAD = '{"items":[]}'.length;
+  const encoder = new TextEncoder();
+  const batches = (items) => {
+    const result = [];
+    let batch = [];
+    let bytes = BODY_OVERHEAD;
+    for (const item of items) {
+      const size = encoder.encode(JSON.stringify(item)).length + 1;
+      if (batch.length && (batch.length >= BATCH_SIZE || bytes + size > BATCH_MAX_BYTES)) {
+        result.push(batch);
+        batch = [];
+        bytes = BODY_OVERHEAD;
+      }
+      batch.push(item);
+      bytes += size;
+    }
+    if (batch.length) result.push(batch);
+    return result;
+  };
+  const rejection = async (response) => {
+    try {
+      return (await response.json()).error;
+    } catch (error) {
+      return null;
+    }
+  };
+  // Kirim satu batch dan hapus item yang sudah dijawab; false bila jaringan/server gagal.
+  // Batch yang ditolak utuh (4xx) dibelah dua; satu item yang tetap ditolak dibuang dari
+  // antrean sebagai "invalid" agar tidak menyumbat antrean selamanya.
+  const send = async (batch, results) => {
+    const response = await fetch(BATCH_URL, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify({ items: batch }),
+    });
+    if (response.status >= 400 && response.status < 500) {
+      if (batch.length > 1) {
+        const half = Math.ceil(batch.length / 2);
+        return (await send(batch.slice(0, half), results)) && send(batch.slice(half), results);
+      }
+      const message = (await rejection(response)) || 'Absensi ditolak server.';
+      await remove([batch[0].idempotency_key]);
+      results.push({ idempotency_key: batch[0].idempotency_key, status: 'invalid', errors: { __all__: [message] } });
+      return true;
+    }
+    if (!response.ok) return false;
+    const body = await response.json();
+    await remove(body.results.map((result) => result.idempotency_key));
+    results.push(...body.results);
+    return true;
+  };
+  let flushing = null;
+  // Bila jaringan/server gagal, sisa antrean disimpan untuk percobaan berikutnya.
+  // Kiriman ganda dari halaman dan service worker aman karena kunci idempoten.
+  const flush = () => {
+    if (flushing) return flushing;
+    flushing = (async () => {
+      const results = [];
+      try {
+        for (const batch of batches(await all())) {
+          if (!(await send(batch, results))) break;
+        }
+      } catch (error) {
+        // Masih offline; dicoba lagi saat online
+      }
+      return results;
+    })().finally(() => { flushing = null; });
+    return flushing;
+  };
+  return { add, all, flush };
+})();
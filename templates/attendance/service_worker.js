@@ -0,0 +1,40 @@
+{% include "attendance/offline_queue.js" %}
+const CACHE_NAME = 'absensi-form-v1';
+const FORM_PREFIX = '{{ form_prefix }}';
+
+self.addEventListener('install', () => self.skipWaiting());
+
+self.addEventListener('activate', (event) => {
+  event.waitUntil((async () => {
+    const names = await caches.keys();
+    await Promise.all(names.filter((name) => name !== CACHE_NAME).map((name) => caches.delete(name)));
+    await self.clients.claim();
+  })());
+});
+
+// Halaman form absensi: network-first, salinan terakhir dipakai saat sinyal hilang
+self.addEventListener('fetch', (event) => {
+  const { request } = event;
+  const url = new URL(request.url);
+  if (request.method !== 'GET' || url.origin !== self.location.origin || !url.pathname.startsWith(FORM_PREFIX)) return;
+  event.respondWith((async () => {
+    const cache = await caches.open(CACHE_NAME);
+    try {
+      const response = await fetch(request);
+      if (response.ok) await cache.put(url.pathname, response.clone());
+      return response;
+    } catch (error) {
+      return (await cache.match(url.pathname, { ignoreVary: true })) || Response.error();
+    }
+  })());
+});
+
+// Background Sync: antrean dikirim walau halaman form sudah ditutup
+self.addEventListener('sync', (event) => {
+  if (event.tag !== '{{ sync_tag }}') return;
+  event.waitUntil((async () => {
+    await attendanceQueue.flush();
+    // Ditolak agar browser menjadwalkan ulang bila masih ada yang belum terkirim
+    if ((await attendanceQueue.all()).length) throw new Error('Antrean absensi belum terkirim');
+  })());
+});
@@ -0,0 +1,207 @@
+"""
+Konfigurasi multi-sekolah (tenant) untuk app.py.
+
+Satu deployment Streamlit bisa melayani banyak sekolah. Setiap tenant punya kop
+surat, spreadsheet, dan base URL sendiri, dipilih lewat query param ``?tenant=``
+atau dari host yang dipakai untuk membuka aplikasi.
+
+Contoh secrets.toml:
+
+    spreadsheet_key = "KEY_SEKOLAH_DEFAULT"
+    tenant_pool_size = 32
+
+    [tenants.sdn-kedungboto]
+    spreadsheet_key = "KEY_SDN_KEDUNGBOTO"
+    app_url = "https://sdn-kedungboto.example.sch.id"
+    hosts = ["sdn-kedungboto.example.sch.id"]
+
+    [tenants.sdn-kedungboto.kop]
+    sekolah = "SD NEGERI KEDUNGBOTO"
+    alamat = "Jalan Raya Kedungboto, Porong, Sidoarjo"
+    email = "sdnkedungboto@gmail.com"
+
+Tenant tanpa ``gcp_service_account`` sendiri memakai service account utama.
+"""
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+import gspread
+import streamlit as st
+from oauth2client.service_account import ServiceAccountCredentials
+
+DEFAULT_TENANT = 'default'
+SCOPE = [
+    "https://spreadsheets.google.com/feeds",
+    "https://www.googleapis.com/auth/drive"
+]
+
+
+@dataclass(frozen=True)
+class Kop:
+    """Kop surat PDF dan identitas sekolah di sidebar/footer"""
+    pemerintah: str = 'PEMERINTAH KABUPATEN SIDOARJO'
+    dinas: str = 'DINAS PENDIDIKAN DAN KEBUDAYAAN'
+    sekolah: str = 'SD NEGERI SIMOANGIN-ANGIN'
+    alamat: str = 'Jalan Simoangin-angin, Wonoayu, Sidoarjo, Jawa Timur 61261'
+    email: str = 'sdnsimoangin@gmail.com'
+    kota: str = 'Sidoarjo'
+    wilayah: str = 'Kab. Sidoarjo, Jawa Timur'
+
+
+@dataclass(frozen=True)
+class Tenant:
+    slug: str
+    spreadsheet_key: str
+    app_url: str = ''
+    hosts: tuple = ()
+    kop: Kop = field(default_factory=Kop)
+    credentials: tuple = ()
+
+    def credentials_dict(self):
+        return dict(self.credentials)
+
+
+def _to_dict(section):
+    """Ubah section st.secrets (AttrDict) menjadi dict biasa secara rekursif"""
+    if hasattr(section, 'items'):
+        return {k: _to_dict(v) for k, v in section.items()}
+    return section
+
+
+def _build_tenant(slug, config, default_credentials):
+    credentials = config.get('gcp_service_account') or default_credentials
+    return Tenant(
+        slug=slug,
+        spreadsheet_key=config.get('spreadsheet_key', ''),
+        app_url=str(config.get('app_url', '')).strip().rstrip('/'),
+        hosts=tuple(h.lower() for h in config.get('hosts', [])),
+        kop=Kop(**config.get('kop', {})),
+        credentials=tuple(sorted(credentials.items())),
+    )
+
+
+@st.cache_resource
+def load_tenants():
+    """Baca semua tenant dari secrets; konfigurasi lama (tanpa [tenants]) jadi tenant default"""
+    secrets = _to_dict(st.secrets)
+    default_credentials = secrets.get('gcp_service_account', {})
+    tenants = {}
+    if secrets.get('spreadsheet_key'):
+        tenants[DEFAULT_TENANT] = _build_tenant(DEFAULT_TENANT, secrets, default_credentials)
+    for slug, config in secrets.get('tenants', {}).items():
+        tenants[slug] = _build_tenant(slug, config, default_credentials)
+    return tenants
+
+
+def _request_host():
+    try:
+        return (st.context.headers.get('Host') or '').split(':')[0].lower()
+    except Exception:
+        return ''
+
+
+def get_current_tenant():
+    """Pilih tenant dari ?tenant=, lalu dari host, lalu tenant default"""
+    tenants = load_tenants()
+    if not tenants:
+        return None
+
+    slug = st.query_params.get('tenant')
+    if slug:
+        if slug in tenants:
+            return tenants[slug]
+        # Slug salah ketik tidak boleh jatuh ke tenant default: absensi akan masuk ke spreadsheet sekolah lain
+        st.error(f"❌ Sekolah '{slug}' tidak ditemukan. Periksa kembali link atau QR Code absensi.")
+        st.stop()
+
+    host = _request_host()
+    if host:
+        for tenant in tenants.values():
+            if host in tenant.hosts:
+                return tenant
+
+    return tenants.get(DEFAULT_TENANT) or next(iter(tenants.values()))
+
+
+class SheetPool:
+    """Pool LRU berbatas untuk client gspread, spreadsheet, dan worksheet per tenant.
+
+    Client dibagi antar tenant yang memakai service account sama, sehingga
+    otorisasi OAuth hanya terjadi sekali per service account. Spreadsheet dan
+    worksheet disimpan per tenant agar rerun Streamlit tidak mengulang request
+    metadata ke Google. Tenant yang paling lama tidak dipakai dikeluarkan saat
+    pool penuh.
+    """
+
+    def __init__(self, max_size=32):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._clients = OrderedDict()
+        self._entries = OrderedDict()
+
+    def _client(self, tenant):
+        credentials = tenant.credentials_dict()
+        key = credentials.get('client_email', '')
+        client = self._clients.get(key)
+        if client is None:
+            creds = ServiceAccountCredentials.from_json_keyfile_dict(credentials, SCOPE)
+            client = gspread.authorize(creds)
+            self._clients[key] = client
+        self._clients.move_to_end(key)
+        while len(self._clients) > self.max_size:
+            self._clients.popitem(last=False)
+        return client
+
+    def spreadsheet(self, tenant):
+        with self._lock:
+            entry = self._entries.get(tenant.slug)
+            if entry is not None:
+                self.hits += 1
+                self._entries.move_to_end(tenant.slug)
+                return entry['sheet']
+
+            self.misses += 1
+            sheet = self._client(tenant).open_by_key(tenant.spreadsheet_key)
+            self._entries[tenant.slug] = {'sheet': sheet, 'worksheets': {}}
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+            return sheet
+
+    def worksheet(self, sheet, title, opener):
+        """Ambil worksheet dari cache tenant pemilik ``sheet``, atau buka dengan ``opener()``"""
+        with self._lock:
+            cache = None
+            for entry in self._entries.values():
+                if entry['sheet'] is sheet:
+                    cache = entry['worksheets']
+                    break
+            if cache is not None and title in cache:
+                self.hits += 1
+                return cache[title]
+
+        worksheet = opener()
+        if cache is not None:
+            with self._lock:
+                cache[title] = worksheet
+        return worksheet
+
+    def invalidate(self, tenant):
+        with self._lock:
+            self._entries.pop(tenant.slug, None)
+
+    def stats(self):
+        return {
+            'tenants': len(self._entries),
+            'clients': len(self._clients),
+            'hits': self.hits,
+            'misses': self.misses,
+        }
+
+
+@st.cache_resource
+def get_sheet_pool():
+    return SheetPool(max_size=int(st.secrets.get('tenant_pool_size', 32)))
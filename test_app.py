@@ -0,0 +1,49 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import app
+from benchmarks.common import make_signature_base64
+from signature_utils import SignatureCache, encode_strokes
+
+DATA_RAPAT = {
+    'meeting_id': 'MTG1',
+    'judul': 'Rapat Dinas',
+    'tanggal': '05-01-2026',
+    'waktu': '08:00',
+    'lokasi': 'Aula',
+    'pimpinan': 'Kepala Sekolah',
+}
+
+
+class GeneratePdfTests(unittest.TestCase):
+    def setUp(self):
+        patcher = mock.patch.object(app.st, 'secrets', {})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_returns_pdf_bytes_without_writing_files(self):
+        peserta = [
+            {'Nama': 'Budi', 'NIP': '1', 'Timestamp': '08:01', 'Signature': make_signature_base64(1)},
+            {'Nama': 'Sari', 'NIP': '2', 'Timestamp': '08:02', 'Signature': encode_strokes([[(10, 10), (90, 40)]], 600, 200)},
+            {'Nama': 'Andi', 'NIP': '3', 'Timestamp': '08:03', 'Signature': ''},
+        ]
+        cwd = os.getcwd()
+        with tempfile.TemporaryDirectory() as workdir, tempfile.TemporaryDirectory() as tmpdir:
+            os.chdir(workdir)
+            try:
+                with mock.patch.object(tempfile, 'tempdir', tmpdir):
+                    pdf = app.generate_pdf(DATA_RAPAT, peserta, 'Isi notulensi.', cache=SignatureCache(), workers=2)
+            finally:
+                os.chdir(cwd)
+            # Tidak ada file PDF di direktori kerja maupun PNG sementara untuk TTD
+            self.assertEqual(os.listdir(workdir), [])
+            self.assertEqual(os.listdir(tmpdir), [])
+
+        self.assertIsInstance(pdf, bytes)
+        self.assertTrue(pdf.startswith(b'%PDF'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,120 @@
+import base64
+import unittest
+from io import BytesIO
+
+import numpy as np
+from PIL import Image
+
+from signature_utils import (
+    SHEETS_CELL_LIMIT, SIGNATURE_ASPECT, decode_strokes, encode_signature, encode_strokes,
+    SignatureCache, has_ink, is_stroke_signature, render_strokes, signature_image
+)
+
+
+def canvas(fill=(255, 255, 255, 255)):
+    """Kanvas RGBA 600x200 seperti keluaran st_canvas"""
+    return np.full((200, 600, 4), fill, dtype=np.uint8)
+
+
+def signed_canvas():
+    data = canvas()
+    data[90:110, 200:400] = (0, 0, 0, 255)
+    return data
+
+
+def decode_png(encoded):
+    return Image.open(BytesIO(base64.b64decode(encoded)))
+
+
+class InkDetectionTests(unittest.TestCase):
+    def test_blank_canvas_has_no_ink(self):
+        # Latar putih dan latar transparen sama-sama dianggap kosong
+        self.assertFalse(has_ink(canvas()))
+        self.assertFalse(has_ink(canvas((0, 0, 0, 0))))
+        self.assertFalse(has_ink(None))
+
+    def test_stray_dot_is_below_coverage(self):
+        data = canvas()
+        data[100, 300] = (0, 0, 0, 255)
+        self.assertFalse(has_ink(data))
+
+    def test_signature_has_ink(self):
+        self.assertTrue(has_ink(signed_canvas()))
+
+
+class EncodeSignatureTests(unittest.TestCase):
+    def test_blank_canvas_is_not_encoded(self):
+        self.assertIsNone(encode_signature(canvas()))
+
+    def test_crops_to_ink_with_canvas_aspect(self):
+        img = decode_png(encode_signature(signed_canvas()))
+        self.assertLess(img.width, 600)
+        self.assertLess(img.height, 200)
+        self.assertAlmostEqual(img.width / img.height, SIGNATURE_ASPECT, delta=0.05)
+        self.assertEqual(img.mode, 'P')
+
+    def test_noisy_signature_is_downsized_under_cell_limit(self):
+        rng = np.random.default_rng(0)
+        data = canvas()
+        data[..., :3] = rng.integers(0, 256, size=(200, 600, 1), dtype=np.uint8)
+        encoded = encode_signature(data, mode='L')
+        self.assertLessEqual(len(encoded), SHEETS_CELL_LIMIT)
+
+    def test_short_png_still_decodes(self):
+        # PNG 2-bit dari TTD kecil bisa di bawah 200 karakter base64
+        data = canvas()
+        data[90:110, 290:310] = (0, 0, 0, 255)
+        encoded = encode_signature(data)
+        self.assertIsNotNone(signature_image(encoded))
+
+
+class StrokeFormatTests(unittest.TestCase):
+    def test_round_trip(self):
+        strokes = [[(10, 20), (40, 25), (80, 60)], [(300, 150), (290, 140)]]
+        text = encode_strokes(strokes, 600, 200, 2.5)
+
+        self.assertTrue(is_stroke_signature(text))
+        self.assertEqual(decode_strokes(text), (600, 200, 2.5, strokes))
+
+    def test_png_is_not_stroke_signature(self):
+        self.assertFalse(is_stroke_signature(encode_signature(signed_canvas())))
+        self.assertFalse(is_stroke_signature(''))
+
+    def test_strokes_render_as_image(self):
+        text = encode_strokes([[(100, 100), (500, 100)]], 600, 200)
+        self.assertTrue(has_ink(np.asarray(render_strokes(text))))
+        self.assertEqual(signature_image(text).size, (600, 200))
+
+
+class PngManyTests(unittest.TestCase):
+    def values(self):
+        signed = encode_signature(signed_canvas())
+        other = canvas()
+        other[40:160, 100:140] = (0, 0, 0, 255)
+        # Nilai kosong, duplikat, dan data rusak bercampur dengan TTD valid
+        return [signed, '', encode_signature(other), 'rusak', signed, encode_signature(other)]
+
+    def test_pool_matches_serial_results_in_input_order(self):
+        values = self.values()
+        serial = SignatureCache().png_many(values, (120, 40))
+        for executor in ('thread', 'process'):
+            with self.subTest(executor=executor):
+                self.assertEqual(SignatureCache().png_many(values, (120, 40), workers=4, executor=executor), serial)
+
+        self.assertIsNotNone(serial[0])
+        self.assertEqual([serial[1], serial[3]], [None, None])
+        self.assertEqual(serial[0], serial[4])
+        self.assertNotEqual(serial[0], serial[2])
+
+    def test_duplicates_are_decoded_once_and_cached(self):
+        cache = SignatureCache()
+        values = self.values()
+        first = cache.png_many(values, workers=2)
+        self.assertEqual(cache.stats()['items'], 2)
+
+        self.assertEqual(cache.png_many(values, workers=2), first)
+        self.assertEqual(cache.stats()['hits'], 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+import unittest
+from unittest import mock
+
+import app
+import tenants
+from tenants import DEFAULT_TENANT, Tenant
+
+TENANTS = {
+    DEFAULT_TENANT: Tenant(slug=DEFAULT_TENANT, spreadsheet_key='KEY_DEFAULT'),
+    'sdn-a': Tenant(slug='sdn-a', spreadsheet_key='KEY_A', hosts=('sdn-a.example.sch.id',)),
+    'sdn-b': Tenant(
+        slug='sdn-b', spreadsheet_key='KEY_B',
+        app_url='https://sdn-b.example.sch.id', hosts=('sdn-b.example.sch.id',)
+    ),
+}
+
+
+class Stop(Exception):
+    """Pengganti st.stop() di luar runtime Streamlit"""
+
+
+class GetCurrentTenantTests(unittest.TestCase):
+    def current(self, query, host=''):
+        with mock.patch.object(tenants, 'load_tenants', return_value=TENANTS), \
+                mock.patch.object(tenants.st, 'query_params', query), \
+                mock.patch.object(tenants, '_request_host', return_value=host), \
+                mock.patch.object(tenants.st, 'error') as self.error, \
+                mock.patch.object(tenants.st, 'stop', side_effect=Stop):
+            return tenants.get_current_tenant()
+
+    def test_slug_then_host_then_default(self):
+        self.assertEqual(self.current({'tenant': 'sdn-a'}, host='sdn-b.example.sch.id').slug, 'sdn-a')
+        self.assertEqual(self.current({}, host='sdn-b.example.sch.id').slug, 'sdn-b')
+        self.assertEqual(self.current({}).slug, DEFAULT_TENANT)
+
+    def test_unknown_slug_stops_instead_of_using_default(self):
+        with self.assertRaises(Stop):
+            self.current({'tenant': 'sdn-typo'})
+
+        self.error.assert_called_once()
+        self.assertIn('sdn-typo', self.error.call_args.args[0])
+
+
+class GenerateQrCodeTests(unittest.TestCase):
+    def url(self, slug):
+        with mock.patch.object(app.st, 'secrets', {}):
+            return app.generate_qr_code('MTG1', TENANTS[slug])[1]
+
+    def test_slug_is_kept_when_link_falls_back_to_default_url(self):
+        # sdn-a punya hosts tapi app_url kosong: link memakai URL default, bukan host sdn-a
+        self.assertTrue(self.url('sdn-a').endswith('&tenant=sdn-a'))
+
+    def test_own_host_needs_no_slug(self):
+        self.assertEqual(self.url('sdn-b'), 'https://sdn-b.example.sch.id?page=absensi&meeting_id=MTG1')
+
+    def test_default_tenant_needs_no_slug(self):
+        self.assertNotIn('tenant=', self.url(DEFAULT_TENANT))
+
+
+if __name__ == '__main__':
+    unittest.main()
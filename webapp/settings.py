@@ -58,6 +58,11 @@ DATABASES = {
         conn_max_age=600,
     )
 }
+if DATABASES["default"]["ENGINE"] == "django.db.backends.postgresql":
+    # Di ASGI setiap request berjalan di thread baru sehingga koneksi persisten (CONN_MAX_AGE)
+    # tidak pernah dipakai ulang; pool psycopg membagi koneksi antar thread
+    DATABASES["default"]["CONN_MAX_AGE"] = 0
+    DATABASES["default"].setdefault("OPTIONS", {})["pool"] = True
 
 AUTH_PASSWORD_VALIDATORS = [
     {"NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator"},
@@ -79,6 +84,18 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "media"
 
+GOOGLE_SHEET_ID = os.getenv("GOOGLE_SHEET_ID", "")
+GOOGLE_SERVICE_ACCOUNT_EMAIL = os.getenv("GOOGLE_SERVICE_ACCOUNT_EMAIL", "")
+GOOGLE_SERVICE_ACCOUNT_PRIVATE_KEY = os.getenv("GOOGLE_SERVICE_ACCOUNT_PRIVATE_KEY", "").replace("\\n", "\n")
+# "png" (data URL dari kanvas) atau "strokes" (goresan vektor, lihat signature_utils.py)
+SIGNATURE_FORMAT = os.getenv("SIGNATURE_FORMAT", "png")
+# Batas panjang data TTD yang dikirim form absensi (karakter data URL)
+SIGNATURE_MAX_BYTES = int(os.getenv("SIGNATURE_MAX_BYTES", "60000"))
+SHEETS_BACKUP_DIR = Path(os.getenv("SHEETS_BACKUP_DIR", BASE_DIR / "backups"))
+# Form absensi versi async (butuh server ASGI, lihat Procfile). Default mati: benchmarks/bench_attendance_burst.py
+# belum menunjukkan async lebih cepat; aktifkan dengan "True" bila hasil ukur di server produksi lebih baik
+ASYNC_ATTENDANCE = os.getenv("DJANGO_ASYNC_ATTENDANCE", "False").lower() == "true"
+
 CSRF_TRUSTED_ORIGINS = [
     origin.strip()
     for origin in os.getenv("DJANGO_CSRF_TRUSTED_ORIGINS", "").split(",")